@@ -0,0 +1,17 @@
+import numpy as np
+
+# --- Arcs without building an Arc ---
+# Same Bézier points as manim's Arc(start_angle, angle, radius, arc_center, num_components),
+# computed directly so a changing arc can be updated in place by assigning its points.
+
+def arc_points(start_angle, angle, radius=1.0, arc_center=(0, 0, 0), num_components=9):
+    angles = np.linspace(start_angle, start_angle + angle, num_components)
+    anchors = np.stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=1)
+    tangents = np.stack([-anchors[:, 1], anchors[:, 0], np.zeros_like(angles)], axis=1)
+    factor = 4 / 3 * np.tan(angle / (num_components - 1.0) / 4)
+    points = np.empty((num_components - 1, 4, 3))
+    points[:, 0] = anchors[:-1]
+    points[:, 1] = anchors[:-1] + factor * tangents[:-1]
+    points[:, 2] = anchors[1:] - factor * tangents[1:]
+    points[:, 3] = anchors[1:]
+    return points.reshape(-1, 3) * radius + np.asarray(arc_center, dtype=float)
@@ -0,0 +1,159 @@
+import argparse
+import importlib.util
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# --- Scene benchmarks ---
+# Renders each scene headless at fixed resolutions, one fresh process per run, and
+# records setup time (scene created until its first frame is written), per-frame time
+# percentiles, peak RSS and the number of partial movie files. Results are compared with
+# common/benchmark_baselines.json; a metric more than --threshold above its baseline is
+# a regression and makes the run fail. A scene without a baseline is recorded as its
+# baseline with a warning; --update-baseline overwrites the stored ones.
+#
+#   python -m common.benchmark_scenes                    # all scenes, low and high
+#   python -m common.benchmark_scenes --scenes Lorenz --resolutions low
+#   python -m common.benchmark_scenes --update-baseline
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE_FILE = Path(__file__).resolve().parent / "benchmark_baselines.json"
+SCENES = {
+    "Lorenz": "lorenz/lorenz.py",
+    "Pendulum_damped": "pendulum_damped/pendulum_damped.py",
+    "Pendulum_ideal": "pendulum_ideal/pendulum_ideal.py",
+    "LVAnimation": "lotka_volterra/lvanimation.py",
+    "Traffic": "traffic/traffic.py",
+}
+RESOLUTIONS = { # width, height, fps
+    "low": (854, 480, 15),
+    "high": (1920, 1080, 30),
+}
+# lower is better for all of them; partial files are compared exactly
+METRICS = ["setup_s", "frame_p50_ms", "frame_p90_ms", "frame_p99_ms", "peak_rss_mb", "partial_movie_files"]
+
+
+def run_scene(script, scene_name, width, height, fps):
+    """Render one scene in this process and measure it. Runs in the child."""
+    from manim import tempconfig
+
+    sys.path.insert(0, str((ROOT / script).parent)) # like manim does for the scene's own modules
+    spec = importlib.util.spec_from_file_location(Path(script).stem, ROOT / script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # frames are timed at the file writer, which sees every drawn frame: the time from one
+    # written frame to the next within the same play is one frame (animations, updaters,
+    # drawing). The first frame of each play also holds the play's compile and is left
+    # out, so are frozen wait() frames, which come in once with their count.
+    frame_ms = []
+    first_frame = []
+    with tempfile.TemporaryDirectory() as media_dir, tempconfig({
+        "pixel_width": width, "pixel_height": height, "frame_rate": fps,
+        "media_dir": media_dir, "progress_bar": "none", "verbosity": "WARNING",
+    }):
+        start = time.perf_counter()
+        scene = getattr(module, scene_name)()
+        renderer = scene.renderer
+        write_frame = renderer.file_writer.write_frame
+        last = [None, None] # time and play of the previous frame
+
+        def timed_write_frame(frame, num_frames=1):
+            now = time.perf_counter()
+            if not first_frame:
+                first_frame.append(now)
+            if num_frames == 1 and last[0] is not None and last[1] == renderer.num_plays:
+                frame_ms.append((now - last[0]) * 1e3)
+            last[:] = now, renderer.num_plays
+            write_frame(frame, num_frames)
+
+        renderer.file_writer.write_frame = timed_write_frame
+        scene.render()
+        partial_files = [f for f in renderer.file_writer.partial_movie_files if f is not None]
+
+    n_frames = len(frame_ms)
+    frame_ms = frame_ms or [0.0]
+    return {
+        "setup_s": first_frame[0] - start if first_frame else time.perf_counter() - start,
+        "frames": n_frames,
+        "frame_p50_ms": float(np.percentile(frame_ms, 50)),
+        "frame_p90_ms": float(np.percentile(frame_ms, 90)),
+        "frame_p99_ms": float(np.percentile(frame_ms, 99)),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, # KiB on Linux
+        "partial_movie_files": len(partial_files),
+    }
+
+
+def benchmark(scene, resolution):
+    # a fresh interpreter per run: peak RSS and caches must not leak between scenes
+    width, height, fps = RESOLUTIONS[resolution]
+    result = subprocess.run([sys.executable, "-m", "common.benchmark_scenes", "--child", SCENES[scene], scene,
+                             str(width), str(height), str(fps)],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{scene} at {resolution} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def regressions(result, baseline, threshold):
+    found = []
+    for metric in METRICS:
+        if metric not in baseline:
+            continue
+        limit = baseline[metric] if metric == "partial_movie_files" else baseline[metric] * (1 + threshold)
+        if result[metric] > limit:
+            found.append(f"{metric} {result[metric]:.4g} > {limit:.4g} (baseline {baseline[metric]:.4g})")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render time and memory of the scenes against stored baselines")
+    parser.add_argument("--scenes", nargs="+", choices=sorted(SCENES), default=sorted(SCENES))
+    parser.add_argument("--resolutions", nargs="+", choices=sorted(RESOLUTIONS), default=["low", "high"])
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative increase over the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baselines")
+    parser.add_argument("--child", nargs=5, metavar=("SCRIPT", "SCENE", "WIDTH", "HEIGHT", "FPS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        script, scene, width, height, fps = args.child
+        print(json.dumps(run_scene(script, scene, int(width), int(height), int(fps))))
+        return
+
+    baselines = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {}
+    print(f"{'scene':>16} {'res':>5} {'setup s':>8} {'p50 ms':>7} {'p90 ms':>7} {'p99 ms':>7} {'RSS MB':>7} {'partial':>7}")
+    failed, recorded = [], []
+    for scene in args.scenes:
+        for resolution in args.resolutions:
+            key = f"{scene}/{resolution}"
+            result = benchmark(scene, resolution)
+            print(f"{scene:>16} {resolution:>5} {result['setup_s']:>8.2f} {result['frame_p50_ms']:>7.1f} "
+                  f"{result['frame_p90_ms']:>7.1f} {result['frame_p99_ms']:>7.1f} {result['peak_rss_mb']:>7.0f} "
+                  f"{result['partial_movie_files']:>7}")
+            if args.update_baseline or key not in baselines:
+                if key not in baselines:
+                    recorded.append(key)
+                baselines[key] = result
+            else:
+                failed += [f"{key}: {r}" for r in regressions(result, baselines[key], args.threshold)]
+
+    if args.update_baseline or recorded:
+        tmp = BASELINE_FILE.with_name(f"{BASELINE_FILE.stem}.{os.getpid()}.tmp.json")
+        tmp.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, BASELINE_FILE)
+        print(f"baselines written to {BASELINE_FILE}")
+    if recorded:
+        print(f"\nwarning: no baseline for {', '.join(recorded)} yet, recorded this run as the baseline")
+    if failed:
+        print("\nregressions:\n  " + "\n  ".join(failed))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
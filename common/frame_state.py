@@ -0,0 +1,33 @@
+import numpy as np
+
+# --- Per-frame shared state ---
+# Several updaters of a scene usually need the same value derived from one tracker (the
+# pendulum angle at the current time, say). FrameState tabulates the function once,
+# vectorized over the tracker's range, and evaluates it at most once per frame: the first
+# updater that asks interpolates the table, the others get the stored value. Functions that
+# are already cheap lookups themselves (PendulumTable.theta) skip the table: t_range=None.
+
+class FrameState:
+    """
+    fn(tracker value) for the current frame. With a t_range fn must accept arrays, and
+    outside t_range the table is clamped to its first or last value. With t_range=None fn
+    is called directly, once per new tracker value.
+    """
+    def __init__(self, tracker, fn, t_range=None, samples=4096):
+        self.tracker = tracker
+        self.fn = fn
+        if t_range is not None:
+            self.table_t = np.linspace(*t_range, samples)
+            self.table = np.asarray(fn(self.table_t), dtype=float)
+        self._t = None
+        self._value = None
+
+    def get_value(self):
+        t = self.tracker.get_value()
+        if t != self._t:
+            self._t = t
+            if hasattr(self, "table"):
+                self._value = float(np.interp(t, self.table_t, self.table))
+            else:
+                self._value = float(self.fn(t))
+        return self._value
@@ -0,0 +1,83 @@
+from manim import *
+import numpy as np
+
+class GrowingCurve(VMobject):
+    """
+    Polyline that grows point by point, like set_points_as_corners on an ever longer list,
+    but only the newest segment is written. The Bézier points live in a buffer preallocated
+    for `capacity` points and self.points is a view into it, so appending costs the same
+    whether the curve holds 10 or 10^5 points.
+    """
+    def __init__(self, capacity=1000, **kwargs):
+        super().__init__(**kwargs)
+        nppcc = self.n_points_per_cubic_curve
+        self._buffer = np.zeros((max(capacity - 1, 1) * nppcc, 3))
+        self._n_segments = 0
+        self._first_point = None
+        self._sync_view()
+
+    def _sync_view(self):
+        self._view = self._buffer[:self._n_segments * self.n_points_per_cubic_curve]
+        self.points = self._view
+
+    def _reclaim_points(self):
+        # shift/scale/become replace self.points with a new array; copy it back once
+        if self.points is self._view:
+            return
+        n = len(self.points)
+        if n > len(self._buffer):
+            self._buffer = np.zeros((2 * n, 3))
+        self._buffer[:n] = self.points
+        self._n_segments = n // self.n_points_per_cubic_curve
+        self._sync_view()
+
+    def _last_point(self):
+        if self._n_segments:
+            return self._buffer[self._n_segments * self.n_points_per_cubic_curve - 1]
+        return self._first_point
+
+    def get_num_corners(self):
+        self._reclaim_points()
+        if self._first_point is None and not self._n_segments:
+            return 0
+        return self._n_segments + 1
+
+    def add_point(self, point):
+        return self.add_points_as_corners_to_curve([point])
+
+    def add_points_as_corners_to_curve(self, points):
+        """Append corners to the end of the curve, only touching the new segments."""
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if len(points) == 0:
+            return self
+        self._reclaim_points()
+        last = self._last_point()
+        if last is None:
+            self._first_point = points[0].copy()
+            points = points[1:]
+            last = self._first_point
+        if len(points) == 0:
+            return self
+
+        nppcc = self.n_points_per_cubic_curve
+        anchors = np.vstack([last, points])
+        # same handles as set_points_as_corners: evenly spaced along each straight segment
+        alphas = np.linspace(0, 1, nppcc)[None, :, None]
+        segments = anchors[:-1, None, :] + alphas * (anchors[1:] - anchors[:-1])[:, None, :]
+
+        start = self._n_segments * nppcc
+        end = start + len(points) * nppcc
+        if end > len(self._buffer): # out of capacity, grow geometrically
+            grown = np.zeros((max(end, 2 * len(self._buffer)), 3))
+            grown[:start] = self._buffer[:start]
+            self._buffer = grown
+        self._buffer[start:end] = segments.reshape(-1, 3)
+        self._n_segments += len(points)
+        self._sync_view()
+        return self
+
+    def clear_points(self):
+        self._n_segments = 0
+        self._first_point = None
+        self._sync_view()
+        return self
@@ -0,0 +1,27 @@
+import sys
+
+# --- Command lines that wrap manim ---
+# Tools that run a scene take their own options first and pass everything after -- to
+# manim unchanged. The split happens before argparse sees the line: argparse would
+# otherwise read options given after the positionals (-r, --fps, ...) as its own.
+
+
+def parse_args_with_manim(parser, argv=None):
+    """
+    parser.parse_args on everything before the first --, with what follows it as
+    args.manim_args. argv defaults to sys.argv[1:].
+
+    >>> import argparse
+    >>> parser = argparse.ArgumentParser()
+    >>> _ = parser.add_argument("script")
+    >>> args = parse_args_with_manim(parser, ["lorenz/lorenz.py", "--", "-ql", "--fps", "15", "--", "x"])
+    >>> args.script, args.manim_args
+    ('lorenz/lorenz.py', ['-ql', '--fps', '15', '--', 'x'])
+    >>> parse_args_with_manim(parser, ["lorenz/lorenz.py"]).manim_args
+    []
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    own, manim_args = (argv[:argv.index("--")], argv[argv.index("--") + 1:]) if "--" in argv else (argv, [])
+    args = parser.parse_args(own)
+    args.manim_args = manim_args
+    return args
@@ -0,0 +1,96 @@
+from functools import lru_cache
+from manim import *
+import numpy as np
+
+# --- Glyph cache ---
+# Pango renders the glyphs of a (font, font_size) once, every label string after that
+# is put together from the cached outlines without calling Pango again.
+GLYPH_CHARSET = "0123456789+-.,"
+LAYOUT_CACHE_SIZE = 1024
+RULER_LENGTH = 1e-3 # short enough to always sit inside the label's bounding box
+
+_glyph_sets = {}
+
+
+def _outline(mob):
+    return np.concatenate([m.points for m in mob.family_members_with_points()])
+
+
+def _glyph(mob, baseline, gap):
+    # outline relative to (left edge, baseline) and how far the cursor moves after it
+    points = _outline(mob) - np.array([mob.get_left()[0], baseline, 0])
+    return points, mob.width + gap
+
+
+def _glyph_set(font, font_size):
+    key = (font, font_size)
+    if key not in _glyph_sets:
+        reference = Text(GLYPH_CHARSET, font=font, font_size=font_size, disable_ligatures=True)
+        baseline = reference[0].get_bottom()[1] # digits sit on the baseline
+        gap = float(np.median([reference[i + 1].get_left()[0] - reference[i].get_right()[0] for i in range(9)]))
+        glyphs = {char: _glyph(mob, baseline, gap) for char, mob in zip(GLYPH_CHARSET, reference)}
+        glyphs[" "] = (np.zeros((0, 3)), glyphs["0"][1])
+        _glyph_sets[key] = {"glyphs": glyphs, "gap": gap}
+    return _glyph_sets[key]
+
+
+def _get_glyph(char, font, font_size):
+    glyph_set = _glyph_set(font, font_size)
+    glyphs = glyph_set["glyphs"]
+    if char not in glyphs:
+        # anything outside the charset is rendered once next to a "0" to find its baseline
+        reference = Text("0" + char, font=font, font_size=font_size, disable_ligatures=True)
+        glyphs[char] = _glyph(reference[1], reference[0].get_bottom()[1], glyph_set["gap"])
+    return glyphs[char]
+
+
+@lru_cache(maxsize=LAYOUT_CACHE_SIZE)
+def _layout(text, font, font_size):
+    # outline of the whole string, centered on its bounding box like Text(...).move_to(center)
+    parts = []
+    cursor = 0.0
+    for char in text:
+        points, advance = _get_glyph(char, font, font_size)
+        parts.append(points + np.array([cursor, 0, 0]))
+        cursor += advance
+    points = np.concatenate(parts) if parts else np.zeros((0, 3)) # "" during a transition
+    if len(points):
+        points -= (points.min(axis=0) + points.max(axis=0)) / 2
+    points.setflags(write=False)
+    return points
+
+
+# --- Label ---
+class NumericLabel(VMobject):
+    """
+    Drop-in replacement for a Text that shows a changing number in a HUD.
+    set_value/set_text swap in the cached outline of the new string instead of rendering
+    a new Text, and keep the label's current position, scale and rotation.
+    """
+    def __init__(self, value="-", num_decimal_places=1, font="", font_size=48, color=WHITE, **kwargs):
+        super().__init__(fill_color=color, fill_opacity=1, stroke_width=0, **kwargs)
+        self.num_decimal_places = num_decimal_places
+        self.font = font
+        self.font_size = font_size
+        self.text = None
+        # invisible straight segment that follows every shift/scale/rotate applied to the label
+        self._ruler = VMobject(fill_opacity=0, stroke_width=0)
+        self._ruler.set_points_as_corners([ORIGIN, RIGHT * RULER_LENGTH])
+        self.add(self._ruler)
+        self.set_value(value)
+
+    def set_value(self, value):
+        if isinstance(value, str):
+            return self.set_text(value)
+        return self.set_text(f"{value:.{self.num_decimal_places}f}")
+
+    def set_text(self, text):
+        if text == self.text:
+            return self
+        layout = _layout(text, self.font, self.font_size)
+        origin = self._ruler.points[0]
+        x_axis = (self._ruler.points[-1] - origin) / RULER_LENGTH
+        y_axis = np.array([-x_axis[1], x_axis[0], 0])
+        self.points = origin + layout[:, :1] * x_axis + layout[:, 1:2] * y_axis
+        self.text = text
+        return self
@@ -0,0 +1,206 @@
+import math
+
+import numpy as np
+
+# --- Nonlinear pendulum ---
+# θ'' = -ω0² sin θ - 2β θ' + A cos(Ω t), integrated once over the whole animation with
+# fixed-step RK4. Without a drive (A = 0) this is the plain damped pendulum.
+# Every few steps θ and ω = θ' are stored; frames read them back with cubic Hermite
+# interpolation, which uses both and stays far below a pixel between the stored samples.
+
+def free_period(theta0, natural_frequency, omega_start=0.0):
+    """
+    Exact period of the undamped, undriven pendulum started at (theta0, omega_start):
+    T = 2π / (ω0 AGM(1, cos(θmax / 2))), θmax from the energy. Longer than 2π/ω0.
+    """
+    cos_max = math.cos(theta0) - omega_start**2 / (2 * natural_frequency**2)
+    if cos_max <= -1:
+        raise ValueError("the pendulum goes over the top, it does not swing back")
+    a, b = 1.0, math.sqrt((1 + cos_max) / 2) # cos(θmax / 2)
+    while abs(a - b) > 1e-15 * a:
+        a, b = (a + b) / 2, math.sqrt(a * b)
+    return 2 * math.pi / (natural_frequency * a)
+
+
+class PendulumTable:
+    """
+    θ(t) and ω(t) of a pendulum released at theta0 with angular velocity omega_start.
+    natural_frequency is ω0 = sqrt(g/L), damping is β, the optional drive adds
+    drive_amplitude * cos(drive_frequency * t) to θ''. Times outside [0, t_max] are clamped.
+    """
+    def __init__(self, theta0, t_max, natural_frequency, damping=0.0, omega_start=0.0,
+                 drive_amplitude=0.0, drive_frequency=0.0, dt=1e-3, store_every=10):
+        self.theta0, self.omega_start = theta0, omega_start
+        self.natural_frequency = natural_frequency
+        self.damping = damping
+        self.drive_amplitude = drive_amplitude
+        self.drive_frequency = drive_frequency
+        self.t_max = t_max
+        self.h = dt * store_every # spacing of the stored samples
+        n_stored = int(math.ceil(t_max / self.h)) + 1
+        table = np.empty((n_stored, 2))
+        table[0] = theta0, omega_start
+
+        theta, omega = float(theta0), float(omega_start)
+        w2, b2 = natural_frequency**2, 2 * damping
+        a, f = drive_amplitude, drive_frequency
+        step = 0
+        for i in range(1, n_stored):
+            for _ in range(store_every):
+                # RK4 on (θ, ω), plain floats: far faster than numpy for a single system
+                t = step * dt
+                d1, d2, d3 = a * math.cos(f * t), a * math.cos(f * (t + 0.5 * dt)), a * math.cos(f * (t + dt))
+                k1t, k1w = omega, -w2 * math.sin(theta) - b2 * omega + d1
+                t2, w2_ = theta + 0.5 * dt * k1t, omega + 0.5 * dt * k1w
+                k2t, k2w = w2_, -w2 * math.sin(t2) - b2 * w2_ + d2
+                t3, w3 = theta + 0.5 * dt * k2t, omega + 0.5 * dt * k2w
+                k3t, k3w = w3, -w2 * math.sin(t3) - b2 * w3 + d2
+                t4, w4 = theta + dt * k3t, omega + dt * k3w
+                k4t, k4w = w4, -w2 * math.sin(t4) - b2 * w4 + d3
+                theta += dt / 6 * (k1t + 2 * k2t + 2 * k3t + k4t)
+                omega += dt / 6 * (k1w + 2 * k2w + 2 * k3w + k4w)
+                step += 1
+            table[i] = theta, omega
+        # columns θ, ω, α = ω': each value next to the derivative the interpolation needs
+        times = np.arange(n_stored) * self.h
+        self.table = np.column_stack([table, self.acceleration(table[:, 0], table[:, 1], times)])
+        # cubic Hermite per interval as Horner coefficients in s = (t - t_i) / h, so a lookup
+        # is one index and three multiply-adds; plain floats for single frame times
+        self._inv_h = 1 / self.h
+        self._theta_coeffs = self._hermite_coefficients(0)
+        self._omega_coeffs = self._hermite_coefficients(1)
+        self._theta_rows = self._theta_coeffs.tolist()
+        self._omega_rows = self._omega_coeffs.tolist()
+
+    @property
+    def period(self):
+        """Period of the swing, only defined without damping and drive."""
+        if self.damping or self.drive_amplitude:
+            raise ValueError("a damped or driven pendulum has no fixed period")
+        return free_period(self.theta0, self.natural_frequency, self.omega_start)
+
+    def acceleration(self, theta, omega, t=0.0):
+        return (-self.natural_frequency**2 * np.sin(theta) - 2 * self.damping * omega
+                + self.drive_amplitude * np.cos(self.drive_frequency * t))
+
+    def _hermite_coefficients(self, column):
+        # value in column and its derivative in column + 1 -> (n_intervals, 4), lowest power first
+        y0, y1 = self.table[:-1, column], self.table[1:, column]
+        d0, d1 = self.table[:-1, column + 1] * self.h, self.table[1:, column + 1] * self.h
+        return np.column_stack([y0, d0, 3 * (y1 - y0) - 2 * d0 - d1, 2 * (y0 - y1) + d0 + d1])
+
+    def _lookup(self, t, rows, coeffs):
+        if isinstance(t, (float, int)): # single frame time: plain floats, no array overhead
+            t = float(t) # trackers hand out numpy scalars, their arithmetic is several times slower
+            x = (t if 0.0 < t < self.t_max else min(max(t, 0.0), self.t_max)) * self._inv_h
+            i = int(x)
+            if i >= len(rows):
+                i = len(rows) - 1
+            c0, c1, c2, c3 = rows[i]
+            s = x - i
+            return c0 + s * (c1 + s * (c2 + s * c3))
+        x = np.clip(np.asarray(t, dtype=float), 0.0, self.t_max) * self._inv_h
+        i = np.minimum(x.astype(int), len(coeffs) - 1)
+        s = x - i
+        c = coeffs[i]
+        return c[..., 0] + s * (c[..., 1] + s * (c[..., 2] + s * c[..., 3]))
+
+    def theta(self, t):
+        return self._lookup(t, self._theta_rows, self._theta_coeffs)
+
+    def omega(self, t):
+        return self._lookup(t, self._omega_rows, self._omega_coeffs)
+
+
+# --- Poincaré sections of the driven pendulum ---
+# One pendulum per drive amplitude, all integrated together with numpy RK4. The step
+# divides the drive period exactly, so the drive term only takes steps_per_period
+# distinct values per RK4 stage: they are computed once instead of at every step.
+
+def wrap_angle(theta):
+    return (theta + np.pi) % (2 * np.pi) - np.pi
+
+
+def poincare_sections(drive_amplitudes, natural_frequency, damping, drive_frequency, n_periods=100,
+                      n_transient=300, steps_per_period=200, theta0=0.2, omega_start=0.0):
+    """
+    (θ, ω) of every pendulum once per drive period, after n_transient periods have let the
+    start die out. θ is wrapped to [-π, π). Returns shape (n_periods, len(drive_amplitudes), 2).
+    """
+    a = np.asarray(drive_amplitudes, dtype=float)
+    dt = 2 * np.pi / drive_frequency / steps_per_period
+    phase = drive_frequency * dt * np.arange(steps_per_period)
+    drive_start, drive_mid, drive_end = (np.cos(phase + drive_frequency * dt * x) for x in (0, 0.5, 1))
+    w2, b2 = natural_frequency**2, 2 * damping
+    theta, omega = np.full_like(a, theta0), np.full_like(a, omega_start)
+
+    sections = np.empty((n_periods, len(a), 2))
+    for period in range(n_transient + n_periods):
+        for k in range(steps_per_period):
+            d1, d2, d3 = a * drive_start[k], a * drive_mid[k], a * drive_end[k]
+            k1t, k1w = omega, -w2 * np.sin(theta) - b2 * omega + d1
+            k2t = omega + 0.5 * dt * k1w
+            k2w = -w2 * np.sin(theta + 0.5 * dt * k1t) - b2 * k2t + d2
+            k3t = omega + 0.5 * dt * k2w
+            k3w = -w2 * np.sin(theta + 0.5 * dt * k2t) - b2 * k3t + d2
+            k4t = omega + dt * k3w
+            k4w = -w2 * np.sin(theta + dt * k3t) - b2 * k4t + d3
+            theta = theta + dt / 6 * (k1t + 2 * k2t + 2 * k3t + k4t)
+            omega = omega + dt / 6 * (k1w + 2 * k2w + 2 * k3w + k4w)
+        theta = wrap_angle(theta) # keeps θ small, sin is periodic anyway
+        if period >= n_transient:
+            sections[period - n_transient] = np.stack([theta, omega], axis=-1)
+    return sections
+
+
+# quick test
+if __name__ == "__main__":
+    import timeit
+    from scipy.integrate import solve_ivp
+
+    amplitude, w0, beta = np.pi / 2 * 0.8, np.sqrt(9.81 / 6), 0.25
+    table = PendulumTable(amplitude, 30, w0, beta)
+    t = np.linspace(0, 30, 1801)
+    reference = solve_ivp(lambda _, y: [y[1], -w0**2 * np.sin(y[0]) - 2 * beta * y[1]], (0, 30), [amplitude, 0],
+                          t_eval=t, method="DOP853", rtol=1e-12, atol=1e-12).y
+    print("max |θ error| / |ω error|:", np.abs(table.theta(t) - reference[0]).max(), np.abs(table.omega(t) - reference[1]).max())
+    omega_d = np.sqrt(w0**2 - beta**2)
+    print("max |θ error| of the small-angle formula:", np.abs(amplitude * np.exp(-beta * t) * np.cos(omega_d * t) - reference[0]).max())
+    period = free_period(amplitude, w0)
+    free = PendulumTable(amplitude, period, w0)
+    print(f"period {period:.4f} s (small angles {2 * np.pi / w0:.4f} s), "
+          f"|θ(T) - θ0| {abs(free.theta(period) - amplitude):.1e}, |ω(T)| {abs(free.omega(period)):.1e}")
+
+    # per frame of Pendulum_damped: its θ updaters (line, ball, arc, label, and the state box
+    # every other frame) used to evaluate the closed form 4.5 times; now FrameState asks the
+    # table once and the updaters read the stored value
+    from common.frame_state import FrameState
+    from common.timing import best_of
+
+    class Tracker:
+        value = 0.0
+
+        def get_value(self):
+            return self.value
+
+    frames = list(np.linspace(0, 30, 30 * 60)) # numpy scalars, like ValueTracker.get_value()
+    tracker = Tracker()
+    theta_state = FrameState(tracker, table.theta)
+
+    def per_frame(read):
+        def run():
+            for n, x in enumerate(frames):
+                tracker.value = x
+                for _ in range(4 + n % 2):
+                    read(x)
+        return best_of(run, 5) / len(frames)
+
+    old = per_frame(lambda x: amplitude * np.exp(-beta * x) * np.cos(omega_d * x))
+    new = per_frame(lambda x: theta_state.get_value())
+    loop = per_frame(lambda x: None) # the frame loop itself
+    print(f"per frame: closed form 4.5x {(old - loop) * 1e6:.2f} us, table via FrameState {(new - loop) * 1e6:.2f} us")
+    x = np.float64(12.345)
+    single = min(timeit.repeat(lambda: table.theta(x), number=10_000, repeat=5)) / 10_000
+    closed = min(timeit.repeat(lambda: amplitude * np.exp(-beta * x) * np.cos(omega_d * x),
+                               number=10_000, repeat=5)) / 10_000
+    print(f"per call: table {single * 1e6:.2f} us, closed form {closed * 1e6:.2f} us")
@@ -0,0 +1,183 @@
+from manim import *
+import numpy as np
+
+from common.trail import Trail
+from common.trajectory_cache import default_cache
+
+# --- Phase portraits ---
+# A small panel with the flow of a 2D system: streamlines from a grid of seeds, an arrow
+# tip on each, the two nullclines and a dot for the live state. The field is only ever
+# evaluated on whole arrays: all seeds step together, the nullclines come from one grid.
+# Streamlines are cached per system and parameter set; everything but the dot is drawn
+# as a handful of VMobjects with many subpaths, so the panel costs a few stroke calls.
+
+def streamlines(field, x_range, y_range, seeds=(20, 15), steps=20, line_length=1.2):
+    """
+    Streamlines of field(x, y) -> (dx, dy) through a grid of seeds, shape (n_seeds, 2 * steps + 1, 2).
+    Each runs steps both ways from its seed, at constant speed in panel units: line_length
+    is its full length in seed spacings. Points past the panel edge or a fixed point are NaN.
+    """
+    (x0, x1), (y0, y1) = x_range, y_range
+    span = np.array([x1 - x0, y1 - y0])
+    nx, ny = seeds
+    u, v = np.meshgrid((np.arange(nx) + 0.5) / nx, (np.arange(ny) + 0.5) / ny)
+    start = np.column_stack([u.ravel(), v.ravel()]) # panel units, [0, 1]²
+    h = line_length / max(nx, ny) / (2 * steps)
+
+    def direction(p):
+        x = np.array([x0, y0]) + p * span
+        d = np.stack(field(x[:, 0], x[:, 1]), axis=-1) / span
+        speed = np.linalg.norm(d, axis=-1, keepdims=True)
+        return d / np.where(speed > 1e-12, speed, np.nan)
+
+    halves = []
+    for sign in (1, -1):
+        line = np.full((steps + 1, len(start), 2), np.nan)
+        p = line[0] = start
+        with np.errstate(invalid="ignore"):
+            for i in range(1, steps + 1):
+                p = p + sign * h * direction(p + 0.5 * sign * h * direction(p)) # midpoint step
+                p[~((p >= 0) & (p <= 1)).all(axis=-1)] = np.nan # NaN stays NaN from here on
+                line[i] = p
+        halves.append(line)
+    lines = np.concatenate([halves[1][:0:-1], halves[0]]) # backward reversed, then forward
+    return np.array([x0, y0]) + lines.transpose(1, 0, 2) * span
+
+
+# edges of a grid cell: 0 bottom, 1 right, 2 top, 3 left, as (corner, corner) pairs of
+# the corners 0 (x0, y0), 1 (x1, y0), 2 (x1, y1), 3 (x0, y1)
+_EDGES = [(0, 1), (1, 2), (3, 2), (0, 3)]
+
+
+def marching_squares(values, xs, ys):
+    """
+    Zero contour of values sampled on the grid (len(ys), len(xs)), as line segments
+    of shape (n, 2, 2). All cells are handled at once; saddle cells are resolved by the
+    value at the cell center.
+    """
+    values = np.asarray(values, dtype=float)
+    X, Y = np.meshgrid(xs, ys)
+    corner_values = [values[:-1, :-1], values[:-1, 1:], values[1:, 1:], values[1:, :-1]]
+    corner_points = [np.stack([g[:-1, :-1], g[:-1, 1:], g[1:, 1:], g[1:, :-1]]) for g in (X, Y)]
+
+    crossings, hits = [], []
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for a, b in _EDGES:
+            va, vb = corner_values[a], corner_values[b]
+            w = va / (va - vb)
+            hits.append((va < 0) != (vb < 0))
+            crossings.append(np.stack([p[a] + w * (p[b] - p[a]) for p in corner_points], axis=-1))
+    crossings, hits = np.stack(crossings, axis=-2), np.stack(hits, axis=-1) # (..., 4, 2), (..., 4)
+
+    # two crossed edges: one segment between them
+    two = hits.sum(axis=-1) == 2
+    first = np.argmax(hits, axis=-1)
+    second = 3 - np.argmax(hits[..., ::-1], axis=-1)
+    segments = [np.stack([np.take_along_axis(crossings, i[..., None, None], -2)[..., 0, :]
+                          for i in (first, second)], axis=-2)[two]]
+
+    # saddles, all four edges crossed: cut off the two corners whose sign differs from the center's
+    four = hits.all(axis=-1)
+    center_same_as_0 = (sum(corner_values) / 4 < 0) == (corner_values[0] < 0)
+    for keep_corner_0, pairs in ((True, [(0, 1), (2, 3)]), (False, [(0, 3), (1, 2)])):
+        cells = crossings[four & (center_same_as_0 == keep_corner_0)]
+        segments += [cells[:, pair] for pair in pairs]
+    return np.concatenate(segments)
+
+
+def _segment_points(starts, ends, nppcc):
+    # straight Bézier curves, one per row, flattened into a VMobject's points
+    alphas = np.linspace(0, 1, nppcc)[:, None]
+    return (starts[:, None] + alphas * (ends - starts)[:, None]).reshape(-1, 3)
+
+
+def _as_3d(points):
+    return np.concatenate([points, np.zeros((*points.shape[:-1], 1))], axis=-1)
+
+
+class PhasePortrait(VGroup):
+    """
+    Phase-space panel of field(x, y) -> (dx, dy), vectorized over arrays. x_range and
+    y_range are [min, max, tick step] like Axes. system and params key the streamline
+    cache: change system when the equations change. track() attaches the live state.
+    """
+    def __init__(self, field, x_range, y_range, system, params=(), x_length=4, y_length=3,
+                 axis_labels=("x", "y"), seeds=(20, 15), steps=20, line_length=1.2,
+                 nullcline_resolution=200, stream_color=GREY_B, stream_opacity=0.6,
+                 nullcline_colors=("#0072B2", "#E69F00"), dot_color=YELLOW, cache=None, **kwargs):
+        super().__init__(**kwargs)
+        bounds = (x_range[:2], y_range[:2])
+        self.axes = Axes(x_range=x_range, y_range=y_range, x_length=x_length, y_length=y_length,
+                         tips=False, axis_config={"stroke_width": 2})
+        self.labels = VGroup(
+            Text(axis_labels[0], font_size=24).next_to(self.axes.x_axis, DOWN, buff=0.15),
+            Text(axis_labels[1], font_size=24).next_to(self.axes.y_axis, LEFT, buff=0.15),
+        )
+        self.box = SurroundingRectangle(VGroup(self.axes, self.labels), color=WHITE, buff=0.2, stroke_width=4)
+        nppcc = VMobject().n_points_per_cubic_curve
+
+        # streamlines, one subpath per segment between two steps
+        cache = cache or default_cache()
+        key = cache.key(f"phase_portrait/{system}", params, bounds, (seeds, steps, line_length), "streamlines/midpoint")
+        lines = cache.get_or_compute(key, lambda: streamlines(field, *bounds, seeds, steps, line_length).astype(np.float32))
+        points = self.axes.c2p(*np.asarray(lines, dtype=float).reshape(-1, 2).T).T.reshape(*lines.shape[:2], 3)
+        starts, ends = points[:, :-1].reshape(-1, 3), points[:, 1:].reshape(-1, 3)
+        valid = np.isfinite(starts).all(axis=-1) & np.isfinite(ends).all(axis=-1)
+        self.streamlines = VMobject(stroke_color=stream_color, stroke_width=1.5, stroke_opacity=stream_opacity)
+        self.streamlines.points = _segment_points(starts[valid], ends[valid], nppcc)
+
+        # an arrow tip where each streamline leaves its seed, pointing downstream
+        seed, ahead = points[:, steps], points[:, steps + 1]
+        ok = np.isfinite(ahead).all(axis=-1)
+        forward = ahead[ok] - seed[ok]
+        forward /= np.linalg.norm(forward, axis=-1, keepdims=True)
+        side = np.stack([-forward[:, 1], forward[:, 0], np.zeros(len(forward))], axis=-1)
+        tip_size = 0.06 * min(x_length, y_length) / 3
+        corners = [seed[ok] + tip_size * forward, seed[ok] - tip_size * (forward + 0.6 * side),
+                   seed[ok] - tip_size * (forward - 0.6 * side)]
+        self.arrow_tips = VMobject(stroke_width=0, fill_color=stream_color, fill_opacity=stream_opacity)
+        self.arrow_tips.points = np.stack([_segment_points(corners[i], corners[(i + 1) % 3], nppcc).reshape(-1, nppcc, 3)
+                                           for i in range(3)], axis=1).reshape(-1, 3)
+
+        # nullclines dx = 0 and dy = 0, from one evaluation of the field on a fine grid of
+        # cell centers: nullclines on the panel edge (R = 0 for populations) are left to the axes
+        n = nullcline_resolution
+        xs, ys = (lo + (np.arange(n) + 0.5) * (hi - lo) / n for lo, hi in bounds)
+        X, Y = np.meshgrid(xs, ys)
+        self.nullclines = VGroup()
+        for component, color in zip(field(X, Y), nullcline_colors):
+            segments = _as_3d(marching_squares(np.broadcast_to(component, X.shape), xs, ys))
+            segments = self.axes.c2p(*segments.reshape(-1, 3).T).T.reshape(-1, 2, 3)
+            nullcline = VMobject(stroke_color=color, stroke_width=3)
+            nullcline.points = _segment_points(segments[:, 0], segments[:, 1], nppcc)
+            self.nullclines.add(nullcline)
+
+        self.dot = Dot(self.axes.c2p(*np.mean(bounds, axis=1)), radius=0.08, color=dot_color).set_z_index(1)
+        self.background = VGroup(self.box, self.axes, self.labels, self.streamlines, self.arrow_tips, self.nullclines)
+        self.add(self.background, self.dot)
+
+    def track(self, get_state, trail_length=0):
+        """Keep the dot on get_state() -> (x, y); trail_length > 0 draws its recent path too."""
+        axes = self.axes
+        self.dot.add_updater(lambda dot: dot.move_to(axes.c2p(*get_state())))
+        self.dot.update()
+        if trail_length:
+            self.trail = Trail(trail_length, color=self.dot.get_color(), stroke_width=2).track(self.dot)
+            self.remove(self.dot)
+            self.add(self.trail, self.dot) # above the background, beneath the dot
+        return self
+
+
+# quick test
+if __name__ == "__main__":
+    # nullclines of the damped pendulum: ω = 0 and ω = -ω0² sin θ / 2β
+    w0, beta = np.sqrt(9.81 / 6), 0.25
+    field = lambda theta, omega: (omega, -w0**2 * np.sin(theta) - 2 * beta * omega)
+    xs, ys = np.linspace(-1.5, 1.5, 201), np.linspace(-2, 2, 151)
+    X, Y = np.meshgrid(xs, ys)
+    for component, exact in zip(field(X, Y), (lambda x: 0 * x, lambda x: -w0**2 * np.sin(x) / (2 * beta))):
+        segments = marching_squares(np.broadcast_to(component, X.shape), xs, ys)
+        points = segments.reshape(-1, 2)
+        print(f"{len(segments)} segments, max distance from the exact nullcline {np.abs(points[:, 1] - exact(points[:, 0])).max():.2e}")
+    lines = streamlines(field, (-1.5, 1.5), (-2, 2))
+    print(f"streamlines {lines.shape}, {np.isfinite(lines[..., 0]).mean():.0%} of the points inside the panel")
@@ -0,0 +1,48 @@
+from manim import *
+import numpy as np
+
+# --- Polyline level of detail ---
+# Dense samples of a smooth trajectory mostly lie on straight lines at output resolution.
+# Ramer–Douglas–Peucker keeps only the samples needed to stay within a tolerance, so
+# stroke rendering and arc-length lookups work on far fewer Bézier curves.
+
+def _segment_distances(points, start, end):
+    # distance of every point to the segment start-end (not the infinite line, so loops back count)
+    direction = end - start
+    length_sq = direction @ direction
+    if length_sq == 0:
+        return np.linalg.norm(points - start, axis=1)
+    t = np.clip((points - start) @ direction / length_sq, 0, 1)
+    return np.linalg.norm(points - (start + t[:, None] * direction), axis=1)
+
+
+def simplify_polyline(points, tolerance):
+    """
+    Indices of the points Ramer–Douglas–Peucker keeps: no dropped point is further than
+    tolerance from the simplified polyline. First and last point are always kept.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)] if n > 2 else []
+    while stack:
+        a, b = stack.pop()
+        if b - a < 2:
+            continue
+        distances = _segment_distances(points[a + 1:b], points[a], points[b])
+        i = int(np.argmax(distances))
+        if distances[i] > tolerance:
+            m = a + 1 + i
+            keep[m] = True
+            stack += [(a, m), (m, b)]
+    return np.flatnonzero(keep)
+
+
+def pixel_size(camera=None):
+    """Scene units per output pixel, for the given camera's frame and zoom."""
+    if camera is None:
+        return config.frame_width / config.pixel_width
+    width = camera.frame.width if hasattr(camera, "frame") else camera.frame_width
+    zoom = camera.get_zoom() if hasattr(camera, "get_zoom") else 1
+    return width / zoom / camera.pixel_width
@@ -0,0 +1,191 @@
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+# --- Batch rendering ---
+# Finds every Scene class in the scene folders and renders it in a matrix of quality
+# presets on a process pool, each job a manim run from the repo root, so the videos land
+# in media/videos/... like hand-started renders.
+#
+#   python -m common.render_all --quality low high
+#
+# A job is skipped when its inputs are unchanged: the hash covers the scene file, the
+# local modules it imports (recursively), the SVG files named in any of them, the scene
+# name, the preset's arguments and the manim version. Hashes and outputs are kept in
+# media/render_manifest.json, updated after every finished job.
+ROOT = Path(__file__).resolve().parents[1]
+SCENE_DIRS = ["lorenz", "pendulum_*", "lotka_volterra", "traffic"]
+MANIFEST = ROOT / "media" / "render_manifest.json"
+LOG_DIR = ROOT / "media" / "render_logs"
+PRESETS = {
+    "low": ["-ql"],
+    "medium": ["-qm"],
+    "high": ["-qh"],
+    "4k": ["-qk"],
+    "square": ["-r", "1080,1080", "--fps", "50"], # the LVAnimation GIF source, see CLprompts.txt
+}
+# the folder manim writes each preset's video to, <height>p<frame rate>
+QUALITY_DIRS = {
+    "low": "480p15",
+    "medium": "720p30",
+    "high": "1080p60",
+    "4k": "2160p60",
+    "square": "1080p50",
+}
+
+
+def _bases(node):
+    # base class names, attribute bases by their last part (manim.Scene -> Scene)
+    return [b.id if isinstance(b, ast.Name) else b.attr for b in node.bases if isinstance(b, (ast.Name, ast.Attribute))]
+
+
+def discover_scenes(root=ROOT):
+    """(script, class name) of every class deriving from a *Scene class, found by parsing, not importing."""
+    scenes = []
+    for pattern in SCENE_DIRS:
+        for script in sorted(root.glob(f"{pattern}/*.py")):
+            tree = ast.parse(script.read_text(encoding="utf-8"))
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef) and any(base.endswith("Scene") for base in _bases(node)):
+                    scenes.append((script.relative_to(root).as_posix(), node.name))
+    return scenes
+
+
+def local_imports(script, root=ROOT):
+    """script and every repo module it imports, directly or not: sibling modules and packages from the root."""
+    seen, todo = set(), [Path(script).resolve()]
+    while todo:
+        path = todo.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            for name in names:
+                relative = Path(*name.split(".")).with_suffix(".py")
+                for base in (path.parent, root):
+                    if (base / relative).is_file():
+                        todo.append((base / relative).resolve())
+                        break
+    return sorted(seen)
+
+
+def svg_assets(sources, root=ROOT):
+    """SVG files named by string constants in the sources, relative to the root like the scenes load them."""
+    assets = set()
+    for path in sources:
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str) and node.value.endswith(".svg"):
+                if (root / node.value).is_file():
+                    assets.add((root / node.value).resolve())
+    return sorted(assets)
+
+
+def _manim_version():
+    try:
+        return version("manim")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def input_hash(script, scene, preset_args, root=ROOT):
+    digest = hashlib.sha256()
+    digest.update(json.dumps([scene, preset_args, _manim_version()]).encode())
+    sources = local_imports(root / script, root)
+    for path in sources + svg_assets(sources, root):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def find_output(script, scene, preset, since, root=ROOT):
+    # the video this job wrote: its path is fixed by the preset, so jobs of other presets
+    # of the same scene running at the same time cannot be mistaken for it
+    video = root / "media" / "videos" / Path(script).stem / QUALITY_DIRS[preset] / f"{scene}.mp4"
+    return video.relative_to(root).as_posix() if video.exists() and video.stat().st_mtime >= since else None
+
+
+def run_job(script, scene, preset):
+    start = time.time()
+    log_path = LOG_DIR / f"{Path(script).stem}_{scene}_{preset}.log"
+    with open(log_path, "w") as log:
+        result = subprocess.run([sys.executable, "-m", "manim", "render", *PRESETS[preset], script, scene],
+                                cwd=ROOT, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode, find_output(script, scene, preset, start), time.time() - start, log_path
+
+
+def load_manifest():
+    try:
+        return json.loads(MANIFEST.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest):
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    tmp = MANIFEST.with_name(f"{MANIFEST.stem}.{os.getpid()}.tmp.json")
+    tmp.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp, MANIFEST)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render every scene in a matrix of quality presets, skipping unchanged ones")
+    parser.add_argument("--quality", nargs="+", choices=sorted(PRESETS), default=["low"])
+    parser.add_argument("--scenes", nargs="+", help="only these scene class names")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--force", action="store_true", help="render even if the inputs are unchanged")
+    parser.add_argument("--list", action="store_true", help="print the jobs and whether they are up to date, render nothing")
+    args = parser.parse_args()
+
+    scenes = [(script, scene) for script, scene in discover_scenes() if not args.scenes or scene in args.scenes]
+    manifest = load_manifest()
+    jobs, up_to_date = [], 0
+    for script, scene in scenes:
+        for preset in args.quality:
+            key = f"{script}::{scene}::{preset}"
+            digest = input_hash(script, scene, PRESETS[preset])
+            entry = manifest.get(key, {})
+            fresh = entry.get("hash") == digest and entry.get("output") and (ROOT / entry["output"]).exists()
+            if args.list:
+                print(f"{'up to date' if fresh else 'to render':>10}  {key}")
+            if fresh and not args.force:
+                up_to_date += 1
+            else:
+                jobs.append((key, digest, script, scene, preset))
+    print(f"{len(scenes)} scenes x {len(args.quality)} presets: {len(jobs)} to render, {up_to_date} up to date")
+    if args.list or not jobs:
+        return
+
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    failed = []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_job, script, scene, preset): (key, digest) for key, digest, script, scene, preset in jobs}
+        for n, future in enumerate(as_completed(futures), 1):
+            key, digest = futures[future]
+            returncode, output, seconds, log_path = future.result()
+            if returncode == 0 and output:
+                manifest[key] = {"hash": digest, "output": output, "seconds": round(seconds, 1)}
+                save_manifest(manifest) # after every job, an interrupted batch keeps what it finished
+                print(f"[{n}/{len(jobs)}] {key}: {output} ({seconds:.0f} s)")
+            else:
+                failed.append(key)
+                print(f"[{n}/{len(jobs)}] {key}: FAILED, see {log_path}")
+    if failed:
+        raise SystemExit(f"{len(failed)} of {len(jobs)} jobs failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from manim import *
+import numpy as np
+from manim.utils.exceptions import EndSceneEarlyException
+
+from common.manim_args import parse_args_with_manim
+
+# --- Segmented rendering ---
+# One long scene rendered as N time windows in parallel, then joined without re-encoding.
+#
+#   python -m common.segmented_render lorenz/lorenz.py Lorenz --segments 8 -- -r 1920,1080 --fps 50
+#
+# Every worker runs construct() from the start, so the state at its window (tracker
+# values, camera angle, updater counters) is exactly what a single render would have:
+# plays before the window advance frame by frame but draw nothing and write no partial
+# movie file, frames outside the window are dropped before the camera captures them,
+# and the worker stops at the first play after its window. The frame count of the
+# whole timeline comes from a dry run first (SEGMENT_PROBE), which draws nothing either.
+# The serial part is only the updaters; drawing, which dominates, is split N ways.
+SEGMENT_ENV = "SEGMENT_FRAMES" # "start:stop", the frames of the full timeline this process writes
+PROBE_ENV = "SEGMENT_PROBE"    # path of a .json: count the frames, render nothing
+WORK_DIR = Path(__file__).resolve().parents[1] / ".cache" / "segments"
+
+
+class SegmentedRenderMixin:
+    """
+    Put in front of the scene's base class: class Lorenz(SegmentedRenderMixin, ThreeDScene).
+    Inert unless SEGMENT_FRAMES or SEGMENT_PROBE is set. Cairo renderer only. Plays ended
+    early by a stop_condition are counted at their full length.
+    """
+    _segment_window = None
+    _segment_silent = False # the current play lies before the window: update, draw nothing
+
+    def setup(self):
+        super().setup()
+        window = os.environ.get(SEGMENT_ENV)
+        self._segment_probe = os.environ.get(PROBE_ENV)
+        if window is None and self._segment_probe is None:
+            return
+        start, stop = (int(x) for x in window.split(":")) if window else (math.inf, math.inf)
+        self._segment_window = (start, stop)
+        self._segment_frame = 0 # frames of the full timeline so far
+        renderer = self.renderer
+        render, add_frame = renderer.render, renderer.add_frame
+
+        def render_in_window(scene, time, moving_mobjects):
+            if start <= self._segment_frame < stop:
+                render(scene, time, moving_mobjects) # counts the frame in add_frame
+            else:
+                self._segment_frame += 1 # no capture, nothing written
+
+        def add_frame_in_window(frame, num_frames=1):
+            first = self._segment_frame
+            self._segment_frame += num_frames
+            keep = min(self._segment_frame, stop) - max(first, start) # frozen frames can straddle the edges
+            if keep > 0:
+                add_frame(frame, num_frames=keep)
+
+        renderer.render = render_in_window
+        renderer.add_frame = add_frame_in_window
+
+    def _play_frames(self):
+        # frames the compiled play will produce, the way the cairo renderer counts them
+        dt = 1 / config.frame_rate
+        if self.is_current_animation_frozen_frame():
+            return int(self.duration / dt)
+        return len(np.arange(0, self.duration, dt))
+
+    def compile_animation_data(self, *animations, **play_kwargs):
+        result = super().compile_animation_data(*animations, **play_kwargs)
+        if self._segment_window is not None:
+            start, stop = self._segment_window
+            if self._segment_frame >= stop:
+                raise EndSceneEarlyException() # nothing after the window is needed
+            self._segment_silent = self._segment_frame + self._play_frames() <= start
+            if self._segment_silent:
+                self.renderer.skip_animations = True # checked by the renderer right after compiling
+        return result
+
+    def get_time_progression(self, run_time, description, n_iterations=None, override_skip_animations=False):
+        # skipped plays normally jump to their end in one step; silent ones keep every frame,
+        # so updaters see the same sequence of dt as in a full render
+        return super().get_time_progression(run_time, description, n_iterations,
+                                            override_skip_animations or self._segment_silent)
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        if self._segment_silent:
+            if not self.is_current_animation_frozen_frame():
+                self.update_mobjects(0) # what play_internal does after every play that is not skipped
+            self._segment_silent = False
+
+    def tear_down(self):
+        super().tear_down()
+        if self._segment_probe:
+            Path(self._segment_probe).write_text(json.dumps({"frames": self._segment_frame}))
+
+
+# --- Command line ---
+
+def manim_command(manim_args, script, scene):
+    return [sys.executable, "-m", "manim", "render", *manim_args, script, scene]
+
+
+def find_video(media_dir, scene):
+    videos = [p for p in Path(media_dir).glob(f"videos/**/{scene}.*") if "partial_movie_files" not in p.parts]
+    if len(videos) != 1:
+        raise RuntimeError(f"expected one rendered video of {scene} in {media_dir}, found {len(videos)}")
+    return videos[0]
+
+
+def parse_args(argv=None):
+    """
+    Options of main(), everything after -- is passed to manim as is.
+
+    >>> args = parse_args("lorenz/lorenz.py Lorenz --segments 8 -- -r 1920,1080 --fps 50".split())
+    >>> args.script, args.scene, args.segments, args.manim_args
+    ('lorenz/lorenz.py', 'Lorenz', 8, ['-r', '1920,1080', '--fps', '50'])
+    """
+    parser = argparse.ArgumentParser(description="Render one scene as parallel time windows and join them losslessly",
+                                     epilog="arguments after -- are passed to every manim run (quality, fps, ...)")
+    parser.add_argument("script")
+    parser.add_argument("scene")
+    parser.add_argument("--segments", type=int, default=os.cpu_count())
+    parser.add_argument("--media-dir", default="media", help="the joined video goes where manim would put it in here")
+    return parse_args_with_manim(parser, argv)
+
+
+def main():
+    args = parse_args()
+    manim_args = args.manim_args
+
+    work = WORK_DIR / f"{Path(args.script).stem}_{args.scene}"
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+    # one thread per worker, the parallelism comes from the processes
+    env = {"OMP_NUM_THREADS": "1", "OPENBLAS_NUM_THREADS": "1", "MKL_NUM_THREADS": "1", **os.environ}
+
+    start = time.perf_counter()
+    probe = work / "probe.json"
+    subprocess.run(manim_command([*manim_args, "--dry_run", "--disable_caching"], args.script, args.scene),
+                   env={**env, PROBE_ENV: str(probe)}, check=True, stdout=subprocess.DEVNULL)
+    total = json.loads(probe.read_text())["frames"]
+    n = max(1, min(args.segments, total))
+    bounds = np.linspace(0, total, n + 1).round().astype(int)
+    print(f"{total} frames in {n} segments, probe took {time.perf_counter() - start:.1f} s")
+
+    # caching off: partial movie hashes know nothing about the window
+    workers = []
+    for k, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+        media_dir = work / f"segment_{k:03d}"
+        log = open(work / f"segment_{k:03d}.log", "w")
+        command = manim_command([*manim_args, "--disable_caching", "--media_dir", str(media_dir)], args.script, args.scene)
+        workers.append((media_dir, log, subprocess.Popen(command, env={**env, SEGMENT_ENV: f"{a}:{b}"},
+                                                         stdout=log, stderr=subprocess.STDOUT)))
+    failed = []
+    for media_dir, log, process in workers:
+        if process.wait() != 0:
+            failed.append(log.name)
+        log.close()
+    if failed:
+        raise SystemExit(f"{len(failed)} segment(s) failed, see {', '.join(failed)}")
+
+    videos = [find_video(media_dir, args.scene) for media_dir, _, _ in workers]
+    out = Path(args.media_dir) / videos[0].relative_to(workers[0][0])
+    out.parent.mkdir(parents=True, exist_ok=True)
+    concat_list = work / "segments.txt"
+    concat_list.write_text("".join(f"file '{v.resolve()}'\n" for v in videos))
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", str(concat_list),
+                    "-c", "copy", str(out)], check=True)
+    print(f"{out} written in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
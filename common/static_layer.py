@@ -0,0 +1,29 @@
+import hashlib
+from manim import *
+
+# --- Static background layers ---
+# Mobjects that never change after setup (tile maps, forest backdrops, axes) are drawn
+# once into the camera background at output resolution. Every frame then starts from
+# that image, so per-frame cost only depends on what actually moves.
+
+def bake_static_layer(scene, *mobjects):
+    """
+    Rasterize mobjects into the camera background and keep them out of the scene.
+    Calls stack: a later bake is drawn on top of the earlier ones. The camera frame must
+    not move after baking, the image is fixed to the frame it was taken in.
+    Other renderers have no background image: the mobjects are added as they are and
+    None is returned.
+    """
+    camera = scene.camera
+    if not hasattr(camera, "background"):
+        logger.warning("Static layers need the cairo renderer, drawing them every frame instead")
+        scene.add(*mobjects)
+        return None
+    scene.remove(*mobjects)
+    camera.reset() # starts from the background color or the previously baked layers
+    camera.capture_mobjects(list(mobjects))
+    camera.background = camera.pixel_array.copy()
+    # the camera's attributes go into manim's partial movie hash, the background array
+    # itself only in truncated form: keep a digest so edits to the layer invalidate the cache
+    camera.static_layer_hash = hashlib.sha256(camera.background.tobytes()).hexdigest()
+    return camera.background
@@ -0,0 +1,93 @@
+import os
+import subprocess
+
+from manim import *
+
+# --- Streaming export ---
+# Replaces "render an MP4, then decode it again for the GIF" (CLprompts.txt) with a single
+# pass: every rendered frame goes straight into one long-lived ffmpeg process that encodes
+# the MP4 and the WebM and keeps a small lossless FFV1 copy at GIF size and frame rate.
+# The GIF palette is built from every PALETTE_SAMPLE-th frame of that copy, then the GIF
+# is encoded from it; the copy and the palette are deleted afterwards.
+#
+#   STREAM_EXPORT=mp4,webm,gif python -m manim -r 1080,1080 --fps 50 lotka_volterra/lvanimation.py LVAnimation
+#
+# STREAM_EXPORT=1 writes all three. The files go where manim would put the movie, named
+# <Scene>_stream.<format>, so they never collide with a movie manim writes itself.
+#
+# Written for manim 0.19 (requirements.txt): manim's own movie writing is switched off in
+# setup() and every frame is taken from SceneFileWriter.write_frame(frame, num_frames).
+EXPORT_ENV = "STREAM_EXPORT"
+FORMATS = ("mp4", "webm", "gif")
+GIF_WIDTH = 540
+GIF_FPS = 25
+PALETTE_SAMPLE = 10
+
+ENCODERS = {
+    "mp4": ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-crf", "18"],
+    "webm": ["-c:v", "libvpx-vp9", "-pix_fmt", "yuv420p", "-crf", "32", "-b:v", "0", "-row-mt", "1"],
+}
+
+
+class StreamingExportMixin:
+    """
+    Put in front of the scene's base class: class LVAnimation(StreamingExportMixin, MovingCameraScene).
+    Inert unless STREAM_EXPORT is set. While exporting, manim's own movie writing and the
+    partial movie cache are off: cached plays would never reach the encoder.
+    """
+    _export = None
+
+    def setup(self):
+        super().setup()
+        formats = os.environ.get(EXPORT_ENV)
+        if not formats:
+            return
+        formats = FORMATS if formats == "1" else tuple(f.strip() for f in formats.split(","))
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"unknown {EXPORT_ENV} format(s) {sorted(unknown)}, use {', '.join(FORMATS)}")
+
+        file_writer = self.renderer.file_writer
+        base = file_writer.movie_file_path.with_name(f"{file_writer.movie_file_path.stem}_stream")
+        base.parent.mkdir(parents=True, exist_ok=True)
+        command = ["ffmpeg", "-y", "-loglevel", "error", "-f", "rawvideo", "-pix_fmt", "rgba",
+                   "-s", f"{config.pixel_width}x{config.pixel_height}", "-r", str(config.frame_rate), "-i", "-"]
+        for fmt in formats:
+            if fmt in ENCODERS:
+                command += ["-map", "0:v", *ENCODERS[fmt], f"{base}.{fmt}"]
+        if "gif" in formats:
+            command += ["-map", "0:v", "-vf", f"fps={GIF_FPS},scale={GIF_WIDTH}:-1:flags=lanczos",
+                        "-c:v", "ffv1", "-pix_fmt", "bgr0", f"{base}.gif_source.mkv"]
+        self._export = {"base": base, "formats": formats,
+                        "encoder": subprocess.Popen(command, stdin=subprocess.PIPE)}
+
+        config.disable_caching = True
+        config.write_to_movie = False # the encoder writes the movies (manim 0.19)
+        write_frame = file_writer.write_frame
+
+        def write_and_stream(frame, num_frames=1):
+            data = np.ascontiguousarray(frame).tobytes()
+            for _ in range(num_frames): # frozen frames (waits) come in once with their count
+                self._export["encoder"].stdin.write(data)
+            write_frame(frame, num_frames)
+
+        file_writer.write_frame = write_and_stream
+
+    def tear_down(self):
+        super().tear_down()
+        if self._export is None:
+            return
+        encoder = self._export["encoder"]
+        encoder.stdin.close()
+        if encoder.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with {encoder.returncode}")
+        base = self._export["base"]
+        if "gif" in self._export["formats"]:
+            source, palette = f"{base}.gif_source.mkv", f"{base}.palette.png"
+            ffmpeg = ["ffmpeg", "-y", "-loglevel", "error", "-i", source]
+            subprocess.run([*ffmpeg, "-vf", f"select='not(mod(n\\,{PALETTE_SAMPLE}))',palettegen", palette], check=True)
+            subprocess.run([*ffmpeg, "-i", palette, "-lavfi", "[0:v][1:v]paletteuse", "-loop", "0", f"{base}.gif"],
+                           check=True)
+            os.remove(source)
+            os.remove(palette)
+        logger.info(f"Streamed {', '.join(f'{base.name}.{fmt}' for fmt in self._export['formats'])} to {base.parent}")
@@ -0,0 +1,92 @@
+import numpy as np
+from scipy.integrate import BDF, DOP853, LSODA, RK23, RK45, Radau
+
+from common.trajectory_cache import default_cache
+
+# --- Chunked integration ---
+# Long runs are integrated step by step and handed out in fixed-size chunks of samples,
+# so neither the solver nor the caller ever holds the whole trajectory. The samples are
+# the same as solve_ivp(..., t_eval=t_eval) gives: both read them off the solver's dense
+# output between steps.
+METHODS = {"RK23": RK23, "RK45": RK45, "DOP853": DOP853, "Radau": Radau, "BDF": BDF, "LSODA": LSODA}
+CHUNK_SIZE = 4096
+
+
+def integrate_chunks(fun, t_span, y0, t_eval, chunk_size=CHUNK_SIZE, method="RK45", rtol=1e-3, atol=1e-6):
+    """
+    Yield (t, y) chunks of at most chunk_size samples, y time-major with shape (k, len(y0)).
+    The y array is reused for the next chunk: copy it to keep it.
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    solver = METHODS[method](fun, t_span[0], np.asarray(y0, dtype=float), t_span[1], rtol=rtol, atol=atol)
+    buffer = np.empty((chunk_size, solver.n))
+    filled = 0
+    chunk_start = 0 # index in t_eval of buffer[0]
+    i = 0 # next sample of t_eval
+    while i < len(t_eval):
+        if solver.status != "running":
+            raise RuntimeError(f"integration stopped at t={solver.t} before reaching t={t_eval[i]}")
+        message = solver.step()
+        if solver.status == "failed":
+            raise RuntimeError(message)
+        # every sample the step has passed is read off its interpolant
+        j = np.searchsorted(t_eval, solver.t, side="right")
+        if j == i:
+            continue
+        values = solver.dense_output()(t_eval[i:j]).T
+        i = j
+        while len(values):
+            n = min(chunk_size - filled, len(values))
+            buffer[filled:filled + n] = values[:n]
+            filled += n
+            values = values[n:]
+            if filled == chunk_size:
+                yield t_eval[chunk_start:chunk_start + chunk_size], buffer
+                chunk_start += chunk_size
+                filled = 0
+    if filled:
+        yield t_eval[chunk_start:], buffer[:filled]
+
+
+class TrajectoryStream:
+    """(t, y) chunks of stream_trajectory. Once they are all read, trajectory is the finished cache entry."""
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self.trajectory = None
+
+    def __iter__(self):
+        self.trajectory = yield from self._chunks
+
+
+def stream_trajectory(fun, t_span, y0, t_eval, system, params=(), chunk_size=CHUNK_SIZE, method="RK45",
+                      rtol=1e-3, atol=1e-6, dtype=np.float64, cache=None):
+    """
+    integrate_chunks that also writes every chunk into the trajectory cache, entry shape
+    (len(t_eval), len(y0)). On a cache hit the chunks are slices of the memory map and
+    nothing is integrated. An abandoned stream leaves no entry behind. After the last
+    chunk, the returned stream's trajectory is the entry, memory-mapped.
+    """
+    cache = cache or default_cache()
+    t_eval = np.asarray(t_eval, dtype=float)
+    # time-major, unlike cached_solve_ivp's entries, so the solver name gets a suffix
+    key = cache.key(system, params, y0, [*t_span, *t_eval], f"{method}/chunked", (rtol, atol, np.dtype(dtype).name))
+    return TrajectoryStream(_stream_chunks(fun, t_span, y0, t_eval, chunk_size, method, rtol, atol, dtype, cache, key))
+
+
+def _stream_chunks(fun, t_span, y0, t_eval, chunk_size, method, rtol, atol, dtype, cache, key):
+    cached = cache.get(key)
+    if cached is not None:
+        for start in range(0, len(t_eval), chunk_size):
+            yield t_eval[start:start + chunk_size], cached[start:start + chunk_size]
+        return cached
+
+    writer = cache.create(key, (len(t_eval), len(y0)), dtype)
+    try:
+        start = 0
+        for t, y in integrate_chunks(fun, t_span, y0, t_eval, chunk_size, method, rtol, atol):
+            writer.array[start:start + len(t)] = y
+            start += len(t)
+            yield t, y
+        return writer.commit()
+    finally:
+        writer.discard() # no-op after a commit
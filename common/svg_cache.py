@@ -0,0 +1,76 @@
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+from manim import *
+import manim
+import numpy as np
+
+# --- SVG asset cache ---
+# Every distinct SVG is parsed once per process and handed out as copies. The parsed
+# geometry is also stored on disk, keyed by the file's content hash, so the next render
+# skips parsing altogether. Editing an SVG changes its hash and invalidates the entry.
+CACHE_DIR = Path(os.environ.get("SVG_CACHE_DIR", Path(__file__).resolve().parents[1] / ".cache" / "svg"))
+STYLE_ATTRS = ["fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"]
+
+_templates = {}
+_keys = {}
+
+
+def _cache_key(file_name, kwargs):
+    stat = os.stat(file_name)
+    lookup = (str(file_name), repr(sorted(kwargs.items())), stat.st_mtime_ns, stat.st_size)
+    if lookup not in _keys:
+        _keys[lookup] = _content_key(file_name, kwargs)
+    return _keys[lookup]
+
+
+def _content_key(file_name, kwargs):
+    digest = hashlib.sha256(Path(file_name).read_bytes())
+    # parsing options and the manim version change the generated points as well
+    digest.update(repr(sorted(kwargs.items())).encode())
+    digest.update(manim.__version__.encode())
+    return digest.hexdigest()[:32]
+
+
+def _save_geometry(mob, path):
+    arrays = {}
+    for i, part in enumerate(mob.family_members_with_points()):
+        arrays[f"{i}_points"] = part.points
+        for attr in STYLE_ATTRS:
+            arrays[f"{i}_{attr}"] = getattr(part, attr)
+        arrays[f"{i}_widths"] = np.array([part.stroke_width, part.background_stroke_width])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, **arrays)
+    os.replace(tmp, path) # atomic, parallel renders never see half a file
+
+
+def _load_geometry(path):
+    parts = []
+    with np.load(path) as arrays:
+        n_parts = len([name for name in arrays.files if name.endswith("_points")])
+        for i in range(n_parts):
+            part = VMobject()
+            part.points = arrays[f"{i}_points"]
+            for attr in STYLE_ATTRS:
+                setattr(part, attr, arrays[f"{i}_{attr}"])
+            part.stroke_width, part.background_stroke_width = arrays[f"{i}_widths"]
+            parts.append(part)
+    return VGroup(*parts)
+
+
+def load_svg(file_name, **kwargs):
+    """
+    Cached replacement for SVGMobject(file_name, **kwargs).
+    Returns a fresh copy that can be moved, scaled and recoloured independently.
+    """
+    key = _cache_key(file_name, kwargs)
+    if key not in _templates:
+        path = CACHE_DIR / f"{key}.npz"
+        try:
+            _templates[key] = _load_geometry(path)
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile): # missing or damaged entry: rebuild
+            _templates[key] = SVGMobject(file_name, **kwargs)
+            _save_geometry(_templates[key], path)
+    return _templates[key].copy()
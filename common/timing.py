@@ -0,0 +1,20 @@
+import time
+
+# --- Benchmark timing ---
+# Shared by the benchmark scripts next to the scenes.
+
+
+def best_of(fn, repeats):
+    """
+    Fastest of `repeats` calls of fn(), in seconds. The minimum is the least disturbed
+    by other processes, so it is the number to compare between runs.
+
+    >>> best_of(lambda: None, 3) < 0.1
+    True
+    """
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
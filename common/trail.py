@@ -0,0 +1,139 @@
+from manim import *
+import numpy as np
+
+# --- Fixed-length trails ---
+# The last `length` segments of a moving point, kept in a ring buffer that is stored twice
+# in a row. Every new segment is written to both copies, so the window from the oldest to
+# the newest segment is always one contiguous slice and self.points can be a view into
+# it: an update writes two segments whatever the trail's length.
+#
+# Fading: cairo draws a multi-colour stroke as a linear gradient across the bounding
+# box, not along the path, so a looping trail cannot fade by stroke colours. Instead the
+# window is split into FADE_STEPS submobjects of whole segments, oldest to newest, each
+# with its own constant opacity; an update only moves their slice boundaries.
+FADE_STEPS = 16
+
+class _Ring:
+    # bookkeeping shared by Trail and TrailGroup: which slot is next, where the window starts
+    def __init__(self, length):
+        self.length = length
+        self.start = 0
+        self.count = 0
+
+    def next_slot(self):
+        if self.count < self.length:
+            self.count += 1
+            return self.start + self.count - 1
+        slot = self.start # full: overwrite the oldest segment
+        self.start = (self.start + 1) % self.length
+        return slot
+
+    def write(self, buffer, segments, nppcc):
+        slot = self.next_slot()
+        for copy in (slot, slot + self.length):
+            buffer[..., copy * nppcc:(copy + 1) * nppcc, :] = segments
+
+    def show(self, chunks, buffer, nppcc):
+        # window split into len(chunks) runs of whole segments, the newest always in the last chunk
+        n = len(chunks)
+        for k, chunk in enumerate(chunks):
+            first = self.start + self.count * k // n
+            last = self.start + self.count * (k + 1) // n
+            chunk.points = buffer[first * nppcc:last * nppcc]
+
+
+def _segments(start, end, nppcc):
+    # straight Bézier segments, handles evenly spaced like set_points_as_corners
+    alphas = np.linspace(0, 1, nppcc)[:, None]
+    return start[..., None, :] + alphas * (end - start)[..., None, :]
+
+
+def _fade_chunks(length, color, stroke_width, opacity, fade):
+    # tail to head, opacity rising in equal steps up to the full opacity at the head
+    n = min(FADE_STEPS, length) if fade else 1
+    return [VMobject(stroke_color=color, stroke_width=stroke_width, stroke_opacity=opacity * (k + 1) / n)
+            for k in range(n)]
+
+
+class Trail(VMobject):
+    """
+    Polyline through the last `length` positions of a moving point, O(1) per update.
+    fade=True lets the opacity fall off towards the tail. The segments live in the trail's
+    submobjects and are rewritten from the ring buffer on every update, transforms
+    applied to the trail itself do not stick.
+    """
+    def __init__(self, length=200, color=WHITE, stroke_width=2, stroke_opacity=1, fade=True, **kwargs):
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        nppcc = self.n_points_per_cubic_curve
+        self._ring = _Ring(length)
+        self._buffer = np.zeros((2 * length * nppcc, 3))
+        self._last = None
+        self.add(*_fade_chunks(length, color, stroke_width, stroke_opacity, fade))
+        self._ring.show(self.submobjects, self._buffer, nppcc)
+
+    def add_point(self, point):
+        point = np.asarray(point, dtype=float)
+        if self._last is not None and not np.array_equal(point, self._last): # standing still adds nothing
+            nppcc = self.n_points_per_cubic_curve
+            self._ring.write(self._buffer, _segments(self._last, point, nppcc), nppcc)
+            self._ring.show(self.submobjects, self._buffer, nppcc)
+        self._last = point
+        return self
+
+    def track(self, mobject):
+        """Keep adding mobject's center every frame."""
+        self.add_point(mobject.get_center())
+        self.add_updater(lambda trail: trail.add_point(mobject.get_center()))
+        return self
+
+    def clear_points(self):
+        self._ring = _Ring(self._ring.length)
+        self._last = None
+        self._ring.show(self.submobjects, self._buffer, self.n_points_per_cubic_curve)
+        return self
+
+
+class TrailGroup(VGroup):
+    """
+    Many trails advanced together: one (n_trails, 3) array per update is written into a
+    shared buffer with a single numpy operation, for ensembles with hundreds of trails.
+    """
+    def __init__(self, n_trails, length=200, colors=WHITE, stroke_width=2, stroke_opacity=1, fade=True, **kwargs):
+        colors = colors if isinstance(colors, (list, tuple)) else [colors] * n_trails
+        trails = [VMobject(stroke_width=stroke_width).add(*_fade_chunks(length, color, stroke_width, stroke_opacity, fade))
+                  for color in colors]
+        super().__init__(*trails, **kwargs)
+        self.nppcc = trails[0].n_points_per_cubic_curve
+        self._ring = _Ring(length)
+        self._buffer = np.zeros((n_trails, 2 * length * self.nppcc, 3))
+        self._last = None
+        for trail, buffer in zip(trails, self._buffer):
+            self._ring.show(trail.submobjects, buffer, self.nppcc)
+
+    def add_points(self, points):
+        points = np.asarray(points, dtype=float)
+        if self._last is not None and not np.array_equal(points, self._last):
+            self._ring.write(self._buffer, _segments(self._last, points, self.nppcc), self.nppcc)
+            for trail, buffer in zip(self.submobjects, self._buffer):
+                self._ring.show(trail.submobjects, buffer, self.nppcc)
+        self._last = points
+        return self
+
+
+# quick test
+if __name__ == "__main__":
+    # one frame of a trail that runs once around a circle and a bit further, so the head
+    # lies on top of the tail: the newest segment must be drawn opaque, the oldest faint
+    camera = Camera()
+    trail = Trail(length=100, color=WHITE, stroke_width=8)
+    angles = np.linspace(0, 2.2 * PI, 101)
+    for angle in angles:
+        trail.add_point([2 * np.cos(angle), 2 * np.sin(angle), 0])
+    camera.capture_mobject(trail)
+    def brightness(angle):
+        x, y = camera.points_to_pixel_coords(trail, np.array([[2 * np.cos(angle), 2 * np.sin(angle), 0]]))[0]
+        return camera.pixel_array[y, x, :3].max()
+    head, middle, tail = brightness((angles[-1] + angles[-2]) / 2), brightness(1.2 * PI), brightness(0.3 * PI)
+    print(f"head {head}, middle {middle}, near the tail {tail}")
+    assert head == 255, "the newest segment is not opaque"
+    assert tail < middle < head, "the opacity does not fall off towards the tail"
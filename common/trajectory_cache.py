@@ -0,0 +1,150 @@
+import hashlib
+import os
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+from scipy.integrate import solve_ivp
+
+# --- Trajectory cache ---
+# Integrated trajectories are stored as .npy files keyed by everything that determines
+# them (system, parameters, initial state, t_eval, solver, tolerances), and memory-mapped
+# on load. Re-renders and camera tweaks reuse the result instead of integrating again.
+# Entries are evicted least recently used first once the cache outgrows its disk budget.
+CACHE_DIR = Path(os.environ.get("TRAJECTORY_CACHE_DIR", Path(__file__).resolve().parents[1] / ".cache" / "trajectories"))
+MAX_MB = float(os.environ.get("TRAJECTORY_CACHE_MAX_MB", 1024))
+
+Solution = namedtuple("Solution", ["t", "y"]) # the part of solve_ivp's result the scenes use
+
+
+def _canonical(value):
+    # stable text form of parameters: numbers and arrays by their exact bytes, not by repr rounding
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k!r}:{_canonical(value[k])}" for k in sorted(value)) + "}"
+    if isinstance(value, (list, tuple, np.ndarray)) or np.isscalar(value) and not isinstance(value, str):
+        array = np.asarray(value)
+        if array.dtype.kind in "biuf":
+            array = np.ascontiguousarray(array, dtype=np.float64)
+            return f"{array.shape}:{hashlib.sha256(array.tobytes()).hexdigest()}"
+        return "[" + ",".join(_canonical(v) for v in value) + "]"
+    return repr(value)
+
+
+class TrajectoryCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_mb=MAX_MB):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_mb * 2**20)
+
+    def key(self, system, params=(), init=(), t_eval=(), solver="", tolerances=()):
+        """
+        Hex key of one trajectory. system names the equations: change it when the
+        equations themselves change, the parameters alone cannot tell.
+        """
+        parts = [system, params, init, t_eval, solver, tolerances]
+        return hashlib.sha256("|".join(_canonical(p) for p in parts).encode()).hexdigest()[:32]
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.npy"
+
+    def get(self, key):
+        """Read-only memory map of a cached array, or None."""
+        path = self._path(key)
+        try:
+            array = np.load(path, mmap_mode="r")
+        except (OSError, ValueError):
+            return None
+        os.utime(path) # the modification time is the last use for the LRU eviction
+        return array
+
+    def put(self, key, array):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{key}.{os.getpid()}.tmp.npy")
+        np.save(tmp, np.ascontiguousarray(array))
+        os.replace(tmp, path) # atomic, parallel renders never see half a file
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="r")
+
+    def create(self, key, shape, dtype=np.float64):
+        """Writer for an entry that is filled in place, for results too large to hold in memory."""
+        return _EntryWriter(self, key, shape, dtype)
+
+    def get_or_compute(self, key, compute):
+        """Cached array for key, compute() fills the entry on a miss."""
+        array = self.get(key)
+        if array is None:
+            array = self.put(key, compute())
+        return array
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits its disk budget."""
+        entries = []
+        for path in self.cache_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue # removed by a parallel render meanwhile
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue # the entry just written stays, even over budget
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for path in self.cache_dir.glob("*.npy"):
+            path.unlink(missing_ok=True)
+
+
+class _EntryWriter:
+    # a writable memory map in a temporary file, published under the key by commit()
+    def __init__(self, cache, key, shape, dtype):
+        self.cache = cache
+        self.path = cache._path(key)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp = self.path.with_name(f"{key}.{os.getpid()}.tmp.npy")
+        self.array = np.lib.format.open_memmap(self.tmp, mode="w+", dtype=dtype, shape=tuple(shape))
+
+    def commit(self):
+        self.array.flush()
+        del self.array
+        os.replace(self.tmp, self.path) # atomic, parallel renders never see half a file
+        self.cache.evict(keep=self.path)
+        return np.load(self.path, mmap_mode="r")
+
+    def discard(self):
+        if hasattr(self, "array"):
+            del self.array
+            self.tmp.unlink(missing_ok=True)
+
+
+_default_cache = None
+
+
+def default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TrajectoryCache()
+    return _default_cache
+
+
+def cached_solve_ivp(fun, t_span, y0, t_eval, system, params=(), method="RK45", rtol=1e-3, atol=1e-6,
+                     dtype=np.float64, cache=None):
+    """
+    solve_ivp with the result cached on disk. Returns Solution(t, y) with y of shape
+    (len(y0), len(t_eval)) like solve_ivp's. dtype=np.float32 halves the disk use.
+    """
+    cache = cache or default_cache()
+    t_eval = np.asarray(t_eval, dtype=float)
+    key = cache.key(system, params, y0, [*t_span, *t_eval], method, (rtol, atol, np.dtype(dtype).name))
+
+    def compute():
+        sol = solve_ivp(fun, t_span, y0, method=method, t_eval=t_eval, rtol=rtol, atol=atol)
+        if not sol.success:
+            raise RuntimeError(f"{system}: {sol.message}")
+        return sol.y.astype(dtype)
+
+    return Solution(t_eval, cache.get_or_compute(key, compute))
@@ -0,0 +1,46 @@
+from manim import *
+import numpy as np
+
+# --- Follow a sampled trajectory ---
+# MoveAlongPath places a mobject by arc-length proportion, re-walking the path's Bézier
+# curves every frame. FollowTrajectory keeps the samples themselves and a lookup table
+# (sample times, or cumulative length for constant speed), so each frame is a binary
+# search plus one linear interpolation, however many samples the path has. The samples
+# can stay in simulation coordinates, e.g. a memory-mapped cache entry: transform maps
+# only the two samples around the current position to the scene each frame.
+
+class FollowTrajectory(Animation):
+    """
+    Move mobject through points (N, 3) sampled at times (N,).
+    timing="time" plays the simulation in real proportion: at alpha the mobject is where
+    the system was at times[0] + alpha * (times[-1] - times[0]).
+    timing="length" moves at constant speed along the polyline, like MoveAlongPath.
+    transform maps samples (k, 3) to scene points (k, 3); it must be affine, like Axes.c2p.
+    """
+    def __init__(self, mobject, times, points, timing="time", transform=None, suspend_mobject_updating=False,
+                 **kwargs):
+        self.points = np.asarray(points, dtype=float) # no copy for a float64 memory map
+        self.transform = transform or (lambda p: p)
+        if timing == "time":
+            table = np.asarray(times, dtype=float)
+        elif timing == "length":
+            steps = np.linalg.norm(np.diff(self.transform(self.points), axis=0), axis=1)
+            table = np.concatenate([[0], np.cumsum(steps)])
+        else:
+            raise ValueError(f"unknown timing {timing!r}, use 'time' or 'length'")
+        if len(table) != len(self.points) or len(table) < 2:
+            raise ValueError("need at least two samples and one table entry per point")
+        self.table = table
+        super().__init__(mobject, suspend_mobject_updating=suspend_mobject_updating, **kwargs)
+
+    def point_at(self, alpha):
+        table = self.table
+        value = table[0] + alpha * (table[-1] - table[0])
+        i = np.clip(np.searchsorted(table, value, side="right") - 1, 0, len(table) - 2)
+        span = table[i + 1] - table[i]
+        w = np.clip((value - table[i]) / span, 0, 1) if span > 0 else 0.0
+        start, end = self.transform(self.points[i:i + 2])
+        return start + w * (end - start)
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.move_to(self.point_at(self.rate_func(alpha)))
@@ -0,0 +1,259 @@
+import argparse
+import functools
+import json
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from common.manim_args import parse_args_with_manim
+
+# --- Updater profiling ---
+# Renders one scene with every updater and always_redraw callback timed: call counts,
+# total time, time per drawn frame, and how often become() really changed the mobject
+# (an always_redraw whose mobject never changes is a static mobject in disguise).
+#
+#   python -m common.updater_profiler pendulum_ideal/pendulum_ideal.py Pendulum_ideal -- -ql
+#
+# Writes media/profiles/<Scene>.txt and <Scene>.trace.json; open the trace in
+# chrome://tracing or ui.perfetto.dev. Mobject and scene updaters are wrapped as they are
+# added, so nothing in the scenes changes. Caching is off: cached plays run no updaters.
+OUTPUT_DIR = Path(__file__).resolve().parents[1] / "media" / "profiles"
+OUTSIDE = "(outside updaters)" # become() called from construct()
+TIDS = {"frames": 0, "render": 1, "updaters": 2}
+
+
+def callback_label(fn):
+    """Name and definition site of a callback, always_redraw lambdas by the function they redraw."""
+    name = getattr(fn, "__qualname__", type(fn).__name__)
+    code = getattr(fn, "__code__", None)
+    if name.startswith("always_redraw.") and code is not None and "func" in code.co_freevars:
+        return f"always_redraw {callback_label(fn.__closure__[code.co_freevars.index('func')].cell_contents)}"
+    name = name.replace(".<locals>", "")
+    return f"{name} ({Path(code.co_filename).name}:{code.co_firstlineno})" if code is not None else name
+
+
+def _snapshot(mob):
+    # what become() can change: points and colours of the whole family
+    return [np.array(getattr(m, attr, ()), dtype=float)
+            for m in mob.get_family() for attr in ("points", "fill_rgbas", "stroke_rgbas", "rgbas")]
+
+
+def _same(a, b):
+    return len(a) == len(b) and all(np.array_equal(x, y) for x, y in zip(a, b))
+
+
+class UpdaterProfiler:
+    def __init__(self, max_events=200_000):
+        self.max_events = max_events
+        self.registered = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.total_ns = defaultdict(int)
+        self.frame_ns = defaultdict(list) # per label, its time in every frame it ran in
+        self.become_calls = defaultdict(int)
+        self.become_changed = defaultdict(int)
+        self.frame_ends = []
+        self.events = [] # (name, thread, start ns, duration ns) for the trace
+        self.dropped = 0
+        self._in_frame = defaultdict(int)
+        self._frame_start = None
+        self._stack = []
+        self._overhead_ns = 0 # become() snapshots, not charged to the updater that called it
+        self._wrappers = {} # original -> its wrappers, for remove_updater
+        self._patches = []
+        self.start_ns = time.perf_counter_ns()
+
+    # --- Recording ---
+
+    def _event(self, name, thread, start, duration):
+        if len(self.events) < self.max_events:
+            self.events.append((name, thread, start, duration))
+        else:
+            self.dropped += 1
+
+    def wrap(self, fn, label=None):
+        """fn timed under label. Same signature as fn, so manim still passes dt only if fn takes it."""
+        label = label or callback_label(fn)
+        self.registered[label] += 1
+        profiler = self
+
+        @functools.wraps(fn)
+        def profiled(*args):
+            profiler._stack.append(label)
+            overhead = profiler._overhead_ns
+            start = time.perf_counter_ns()
+            try:
+                return fn(*args)
+            finally:
+                duration = time.perf_counter_ns() - start - (profiler._overhead_ns - overhead)
+                profiler._stack.pop()
+                profiler._record(label, start, duration)
+
+        profiled.profiled_label = label
+        self._wrappers.setdefault(fn, []).append(profiled)
+        return profiled
+
+    def _record(self, label, start, duration):
+        if self._frame_start is None:
+            self._frame_start = start
+        self.calls[label] += 1
+        self.total_ns[label] += duration
+        self._in_frame[label] += duration
+        self._event(label, "updaters", start, duration)
+
+    def _become(self, mob, changed, start, duration):
+        label = self._stack[-1] if self._stack else OUTSIDE
+        self.become_calls[label] += 1
+        self.become_changed[label] += changed
+        self._event("become" if changed else "become (unchanged)", "updaters", start, duration)
+
+    def _frame(self, start, end):
+        # one drawn frame: everything since the last one, updaters included
+        frame_start = self._frame_start if self._frame_start is not None else start
+        for label, ns in self._in_frame.items():
+            self.frame_ns[label].append(ns)
+        self._in_frame.clear()
+        self._event("render", "render", start, end - start)
+        self._event(f"frame {len(self.frame_ends)}", "frames", frame_start, end - frame_start)
+        self.frame_ends.append(end)
+        self._frame_start = end
+
+    # --- Patching ---
+
+    def _patch(self, owner, name, replacement):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def install(self):
+        """Wrap every updater added from now on and count frames and become() calls. Cairo renderer only."""
+        from manim import Mobject, Scene
+        from manim.renderer.cairo_renderer import CairoRenderer
+        profiler = self
+
+        def wrapped(fn):
+            return fn if hasattr(fn, "profiled_label") else profiler.wrap(fn)
+
+        add_updater, remove_updater = Mobject.add_updater, Mobject.remove_updater
+        scene_add_updater, scene_remove_updater = Scene.add_updater, Scene.remove_updater
+        become, render = Mobject.become, CairoRenderer.render
+
+        def mobject_add_updater(mob, update_function, index=None, call_updater=False):
+            return add_updater(mob, wrapped(update_function), index, call_updater)
+
+        def mobject_remove_updater(mob, update_function):
+            for fn in [update_function, *profiler._wrappers.get(update_function, [])]:
+                remove_updater(mob, fn)
+            return mob
+
+        def scene_add(scene, func):
+            scene_add_updater(scene, wrapped(func))
+
+        def scene_remove(scene, func):
+            for fn in [func, *profiler._wrappers.get(func, [])]:
+                scene_remove_updater(scene, fn)
+
+        def timed_become(mob, *args, **kwargs):
+            t0 = time.perf_counter_ns()
+            before = _snapshot(mob)
+            t1 = time.perf_counter_ns()
+            result = become(mob, *args, **kwargs)
+            t2 = time.perf_counter_ns()
+            changed = not _same(before, _snapshot(mob))
+            profiler._overhead_ns += t1 - t0 + time.perf_counter_ns() - t2
+            profiler._become(mob, changed, t1, t2 - t1)
+            return result
+
+        def timed_render(renderer, *args, **kwargs):
+            start = time.perf_counter_ns()
+            render(renderer, *args, **kwargs)
+            profiler._frame(start, time.perf_counter_ns())
+
+        self._patch(Mobject, "add_updater", mobject_add_updater)
+        self._patch(Mobject, "remove_updater", mobject_remove_updater)
+        self._patch(Scene, "add_updater", scene_add)
+        self._patch(Scene, "remove_updater", scene_remove)
+        self._patch(Mobject, "become", timed_become)
+        self._patch(CairoRenderer, "render", timed_render)
+        return self
+
+    def uninstall(self):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            setattr(owner, name, original)
+
+    # --- Output ---
+
+    def report(self, scene="scene"):
+        n_frames = len(self.frame_ends)
+        frames_ns = self.frame_ends[-1] - self.start_ns if n_frames else 0
+        updaters_ns = sum(self.total_ns.values())
+        lines = [f"{scene}: {n_frames} drawn frames, {frames_ns / 1e6:.0f} ms, "
+                 f"{frames_ns / max(n_frames, 1) / 1e6:.2f} ms per frame; "
+                 f"updaters {updaters_ns / 1e6:.0f} ms ({updaters_ns / max(frames_ns, 1):.0%})",
+                 "per frame: over the frames the updater ran in; become: calls (changed the mobject)", "",
+                 f"{'added':>5} {'calls':>8} {'total ms':>9} {'us/call':>8} {'frame ms':>8} {'p95':>7} {'max':>7} "
+                 f"{'share':>6} {'become':>14}  updater"]
+        labels = sorted(set(self.calls) | set(self.become_calls), key=lambda l: -self.total_ns[l])
+        for label in labels:
+            per_frame = np.array(self.frame_ns[label] or [0]) / 1e6
+            become = f"{self.become_calls[label]} ({self.become_changed[label]})" if self.become_calls[label] else "-"
+            lines.append(f"{self.registered[label]:>5} {self.calls[label]:>8} {self.total_ns[label] / 1e6:>9.1f} "
+                         f"{self.total_ns[label] / max(self.calls[label], 1) / 1e3:>8.1f} {per_frame.mean():>8.3f} "
+                         f"{np.percentile(per_frame, 95):>7.3f} {per_frame.max():>7.3f} "
+                         f"{self.total_ns[label] / max(frames_ns, 1):>6.1%} {become:>14}  {label}")
+        if self.dropped:
+            lines.append(f"\n{self.dropped} events beyond --max-events left out of the trace")
+        return "\n".join(lines) + "\n"
+
+    def chrome_trace(self, scene="scene"):
+        """Complete ("X") events in the Chrome trace event format, times in µs from the start."""
+        events = [{"name": "thread_name", "ph": "M", "pid": 0, "tid": tid, "args": {"name": thread}}
+                  for thread, tid in TIDS.items()]
+        events += [{"name": name, "cat": thread, "ph": "X", "pid": 0, "tid": TIDS[thread],
+                    "ts": (start - self.start_ns) / 1e3, "dur": duration / 1e3}
+                   for name, thread, start, duration in self.events]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"scene": scene}}
+
+
+# --- Command line ---
+
+def parse_args(argv=None):
+    """
+    Options of main(), everything after -- is passed to manim as is.
+
+    >>> args = parse_args("lorenz/lorenz.py Lorenz --max-events 1000 -- -ql --fps 15".split())
+    >>> args.script, args.scene, args.max_events, args.manim_args
+    ('lorenz/lorenz.py', 'Lorenz', 1000, ['-ql', '--fps', '15'])
+    """
+    parser = argparse.ArgumentParser(description="Time every updater and always_redraw callback of one scene",
+                                     epilog="arguments after -- are passed to manim (quality, fps, ...)")
+    parser.add_argument("script")
+    parser.add_argument("scene")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR)
+    parser.add_argument("--max-events", type=int, default=200_000, help="trace events kept, the report counts all")
+    return parse_args_with_manim(parser, argv)
+
+
+def main():
+    args = parse_args()
+    manim_args = args.manim_args
+
+    # installed before the scene is imported or built, so its first updaters are wrapped too
+    profiler = UpdaterProfiler(args.max_events).install()
+    from manim.__main__ import main as manim_main
+    try:
+        manim_main(["render", "--disable_caching", *manim_args, args.script, args.scene], standalone_mode=False)
+    finally:
+        profiler.uninstall()
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    report = profiler.report(args.scene)
+    (args.output_dir / f"{args.scene}.txt").write_text(report)
+    (args.output_dir / f"{args.scene}.trace.json").write_text(json.dumps(profiler.chrome_trace(args.scene)))
+    print(report)
+    print(f"report and trace written to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
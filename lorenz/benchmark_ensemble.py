@@ -0,0 +1,48 @@
+import argparse
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from common.timing import best_of
+from lorenz_ensemble import integrate_ensemble, lorenz_rhs, nearby_initial_conditions
+
+def lorenz_list(t, state, sigma=10, rho=28, beta=8/3):
+    # the scene's original right-hand side: unpack, return a list
+    x, y, z = state
+    return [sigma * (y - x), x * (rho - z) - y, x * y - beta * z]
+
+
+def looped_solve_ivp(init, t_eval):
+    # one solve_ivp per initial condition, the way Lorenz.construct does it
+    return [solve_ivp(lambda t, y: lorenz_list(t, y), (t_eval[0], t_eval[-1]), y0, t_eval=t_eval).y.T
+            for y0 in init]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ensemble RK4 against looping solve_ivp on the Lorenz system")
+    parser.add_argument("--t-max", type=float, default=10)
+    parser.add_argument("--samples", type=int, default=500, help="points of t_eval")
+    parser.add_argument("--dt", type=float, default=0.005, help="RK4 step of the ensemble integrator")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    t_eval = np.linspace(0, args.t_max, args.samples)
+    # the loop is only timed on a few members and extrapolated
+    loop_init = nearby_initial_conditions([1.0, 1.0, 1.0], 20)
+    loop_time = best_of(lambda: looped_solve_ivp(loop_init, t_eval), args.repeats)
+    loop_time /= len(loop_init)
+
+    # accuracy against a tight-tolerance reference, before the trajectories decorrelate
+    t_check = t_eval[t_eval <= min(args.t_max, 5)]
+    reference = solve_ivp(lambda t, y: lorenz_rhs(y), (0, t_check[-1]), loop_init[0], t_eval=t_check,
+                          rtol=1e-10, atol=1e-10).y.T
+    ensemble = integrate_ensemble(loop_init[:1], t_check, dt=args.dt)[:, 0]
+    looped = looped_solve_ivp(loop_init[:1], t_check)[0]
+    print(f"max error up to t={t_check[-1]:.1f}: ensemble RK4 {np.abs(ensemble - reference).max():.2e}, "
+          f"solve_ivp defaults {np.abs(looped - reference).max():.2e}")
+
+    print(f"t_max={args.t_max}, {args.samples} samples, dt={args.dt}")
+    print(f"{'N':>7} {'seconds':>9} {'loop (est.)':>12} {'speedup':>8}")
+    for n in (1, 100, 1_000, 10_000):
+        init = nearby_initial_conditions([1.0, 1.0, 1.0], n)
+        seconds = best_of(lambda: integrate_ensemble(init, t_eval, dt=args.dt), args.repeats)
+        print(f"{n:>7} {seconds:>9.3f} {loop_time * n:>12.3f} {loop_time * n / seconds:>7.1f}x")
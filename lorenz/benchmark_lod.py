@@ -0,0 +1,51 @@
+import argparse
+
+from manim import *
+import numpy as np
+
+from common.polyline import pixel_size, simplify_polyline
+from common.timing import best_of
+from lorenz_ensemble import integrate_ensemble
+
+# Frame cost of the full Lorenz curve against its simplified version, with the camera
+# set up like the Lorenz scene. Needs manim (cairo) installed.
+
+def render_time(camera, curve, repeats):
+    def render():
+        camera.reset()
+        camera.capture_mobjects([curve])
+    return best_of(render, repeats)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Points kept and frame time saved by the Lorenz level of detail")
+    parser.add_argument("--t-max", type=float, default=30)
+    parser.add_argument("--pixels", type=float, default=0.5, help="tolerance in output pixels")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    axes = ThreeDAxes(x_range=[-50, 50, 10], y_range=[-50, 50, 10], z_range=[-10, 50, 10],
+                      x_length=10, y_length=10, z_length=6)
+    camera = ThreeDCamera()
+    camera.set_phi(60 * DEGREES)
+    camera.set_theta(15 * DEGREES)
+    camera.set_zoom(0.8)
+    tolerance = args.pixels * pixel_size(camera)
+
+    print(f"t_max={args.t_max}, tolerance {args.pixels} px = {tolerance:.4g} units, {config.pixel_width}x{config.pixel_height}")
+    print(f"{'samples':>8} {'kept':>7} {'full ms':>8} {'lod ms':>8} {'saved':>6} {'lookup full/lod us':>19}")
+    for n in (2000, 20_000, 100_000):
+        states = integrate_ensemble(np.array([[1.0, 1.0, 1.0]]), np.linspace(0, args.t_max, n))[:, 0]
+        points = axes.c2p(*states.T).T
+        kept = points[simplify_polyline(points, tolerance)]
+
+        full = VMobject(color=BLUE, stroke_width=1).set_points_as_corners(points)
+        lod = VMobject(color=BLUE, stroke_width=1).set_points_as_corners(kept)
+        full_time = render_time(camera, full, args.repeats)
+        lod_time = render_time(camera, lod, args.repeats)
+        # what MoveAlongPath does every frame
+        alphas = np.linspace(0, 1, 50)
+        full_lookup = best_of(lambda: [full.point_from_proportion(a) for a in alphas], args.repeats) / len(alphas)
+        lod_lookup = best_of(lambda: [lod.point_from_proportion(a) for a in alphas], args.repeats) / len(alphas)
+        print(f"{n:>8} {len(kept):>7} {full_time * 1e3:>8.2f} {lod_time * 1e3:>8.2f} {1 - lod_time / full_time:>6.0%} "
+              f"{full_lookup * 1e6:>9.0f}/{lod_lookup * 1e6:<9.0f}")
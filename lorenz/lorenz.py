@@ -1,8 +1,17 @@
 from manim import *
 import numpy as np
-from scipy.integrate import solve_ivp
 
-class Lorenz(ThreeDScene):
+from common.growing_curve import GrowingCurve
+from common.numeric_label import NumericLabel
+from common.polyline import pixel_size, simplify_polyline
+from common.segmented_render import SegmentedRenderMixin
+from common.streaming_integration import stream_trajectory
+from common.trail import Trail, TrailGroup
+from common.trajectory_follow import FollowTrajectory
+from common.trajectory_cache import default_cache
+from lorenz_ensemble import divergence, integrate_ensemble, nearby_initial_conditions
+
+class Lorenz(SegmentedRenderMixin, ThreeDScene): # long final render: see common/segmented_render.py
     def lorenz(self, t, state, sigma=10, rho=28, beta=8/3):
         x, y, z = state
         dx = sigma * (y - x)
@@ -16,17 +25,13 @@ class Lorenz(ThreeDScene):
         t_span = (0, 1)             # total time span, use 30 for final version
         t_eval = np.linspace(*t_span, 50)  # time steps for smoothness, use 2000 for final version
         ball_runtime = 60
+        trail_length = 300          # frames of history behind each dot
+        lod_pixels = 0.5            # max deviation of the drawn curves from the samples in output pixels, None keeps every sample
 
         # Two slightly different initial conditions
         init1 = [1.0, 1.0, 1.0]
         init2 = [1.1, 1.1, 0.9]
 
-        # Solve Lorenz equations
-        sol1 = solve_ivp(lambda t, y: self.lorenz(t, y, sigma, rho, beta),
-                         t_span, init1, t_eval=t_eval)
-        sol2 = solve_ivp(lambda t, y: self.lorenz(t, y, sigma, rho, beta),
-                         t_span, init2, t_eval=t_eval)
-
         # --- 3D Axes ---
         axes = ThreeDAxes(
             x_range=[-50, 50, 10],
@@ -41,26 +46,35 @@ class Lorenz(ThreeDScene):
 
 
         # --- Full attractor curves (faint for context) ---
-        # connect points to axes coordinate system
-        points1 = [axes.c2p(x, y, z) for x, y, z in zip(*sol1.y)]
-        points2 = [axes.c2p(x, y, z) for x, y, z in zip(*sol2.y)]
-        # draw curves
-        full_curve1 = VMobject(color=BLUE, stroke_width=1)
-        full_curve1.set_points_as_corners(points1)
-        full_curve2 = VMobject(color=ORANGE, stroke_width=1)
-        full_curve2.set_points_as_corners(points2)
+        # integrate in chunks (cached on disk, re-renders skip the integration), connect each
+        # chunk to the axes coordinate system in one go and append it to the curve
+        full_curve1 = GrowingCurve(capacity=len(t_eval), color=BLUE, stroke_width=1)
+        full_curve2 = GrowingCurve(capacity=len(t_eval), color=ORANGE, stroke_width=1)
+        tolerance = lod_pixels * pixel_size(self.camera) if lod_pixels else None
+        trajectories = [] # the finished cache entries, memory-mapped, for the dots
+        n_samples = n_kept = 0
+        for init, curve in ((init1, full_curve1), (init2, full_curve2)):
+            stream = stream_trajectory(lambda t, y: self.lorenz(t, y, sigma, rho, beta),
+                                       t_span, init, t_eval, system="lorenz", params=(sigma, rho, beta))
+            for _, chunk in stream:
+                points = axes.c2p(*chunk.T).T
+                n_samples += len(points)
+                if tolerance:
+                    points = points[simplify_polyline(points, tolerance)] # drop what would not show at this resolution
+                n_kept += len(points)
+                curve.add_points_as_corners_to_curve(points)
+            trajectories.append(stream.trajectory)
+        logger.info(f"Lorenz curves: kept {n_kept} of {n_samples} points (level of detail {lod_pixels} px)")
         # add curves
         self.add(full_curve1, full_curve2)
 
         # --- Moving dots ---
-        dot1 = Dot3D(points1[0], color=BLUE)
-        dot2 = Dot3D(points2[0], color=ORANGE)
+        dot1 = Dot3D(full_curve1.get_start(), color=BLUE)
+        dot2 = Dot3D(full_curve2.get_start(), color=ORANGE)
 
         # --- Trails (actual paths traced) ---
-        trail1 = VMobject(color="#0E4058")
-        trail1.set_points_as_corners([points1[0]])
-        trail2 = VMobject(color="#E79E16")
-        trail2.set_points_as_corners([points2[0]])
+        trail1 = Trail(length=trail_length, color="#0E4058", stroke_width=4).track(dot1)
+        trail2 = Trail(length=trail_length, color="#E79E16", stroke_width=4).track(dot2)
 
         self.add(dot1, dot2, trail1, trail2)
 
@@ -69,11 +83,7 @@ class Lorenz(ThreeDScene):
 
         # Updater for the coordinate texts
         def update_ball1_dim_text(mob, dt, dim):
-            value = dot1.get_center()[dim]
-            new_text = f"{value:.1f}"
-            if mob.text != new_text:
-                mob.set_text = new_text
-                mob.become(Text(new_text, font_size=60).move_to(mob.get_center()))
+            mob.set_value(dot1.get_center()[dim]) # only changes the glyphs if the text changed
 
         # Actual box
         box_height = 3.0
@@ -81,10 +91,10 @@ class Lorenz(ThreeDScene):
         box = Rectangle(height=box_height, width=box_width, stroke_color=WHITE, fill_opacity=0
             ).shift(RIGHT * 5, RIGHT)
         state_text = Text("State:")
-        ball1_x_value = Text(f"{dot1.get_center()[0]:.3f}", font_size=60)
+        ball1_x_value = NumericLabel(f"{dot1.get_center()[0]:.3f}", font_size=60)
         ball1_x_value.add_updater(lambda mob, dt: update_ball1_dim_text(mob, dt, 0))
         ball1_x__line = VGroup(Text("x1 = ", font_size=60), ball1_x_value).arrange(RIGHT)
-        ball1_y_value = Text(f"{dot1.get_center()[1]:.3f}", font_size=60)
+        ball1_y_value = NumericLabel(f"{dot1.get_center()[1]:.3f}", font_size=60)
         ball1_y_value.add_updater(lambda mob, dt: update_ball1_dim_text(mob, dt, 1))
         ball1_y_line = VGroup(Text("y1 = ", font_size=60), ball1_y_value).arrange(RIGHT)
         box_text = VGroup(state_text, ball1_x__line, ball1_y_line).arrange(DOWN, buff=0.4)
@@ -96,10 +106,92 @@ class Lorenz(ThreeDScene):
         self.begin_ambient_camera_rotation(rate=-(2*PI/(ball_runtime+2.5))) # rotate camera during the animation
         self.wait(0.5) # to trigger rotation start
         self.play(
-            MoveAlongPath(dot1, full_curve1),
-            MoveAlongPath(dot2, full_curve2),
+            # in simulation time, the dots speed up and slow down like the system
+            FollowTrajectory(dot1, t_eval, trajectories[0], transform=lambda p: axes.c2p(*p.T).T),
+            FollowTrajectory(dot2, t_eval, trajectories[1], transform=lambda p: axes.c2p(*p.T).T),
             run_time=ball_runtime,
             rate_func=linear
         )
 
         self.wait(2)
+
+
+class LorenzEnsemble(SegmentedRenderMixin, ThreeDScene):
+    def construct(self):
+        # --- Simulation parameters ---
+        sigma, rho, beta = 10, 28, 8/3
+        t_span = (0, 1)             # total time span, use 30 for final version
+        t_eval = np.linspace(*t_span, 50)  # time steps for smoothness, use 2000 for final version
+        cloud_runtime = 60
+        n_members = 2000            # nearby initial conditions integrated together
+        spread = 0.01               # half width of the cube they start in
+        n_trails = 200              # members that leave a trail
+        trail_length = 20           # steps of history in each trail
+
+        init = nearby_initial_conditions([1.0, 1.0, 1.0], n_members, spread)
+        cache = default_cache()
+        key = cache.key("lorenz", (sigma, rho, beta), init, t_eval, "ensemble_rk4", 0.005)
+        states = cache.get_or_compute(key, lambda: integrate_ensemble(init, t_eval, sigma, rho, beta, dt=0.005)) # (time, member, xyz)
+        distances = divergence(states)
+        # colour by log distance from the unperturbed member: 0 while together, 1 once spread over the attractor
+        spread_fraction = np.clip((np.log10(distances + 1e-12) - np.log10(spread)) / (np.log10(40) - np.log10(spread)), 0, 1)
+
+        # --- 3D Axes ---
+        axes = ThreeDAxes(
+            x_range=[-50, 50, 10],
+            y_range=[-50, 50, 10],
+            z_range=[-10, 50, 10],
+            x_length=10, y_length=10, z_length=6
+        )
+        axes.add(axes.get_axis_labels(x_label="x", y_label="y", z_label="z"))
+        self.add(axes)
+        self.set_camera_orientation(phi=60 * DEGREES, theta=15 * DEGREES, zoom=0.8, frame_center=[2, 0, 1])
+
+        # --- Point cloud ---
+        points = axes.c2p(*states.reshape(-1, 3).T).T.reshape(states.shape)
+        near_rgba, far_rgba = color_to_rgba(BLUE), color_to_rgba(ORANGE)
+
+        def cloud_rgbas(step):
+            w = spread_fraction[step][:, None]
+            return (1 - w) * near_rgba + w * far_rgba
+
+        step_tracker = ValueTracker(0)
+        cloud = PMobject(stroke_width=2)
+        cloud.add_points(points[0], rgbas=cloud_rgbas(0))
+
+        def update_cloud(mob):
+            step = int(round(step_tracker.get_value()))
+            mob.points = points[step]
+            mob.rgbas = cloud_rgbas(step)
+
+        cloud.add_updater(update_cloud)
+        self.add(cloud)
+
+        # --- Trails behind the first members ---
+        trails = TrailGroup(n_trails, length=trail_length, colors=WHITE, stroke_width=1, stroke_opacity=0.6)
+        trails.add_points(points[0, :n_trails])
+        trails.add_updater(lambda mob: mob.add_points(points[int(round(step_tracker.get_value())), :n_trails]))
+        self.add(trails)
+
+        # --- HUD State box ---
+        box = Rectangle(height=2.0, width=4.5, stroke_color=WHITE, fill_opacity=0
+            ).shift(RIGHT * 5, RIGHT)
+        spread_value = NumericLabel(np.median(distances[0]), num_decimal_places=3, font_size=60)
+        spread_value.add_updater(lambda mob: mob.set_value(np.median(distances[int(round(step_tracker.get_value()))])))
+        spread_line = VGroup(Text("median d = ", font_size=60), spread_value).arrange(RIGHT)
+        box_text = VGroup(Text(f"{n_members} runs:"), spread_line).arrange(DOWN, buff=0.4)
+        box_text.scale_to_fit_width(4.5 * 0.9)
+        box_text.move_to(box.get_center())
+
+        self.add_fixed_in_frame_mobjects(box, box_text)
+
+        # --- Animate the ensemble ---
+        self.begin_ambient_camera_rotation(rate=-(2*PI/(cloud_runtime+2.5))) # rotate camera during the animation
+        self.wait(0.5) # to trigger rotation start
+        self.play(
+            step_tracker.animate.set_value(len(t_eval) - 1),
+            run_time=cloud_runtime,
+            rate_func=linear
+        )
+
+        self.wait(2)
@@ -0,0 +1,52 @@
+import numpy as np
+
+def lorenz_rhs(states, sigma=10, rho=28, beta=8/3):
+    """Lorenz derivatives for states of shape (..., 3), all members at once."""
+    x, y, z = states[..., 0], states[..., 1], states[..., 2]
+    return np.stack([sigma * (y - x), x * (rho - z) - y, x * y - beta * z], axis=-1)
+
+
+def nearby_initial_conditions(center, n, spread=0.01, seed=0):
+    """n initial conditions in a small cube around center, center itself comes first."""
+    rng = np.random.default_rng(seed)
+    init = np.asarray(center, dtype=float) + rng.uniform(-spread, spread, (n, 3))
+    init[0] = center
+    return init
+
+
+def integrate_ensemble(init, t_eval, sigma=10, rho=28, beta=8/3, dt=0.005):
+    """
+    Integrate many Lorenz systems at once with fixed-step RK4.
+    init has shape (N, 3). Returns the states at t_eval, shape (len(t_eval), N, 3),
+    time-major like the scenes consume them. Between two samples the step is shortened
+    just enough to land on them exactly.
+    """
+    t_eval = np.asarray(t_eval, dtype=float)
+    states = np.empty((len(t_eval), *np.shape(init)))
+    states[0] = init
+    s = states[0].copy()
+    for i in range(len(t_eval) - 1):
+        interval = t_eval[i+1] - t_eval[i]
+        n_steps = max(int(np.ceil(interval / dt - 1e-9)), 1)
+        h = interval / n_steps
+        for _ in range(n_steps):
+            k1 = lorenz_rhs(s, sigma, rho, beta)
+            k2 = lorenz_rhs(s + 0.5 * h * k1, sigma, rho, beta)
+            k3 = lorenz_rhs(s + 0.5 * h * k2, sigma, rho, beta)
+            k4 = lorenz_rhs(s + h * k3, sigma, rho, beta)
+            s = s + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        states[i+1] = s
+    return states
+
+
+def divergence(states):
+    """Distance of every member from the first one (the unperturbed center), shape (T, N)."""
+    return np.linalg.norm(states - states[:, :1], axis=-1)
+
+
+# quick test
+if __name__ == "__main__":
+    t_eval = np.linspace(0, 10, 201)
+    states = integrate_ensemble(nearby_initial_conditions([1.0, 1.0, 1.0], 1000), t_eval)
+    d = divergence(states)
+    print("median distance from the center at t = 0, 5, 10:", np.median(d[[0, 100, 200]], axis=1))
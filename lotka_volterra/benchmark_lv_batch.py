@@ -0,0 +1,48 @@
+import argparse
+
+import numpy as np
+from common.timing import best_of
+from lv_batch import lotka_volterra_batch
+
+def scalar_loop(t_max, dt, alpha, beta, delta, gamma, R0, F0):
+    # the original per-system pure-Python loop, kept here as the reference
+    steps = int(t_max / dt)
+    R = np.zeros(steps)
+    F = np.zeros(steps)
+    R[0], F[0] = R0, F0
+    for i in range(steps - 1):
+        dR = (alpha * R[i] - beta * R[i] * F[i]) * dt
+        dF = (delta * R[i] * F[i] - gamma * F[i]) * dt
+        R[i+1] = max(R[i] + dR, 0)
+        F[i+1] = max(F[i] + dF, 0)
+    return R, F
+
+
+def random_params(n, rng):
+    return dict(alpha=rng.uniform(0.1, 0.6, n), beta=rng.uniform(0.05, 0.3, n),
+                delta=rng.uniform(0.01, 0.1, n), gamma=rng.uniform(0.1, 0.6, n),
+                R0=rng.uniform(2, 8, n), F0=rng.uniform(1, 4, n))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of the batched Lotka–Volterra integrator")
+    parser.add_argument("--t-max", type=float, default=10, help="simulated time per system (memory grows with it at N=1e5)")
+    parser.add_argument("--dt", type=float, default=0.1)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    steps = int(args.t_max / args.dt)
+    # the scalar loop is only timed on a few systems and extrapolated
+    loop_params = random_params(20, rng)
+    loop_time = best_of(lambda: [scalar_loop(args.t_max, args.dt, *(loop_params[k][j] for k in loop_params))
+                                 for j in range(20)], args.repeats) / 20
+
+    print(f"{steps} steps per system, t_max={args.t_max}, dt={args.dt}")
+    print(f"{'N':>8} {'method':>6} {'seconds':>10} {'system-steps/s':>15} {'vs loop':>9}")
+    for n in (1, 1_000, 100_000):
+        params = random_params(n, rng)
+        for method in ("euler", "rk4"):
+            seconds = best_of(lambda: lotka_volterra_batch(t_max=args.t_max, dt=args.dt, method=method, **params),
+                              args.repeats)
+            print(f"{n:>8} {method:>6} {seconds:>10.4f} {n * steps / seconds:>15.3g} {loop_time * n / seconds:>8.1f}x")
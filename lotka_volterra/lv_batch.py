@@ -0,0 +1,64 @@
+import numpy as np
+
+def lotka_volterra_batch(alpha, beta, delta, gamma, R0, F0,
+                         t_max=40, dt=0.1, method="euler"):
+    """
+    Simulate N Lotka–Volterra systems at once.
+    alpha, beta, delta, gamma, R0 and F0 are scalars or arrays that broadcast to
+    a common shape (N,). Returns time (steps,), rabbits (steps, N), foxes (steps, N).
+    method="euler" reproduces lotka_volterra() bit-for-bit, method="rk4" is the
+    classic 4th order Runge–Kutta step. Both clamp at 0 like the scalar version.
+    """
+    alpha, beta, delta, gamma, R0, F0 = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(p, dtype=float)) for p in (alpha, beta, delta, gamma, R0, F0)))
+    if method not in STEPPERS:
+        raise ValueError(f"unknown method {method!r}, use one of {sorted(STEPPERS)}")
+    step = STEPPERS[method]
+
+    steps = int(t_max / dt)
+    t = np.linspace(0, t_max, steps)
+    # time-major so every step writes one contiguous row
+    R = np.zeros((steps, alpha.size))
+    F = np.zeros((steps, alpha.size))
+    R[0], F[0] = R0, F0
+
+    params = (alpha, beta, delta, gamma)
+    for i in range(steps - 1):
+        R_next, F_next = step(R[i], F[i], params, dt)
+        np.maximum(R_next, 0, out=R[i+1]) # same clamp as max(..., 0) in the scalar loop
+        np.maximum(F_next, 0, out=F[i+1])
+
+    return t, R, F
+
+
+def _derivatives(R, F, params):
+    alpha, beta, delta, gamma = params
+    return alpha * R - beta * R * F, delta * R * F - gamma * F
+
+
+def _euler_step(R, F, params, dt):
+    alpha, beta, delta, gamma = params
+    # keep the exact operation order of the scalar loop so results match bit-for-bit
+    dR = (alpha * R - beta * R * F) * dt
+    dF = (delta * R * F - gamma * F) * dt
+    return R + dR, F + dF
+
+
+def _rk4_step(R, F, params, dt):
+    k1R, k1F = _derivatives(R, F, params)
+    k2R, k2F = _derivatives(R + 0.5 * dt * k1R, F + 0.5 * dt * k1F, params)
+    k3R, k3F = _derivatives(R + 0.5 * dt * k2R, F + 0.5 * dt * k2F, params)
+    k4R, k4F = _derivatives(R + dt * k3R, F + dt * k3F, params)
+    R_next = R + dt / 6 * (k1R + 2 * k2R + 2 * k3R + k4R)
+    F_next = F + dt / 6 * (k1F + 2 * k2F + 2 * k3F + k4F)
+    return R_next, F_next
+
+
+STEPPERS = {"euler": _euler_step, "rk4": _rk4_step}
+
+
+# quick test
+if __name__ == "__main__":
+    t, R, F = lotka_volterra_batch(alpha=[0.3, 0.4], beta=0.15, delta=0.05, gamma=0.3, R0=5, F0=3)
+    print("Rabbits min/max per system:", R.min(axis=0), R.max(axis=0))
+    print("Foxes min/max per system:", F.min(axis=0), F.max(axis=0))
@@ -0,0 +1,151 @@
+import argparse
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+from lv_batch import lotka_volterra_batch
+
+# Search for Lotka–Volterra parameters that keep the population SVG-animate-able,
+# i.e. that fit the rabbit and fox slots of LVAnimation.
+#
+#   python lotka_volterra/lv_search.py --alpha 0.2 0.5 16 --beta 0.1 0.3 16 --out lv_search
+#
+# Every chunk of the sweep is written to <out>/chunks as soon as it is done, so an
+# interrupted sweep picks up where it stopped when started again with the same arguments.
+
+PARAM_NAMES = ["alpha", "beta", "delta", "gamma", "R0", "F0"]
+DEFAULT_RANGES = { # min, max, count; centered on the defaults of lotka_volterra()
+    "alpha": [0.2, 0.4, 5],
+    "beta": [0.1, 0.2, 5],
+    "delta": [0.03, 0.07, 5],
+    "gamma": [0.2, 0.4, 5],
+    "R0": [5, 5, 1],
+    "F0": [3, 3, 1],
+}
+N_RABBITS = 10 # len(rabbits_map) in lvanimation.py
+N_FOXES = 4    # len(foxes_map) in lvanimation.py
+COLUMNS = PARAM_NAMES + ["R_min", "R_max", "F_min", "F_max", "cycles", "clamped", "in_bounds", "score"]
+
+
+def grid_axes(ranges):
+    return [np.linspace(*ranges[name][:2], int(ranges[name][2])) for name in PARAM_NAMES]
+
+
+def grid_params(axes, start, stop):
+    # parameter sets start..stop of the flattened grid, without building the full grid
+    index = np.unravel_index(np.arange(start, stop), [len(a) for a in axes])
+    return {name: a[i] for name, a, i in zip(PARAM_NAMES, axes, index)}
+
+
+def count_cycles(R, equilibrium):
+    # one cycle = one upward crossing of the rabbit equilibrium gamma/delta
+    above = R > equilibrium
+    return np.count_nonzero(~above[:-1] & above[1:], axis=0)
+
+
+def score_runs(params, t, R, F, max_rabbits=N_RABBITS, max_foxes=N_FOXES, min_cycles=2, max_cycles=8):
+    """
+    Score every run against what LVAnimation can show: populations within the
+    animal slots, a watchable number of cycles, and no run into the max(..., 0) clamp.
+    Valid runs score by how much of the slot range they use (1 = both fill up exactly).
+    """
+    # populations start positive, so an exact 0 can only come from the clamp
+    clamped = (R[1:] == 0).any(axis=0) | (F[1:] == 0).any(axis=0)
+    R_min, R_max = R.min(axis=0), R.max(axis=0)
+    F_min, F_max = F.min(axis=0), F.max(axis=0)
+    cycles = count_cycles(R, params["gamma"] / params["delta"])
+    in_bounds = (R_max <= max_rabbits) & (F_max <= max_foxes)
+    valid = in_bounds & ~clamped & (cycles >= min_cycles) & (cycles <= max_cycles)
+    fill = 0.5 * ((R_max - R_min) / max_rabbits + (F_max - F_min) / max_foxes)
+    score = np.where(valid, fill, 0.0)
+    return np.column_stack([params[name] for name in PARAM_NAMES]
+                           + [R_min, R_max, F_min, F_max, cycles, clamped, in_bounds, score])
+
+
+def run_chunk(chunk_id, start, stop, spec, chunk_dir):
+    params = grid_params(grid_axes(spec["ranges"]), start, stop)
+    t, R, F = lotka_volterra_batch(**params, t_max=spec["t_max"], dt=spec["dt"], method=spec["method"])
+    table = score_runs(params, t, R, F, spec["max_rabbits"], spec["max_foxes"],
+                       spec["min_cycles"], spec["max_cycles"])
+    # write to a temp file first, so a killed worker never leaves half a chunk behind
+    path = Path(chunk_dir) / f"chunk_{chunk_id:06d}.csv"
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        np.savetxt(f, table, delimiter=",", header=",".join(COLUMNS), comments="", fmt="%.10g")
+    os.replace(tmp, path)
+    return chunk_id
+
+
+def merge_chunks(chunk_dir, out_file):
+    tables = [np.loadtxt(p, delimiter=",", skiprows=1, ndmin=2) for p in sorted(Path(chunk_dir).glob("chunk_*.csv"))]
+    table = np.concatenate(tables)
+    score = table[:, COLUMNS.index("score")]
+    cycles = table[:, COLUMNS.index("cycles")]
+    order = np.lexsort((-cycles, -score)) # best score first, more cycles break ties
+    np.savetxt(out_file, table[order], delimiter=",", header=",".join(COLUMNS), comments="", fmt="%.10g")
+    return table[order]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel search for animatable Lotka–Volterra parameters")
+    for name in PARAM_NAMES:
+        parser.add_argument(f"--{name}", nargs=3, type=float, metavar=("MIN", "MAX", "COUNT"),
+                            default=DEFAULT_RANGES[name])
+    parser.add_argument("--t-max", type=float, default=60)
+    parser.add_argument("--dt", type=float, default=0.1)
+    parser.add_argument("--method", choices=["euler", "rk4"], default="euler")
+    parser.add_argument("--max-rabbits", type=float, default=N_RABBITS)
+    parser.add_argument("--max-foxes", type=float, default=N_FOXES)
+    parser.add_argument("--min-cycles", type=int, default=2)
+    parser.add_argument("--max-cycles", type=int, default=8)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="lv_search", help="output directory")
+    parser.add_argument("--fresh", action="store_true", help="discard finished chunks of a previous sweep")
+    parser.add_argument("--top", type=int, default=10, help="number of ranked results to print")
+    args = parser.parse_args()
+
+    spec = {
+        "ranges": {name: getattr(args, name) for name in PARAM_NAMES},
+        "t_max": args.t_max, "dt": args.dt, "method": args.method,
+        "max_rabbits": args.max_rabbits, "max_foxes": args.max_foxes,
+        "min_cycles": args.min_cycles, "max_cycles": args.max_cycles,
+        "chunk_size": args.chunk_size,
+    }
+    out_dir = Path(args.out)
+    chunk_dir = out_dir / "chunks"
+    spec_file = out_dir / "sweep.json"
+    if args.fresh and out_dir.exists():
+        shutil.rmtree(out_dir)
+    if spec_file.exists() and json.loads(spec_file.read_text()) != spec:
+        parser.error(f"{out_dir} holds a different sweep, use --fresh or another --out")
+    chunk_dir.mkdir(parents=True, exist_ok=True)
+    spec_file.write_text(json.dumps(spec, indent=2))
+
+    total = int(np.prod([len(a) for a in grid_axes(spec["ranges"])]))
+    chunks = [(i, start, min(start + args.chunk_size, total))
+              for i, start in enumerate(range(0, total, args.chunk_size))]
+    done = {int(p.stem.split("_")[1]) for p in chunk_dir.glob("chunk_*.csv")}
+    todo = [c for c in chunks if c[0] not in done]
+    print(f"{total} parameter sets in {len(chunks)} chunks, {len(chunks) - len(todo)} already done")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(run_chunk, *c, spec, chunk_dir) for c in todo]
+        for n, future in enumerate(as_completed(futures), 1):
+            future.result()
+            print(f"\rchunks {n}/{len(todo)}", end="", flush=True)
+    print()
+
+    ranked = merge_chunks(chunk_dir, out_dir / "ranked.csv")
+    n_valid = np.count_nonzero(ranked[:, COLUMNS.index("score")] > 0)
+    print(f"{n_valid} of {total} parameter sets are animatable, ranked table in {out_dir / 'ranked.csv'}")
+    print(",".join(COLUMNS))
+    for row in ranked[:args.top]:
+        print(",".join(f"{v:.4g}" for v in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,13 @@
 from manim import *
 import numpy as np
 
+from common.growing_curve import GrowingCurve
+from common.numeric_label import NumericLabel
+from common.phase_portrait import PhasePortrait
+from common.static_layer import bake_static_layer
+from common.streaming_export import StreamingExportMixin
+from common.svg_cache import load_svg
+
 # --- Lotka–Volterra simulation function ---
 def lotka_volterra(t_max=60, dt=0.1,
                    alpha=0.3, beta=0.15,
@@ -21,15 +28,24 @@ def lotka_volterra(t_max=60, dt=0.1,
     return t, R, F
 
 
+# --- Animal opacities ---
+def get_opacities(population, n_animals):
+    # animal i is fully visible below floor(population), partially at it, hidden above.
+    # works on a single population or on a whole array of steps -> (steps, n_animals)
+    population = np.asarray(population, dtype=float)
+    return np.clip(population[..., None] - np.arange(n_animals), 0, 1)
+
+
 # --- Manim Scene ---
-class LVAnimation(MovingCameraScene):
+class LVAnimation(StreamingExportMixin, MovingCameraScene): # GIF/WebM/MP4 in one pass: see common/streaming_export.py
     def construct(self):
         # setup camera
         self.camera.frame.scale(1.3)  # zoom out 
         self.camera.frame.move_to(LEFT * 2)  # equivalent
 
         # simulate data
-        t, R, F = lotka_volterra()
+        params = dict(alpha=0.3, beta=0.15, delta=0.05, gamma=0.3)
+        t, R, F = lotka_volterra(**params)
 
         # set up axes
         axes = Axes(
@@ -44,7 +60,6 @@ class LVAnimation(MovingCameraScene):
             MarkupText("Time").next_to(axes.x_axis, DOWN),
             MarkupText("Population").rotate(90*DEGREES).next_to(axes.y_axis, LEFT)
         )
-        self.add(axes, labels)
 
         # --- Forest Panel on the Left ---
         forest_radius = 2.2
@@ -76,7 +91,7 @@ class LVAnimation(MovingCameraScene):
             "lotka_volterra/tree2_lightgreen.svg",
             "lotka_volterra/tree2_darkgreen.svg"]
         for additional_tree in additional_trees:
-            tree = SVGMobject(tree_types[additional_tree[0]]).scale(0.3)
+            tree = load_svg(tree_types[additional_tree[0]]).scale(0.3)
             pos = forest_clearing.get_center() + (forest_radius * additional_tree[1]) * np.array([np.cos(additional_tree[2]*DEGREES), np.sin(additional_tree[2]*DEGREES), 0])
             tree.move_to(pos)
             trees.add(tree)
@@ -85,7 +100,7 @@ class LVAnimation(MovingCameraScene):
         for svg_path, angles in tree_map.items():
             for angle_deg in angles:
                 angle_rad = angle_deg * DEGREES
-                tree = SVGMobject(svg_path).scale(0.3)
+                tree = load_svg(svg_path).scale(0.3)
                 pos = forest_clearing.get_center() + forest_radius * np.array([np.cos(angle_rad), np.sin(angle_rad), 0])
                 tree.move_to(pos)
                 trees.add(tree)
@@ -98,7 +113,7 @@ class LVAnimation(MovingCameraScene):
 
         rabbits = VGroup()
         for rabbit_pos in rabbits_map:
-            rabbit = SVGMobject(rabbit_svg ).scale(0.3)
+            rabbit = load_svg(rabbit_svg).scale(0.3)
             pos = forest_clearing.get_center() + (rabbit_pos[0]*forest_radius) * np.array([np.cos(rabbit_pos[1]*DEGREES), np.sin(rabbit_pos[1]*DEGREES), 0])
             rabbit.move_to(pos)
             rabbit.set_opacity(0)
@@ -111,7 +126,7 @@ class LVAnimation(MovingCameraScene):
 
         foxes = VGroup()
         for fox_pos in foxes_map:
-            fox = SVGMobject(fox_svg ).scale(0.2)
+            fox = load_svg(fox_svg).scale(0.2)
             pos = forest_clearing.get_center() + (fox_pos[0]*forest_radius) * np.array([np.cos(fox_pos[1]*DEGREES), np.sin(fox_pos[1]*DEGREES), 0])
             fox.move_to(pos)
             fox.set_opacity(0)
@@ -119,11 +134,26 @@ class LVAnimation(MovingCameraScene):
 
         forest_panel = VGroup(forest_clearing, trees, rabbits, foxes)
         forest_panel.move_to(np.array([-8, 0, 0]))
-        self.add(forest_panel)
 
-        # Create initial plot curves
-        rabbit_curve = VMobject(color="#0072B2").set_z_index(2)
-        fox_curve = VMobject(color="#E69F00").set_z_index(2)
+        # --- Phase portrait below the state box ---
+        def lv_field(R, F):
+            return (params["alpha"] * R - params["beta"] * R * F,
+                    params["delta"] * R * F - params["gamma"] * F)
+
+        phase_portrait = PhasePortrait(
+            lv_field, x_range=[0, 12, 2], y_range=[0, 4, 1], system="lotka_volterra",
+            params=params, x_length=2.4, y_length=1.8, axis_labels=("Rabbits", "Foxes"), seeds=(16, 12),
+        ).move_to([5.5, -3.4, 0])
+
+        # axes, clearing, trees and the flow never change: bake them into the background, only the animals stay live
+        bake_static_layer(self, axes, labels, forest_clearing, trees, phase_portrait.background)
+        self.add(rabbits, foxes)
+
+        # Create initial plot curves, they grow by one segment per step
+        rabbit_points = axes.c2p(t, R).T
+        fox_points = axes.c2p(t, F).T
+        rabbit_curve = GrowingCurve(capacity=len(t), color="#0072B2").set_z_index(2)
+        fox_curve = GrowingCurve(capacity=len(t), color="#E69F00").set_z_index(2)
         self.add(rabbit_curve, fox_curve)
 
         # State box
@@ -133,8 +163,8 @@ class LVAnimation(MovingCameraScene):
         box.move_to([5.5,0,0])
 
         state_text = Text("State:", font_size=36)
-        rabbits_value = Text("-", font_size = 36)
-        foxes_value = Text("-", font_size=36)
+        rabbits_value = NumericLabel("-", font_size=36)
+        foxes_value = NumericLabel("-", font_size=36)
         rabbits_line = VGroup(Text("Rabbits =", font_size=36), rabbits_value).arrange(RIGHT, buff=0.4)
         foxes_line = VGroup(Text("Foxes =", font_size=36), foxes_value).arrange(RIGHT, buff=0.4)
         box_text = VGroup(state_text, rabbits_line, foxes_line).arrange(DOWN, buff=0.3)
@@ -143,46 +173,59 @@ class LVAnimation(MovingCameraScene):
 
         self.add(box, box_text)
 
-        # ADVANCE TIME IN LOOP 
-        for t_current in range(1,len(t)): 
-            rabbits_value.become(Text(f"{R[t_current]:.1f}", font_size=36).move_to(rabbits_value.get_center()))
-            foxes_value.become(Text(f"{F[t_current]:.1f}", font_size=36).move_to(foxes_value.get_center()))
-                               
-            # rabbit curve
-            rabbit_curve.become(axes.plot_line_graph(
-                x_values=t[:t_current], y_values=R[:t_current],
-                line_color="#0072B2",
-                add_vertex_dots=False
-            ).set_z_index(2))
-
-            # fox curve
-            fox_curve.become(axes.plot_line_graph(
-                x_values=t[:t_current], y_values=F[:t_current],
-                line_color="#E69F00",
-                add_vertex_dots=False
-            ).set_z_index(2))
-       
-            # calculate rabbit opacities
-            def get_opacities(population, n_animals):
-                full = int(np.floor(population))
-                partial = population - full
-                opacities = []
-                for i in range(n_animals):
-                    if i < full:
-                        opacities.append(1)
-                    elif i == full:
-                        opacities.append(partial)
-                    else:
-                        opacities.append(0)
-                return opacities
-
-            rabbit_opacities = get_opacities(R[t_current], n_rabbits)
-            fox_opacities = get_opacities(F[t_current], n_foxes)
-            for j, rabbit in enumerate(rabbits):
-                rabbit.set_opacity(rabbit_opacities[j])
-            for f, fox in enumerate(foxes):
-                fox.set_opacity(fox_opacities[f])
-
-            self.wait(0.03)
+        # --- Precompute everything that depends on the simulation step ---
+        frame_duration = 0.03 # seconds per simulation step
+        rabbit_opacities = get_opacities(R, n_rabbits)
+        fox_opacities = get_opacities(F, n_foxes)
+
+        # ADVANCE TIME WITH ONE TRACKER: step index = tracker value, all visuals read from the arrays
+        step_tracker = ValueTracker(1)
+
+        def get_step():
+            return min(int(step_tracker.get_value()), len(t) - 1)
+
+        def update_values(mob):
+            step = get_step()
+            if step == mob.step:
+                return
+            mob.step = step
+            rabbits_value.set_value(R[step])
+            foxes_value.set_value(F[step])
+
+        def update_curve(points):
+            def updater(curve):
+                # at step k the curve shows the first k points
+                n_shown = curve.get_num_corners()
+                if n_shown < get_step():
+                    curve.add_points_as_corners_to_curve(points[n_shown:get_step()])
+            return updater
+
+        def update_animals(opacities):
+            def updater(animals):
+                step = get_step()
+                if step == animals.step:
+                    return
+                animals.step = step
+                for animal, opacity in zip(animals, opacities[step]):
+                    animal.set_opacity(opacity)
+            return updater
+
+        box_text.step = 0
+        rabbits.step = foxes.step = 0
+        box_text.add_updater(update_values)
+        rabbit_curve.add_updater(update_curve(rabbit_points))
+        fox_curve.add_updater(update_curve(fox_points))
+        rabbits.add_updater(update_animals(rabbit_opacities))
+        foxes.add_updater(update_animals(fox_opacities))
+
+        phase_portrait.track(lambda: (R[get_step()], F[get_step()]), trail_length=len(t))
+        self.add(phase_portrait.trail, phase_portrait.dot)
+
+        self.add(step_tracker)
+        self.play(
+            step_tracker.animate.set_value(len(t)),
+            run_time=frame_duration * (len(t) - 1),
+            rate_func=linear
+        )
 
         self.wait(2)
@@ -0,0 +1,88 @@
+import argparse
+import time
+
+from manim import *
+import numpy as np
+
+from common.arc_geometry import arc_points
+from common.frame_state import FrameState
+
+# Frame time of the damped pendulum: the old always_redraw parts (rebuilt every frame)
+# against the parts updated in place from a shared FrameState. Each frame runs the
+# updaters and draws the parts with the cairo camera, like the scene does. Needs manim.
+
+amplitude = PI / 2 * 0.8
+L = 6
+ball_radius = 1
+beta = 0.25
+omega_d = np.sqrt(max(0, 9.81 / L - beta**2))
+
+
+def get_theta(t):
+    return amplitude * np.exp(-beta * t) * np.cos(omega_d * t)
+
+
+def pos(theta):
+    return np.array([L * np.sin(theta), -L * np.cos(theta), 0])
+
+
+def always_redraw_parts(t_tracker):
+    theta = lambda: get_theta(t_tracker.get_value())
+    return [
+        always_redraw(lambda: Line(ORIGIN, pos(theta()), color=WHITE, stroke_width=20)),
+        always_redraw(lambda: Dot(pos(theta()), radius=ball_radius, color="#0e4058")),
+        always_redraw(lambda: Arc(start_angle=3 * PI / 2, angle=theta(), radius=2.5, arc_center=ORIGIN,
+                                  color="#666666", stroke_width=6)),
+        always_redraw(lambda: Text("θ", font_size=64, color="#666666").move_to(
+            Arc(start_angle=3 * PI / 2, angle=theta() / 2, radius=2.0, arc_center=ORIGIN).point_from_proportion(0.5))),
+    ]
+
+
+def in_place_parts(t_tracker):
+    theta_state = FrameState(t_tracker, get_theta, t_range=(0, 30))
+    theta = theta_state.get_value
+    line = Line(ORIGIN, pos(theta()), color=WHITE, stroke_width=20)
+    line.add_updater(lambda mob: mob.put_start_and_end_on(ORIGIN, pos(theta())))
+    ball = Dot(pos(theta()), radius=ball_radius, color="#0e4058")
+    ball.add_updater(lambda mob: mob.move_to(pos(theta())))
+    arc = Arc(start_angle=3 * PI / 2, angle=theta(), radius=2.5, arc_center=ORIGIN, color="#666666", stroke_width=6)
+    arc.add_updater(lambda mob: setattr(mob, "points", arc_points(3 * PI / 2, theta(), radius=2.5)))
+    label_pos = lambda: 2.0 * np.array([np.cos(3 * PI / 2 + theta() / 4), np.sin(3 * PI / 2 + theta() / 4), 0])
+    label = Text("θ", font_size=64, color="#666666").move_to(label_pos())
+    label.add_updater(lambda mob: mob.move_to(label_pos()))
+    return [line, ball, arc, label]
+
+
+def frame_times(make_parts, n_frames, render):
+    t_tracker = ValueTracker(0)
+    parts = make_parts(t_tracker)
+    camera = Camera()
+    update, draw = [], []
+    for t in np.linspace(0, 30, n_frames):
+        start = time.perf_counter()
+        t_tracker.set_value(t)
+        for part in parts:
+            part.update(1 / config.frame_rate)
+        middle = time.perf_counter()
+        if render:
+            camera.reset()
+            camera.capture_mobjects(parts)
+        update.append(middle - start)
+        draw.append(time.perf_counter() - middle)
+    return np.array(update), np.array(draw)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pendulum frame time: always_redraw against in-place updates")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--no-render", action="store_true", help="time the updaters only")
+    args = parser.parse_args()
+
+    print(f"{args.frames} frames, {config.pixel_width}x{config.pixel_height}")
+    print(f"{'variant':>14} {'update ms':>10} {'draw ms':>8} {'frame ms':>9}")
+    results = {}
+    for name, make_parts in (("always_redraw", always_redraw_parts), ("in place", in_place_parts)):
+        update, draw = frame_times(make_parts, args.frames, not args.no_render)
+        results[name] = np.median(update + draw)
+        print(f"{name:>14} {np.median(update) * 1e3:>10.3f} {np.median(draw) * 1e3:>8.3f} {results[name] * 1e3:>9.3f}")
+    print(f"in place saves {1 - results['in place'] / results['always_redraw']:.0%} of the median frame time")
@@ -0,0 +1,77 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import numpy as np
+
+from common.pendulum_dynamics import poincare_sections
+
+# Bifurcation diagram of the driven damped pendulum: θ once per drive period, for a sweep
+# of drive amplitudes. Chunks of the sweep run in a process pool, each one as a single
+# numpy batch.
+#
+#   PYTHONPATH=. python pendulum_damped/bifurcation.py --drive 0.9 1.6 2000 --periods 100
+#
+# The point cloud is written as float32, shape (n_points, 2), columns drive amplitude
+# (in units of ω0²) and θ, sorted by amplitude. The sweep settings go to a .json next
+# to it. pendulum_bifurcation.py loads both.
+
+# same pendulum as Pendulum_damped, driven at 2/3 of its natural frequency
+NATURAL_FREQUENCY = np.sqrt(9.81 / 6)
+DAMPING = 0.25
+DRIVE_FREQUENCY = 2 / 3 * NATURAL_FREQUENCY
+BIFURCATION_FILE = Path(__file__).resolve().parents[1] / ".cache" / "bifurcation" / "pendulum_bifurcation.npy"
+
+
+def run_chunk(drive, spec):
+    sections = poincare_sections(drive * NATURAL_FREQUENCY**2, NATURAL_FREQUENCY, DAMPING, DRIVE_FREQUENCY,
+                                 n_periods=spec["periods"], n_transient=spec["transient"],
+                                 steps_per_period=spec["steps_per_period"])
+    theta = sections[..., 0].T # (amplitudes, periods)
+    return np.column_stack([np.repeat(drive, spec["periods"]), theta.ravel()]).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel bifurcation diagram of the driven damped pendulum")
+    parser.add_argument("--drive", nargs=3, type=float, metavar=("MIN", "MAX", "COUNT"), default=[0.9, 1.6, 2000],
+                        help="drive amplitudes in units of ω0²")
+    parser.add_argument("--periods", type=int, default=100, help="Poincaré samples per amplitude")
+    parser.add_argument("--transient", type=int, default=300, help="drive periods skipped before sampling")
+    parser.add_argument("--steps-per-period", type=int, default=200)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", type=Path, default=BIFURCATION_FILE)
+    args = parser.parse_args()
+
+    spec = {"drive": args.drive, "periods": args.periods, "transient": args.transient,
+            "steps_per_period": args.steps_per_period, "natural_frequency": NATURAL_FREQUENCY,
+            "damping": DAMPING, "drive_frequency": DRIVE_FREQUENCY}
+    drives = np.linspace(args.drive[0], args.drive[1], int(args.drive[2]))
+    chunks = [drives[i:i + args.chunk_size] for i in range(0, len(drives), args.chunk_size)]
+    print(f"{len(drives)} drive amplitudes in {len(chunks)} chunks, {args.workers} workers")
+
+    start = time.perf_counter()
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_chunk, chunk, spec): i for i, chunk in enumerate(chunks)}
+        for n, future in enumerate(as_completed(futures), 1):
+            results[futures[future]] = future.result()
+            print(f"\rchunks {n}/{len(chunks)}", end="", flush=True)
+    print()
+    points = np.concatenate(results)
+
+    # write to a temp file first, so a killed run never leaves half a diagram behind
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = args.out.with_name(f"{args.out.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp, points)
+    os.replace(tmp, args.out)
+    args.out.with_suffix(".json").write_text(json.dumps(spec, indent=2))
+    print(f"{len(points)} points in {time.perf_counter() - start:.1f} s, "
+          f"{points.nbytes / 1e6:.1f} MB written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
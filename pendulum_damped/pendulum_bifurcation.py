@@ -0,0 +1,57 @@
+from manim import *
+import json
+import numpy as np
+from bifurcation import BIFURCATION_FILE
+
+# Bifurcation diagram of the driven damped pendulum, swept in from the left.
+# The point cloud comes from bifurcation.py, run it first:
+#
+#   PYTHONPATH=. python pendulum_damped/bifurcation.py
+
+class PendulumBifurcation(Scene):
+    def construct(self):
+        # Parameters
+        reveal_runtime = 15
+        point_color = "#4fa3c7"
+        point_opacity = 0.6
+
+        if not BIFURCATION_FILE.exists():
+            raise FileNotFoundError(f"{BIFURCATION_FILE} is missing, run pendulum_damped/bifurcation.py first")
+        data = np.load(BIFURCATION_FILE) # columns drive amplitude, θ; sorted by amplitude
+        spec = json.loads(BIFURCATION_FILE.with_suffix(".json").read_text())
+        drive_min, drive_max = spec["drive"][:2]
+
+        # set up axes
+        axes = Axes(
+            x_range=[drive_min, drive_max, 0.1],
+            y_range=[-PI, PI, PI / 2],
+            x_length=11,
+            y_length=6,
+            axis_config={"include_numbers": False},
+        )
+        labels = VGroup(
+            MarkupText("Drive amplitude / ω₀²", font_size=32).next_to(axes.x_axis, DOWN),
+            MarkupText("θ once per drive period", font_size=32).rotate(90*DEGREES).next_to(axes.y_axis, LEFT),
+        )
+        self.add(axes, labels)
+
+        # --- Point cloud, revealed by amplitude ---
+        # scene coordinates and colours for all points once, every frame shows a prefix of them
+        points = axes.c2p(data[:, 0], data[:, 1]).T
+        rgbas = np.tile(color_to_rgba(point_color, point_opacity), (len(points), 1))
+        n_tracker = ValueTracker(0)
+
+        cloud = PMobject(stroke_width=1)
+        cloud.add_points(points[:1], rgbas=rgbas[:1])
+
+        def update_cloud(mob):
+            n = max(int(n_tracker.get_value()), 1)
+            mob.points = points[:n] # views, nothing is copied
+            mob.rgbas = rgbas[:n]
+
+        cloud.add_updater(update_cloud)
+        self.add(cloud)
+
+        self.play(n_tracker.animate.set_value(len(points)), run_time=reveal_runtime, rate_func=linear)
+
+        self.wait(3)
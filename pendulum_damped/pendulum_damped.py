@@ -1,6 +1,12 @@
 from manim import *
 import numpy as np
 
+from common.arc_geometry import arc_points
+from common.frame_state import FrameState
+from common.numeric_label import NumericLabel
+from common.pendulum_dynamics import PendulumTable
+from common.phase_portrait import PhasePortrait
+
 class Pendulum_damped(MovingCameraScene):
     def construct(self):
         # Parameters
@@ -9,29 +15,32 @@ class Pendulum_damped(MovingCameraScene):
         ball_radius = 1
         g = 9.81
         beta = 0.25 # damping coefficient
+        drive_amplitude = 0 # periodic drive in rad/s², 0 = free damped pendulum (see bifurcation.py)
 
         # Derived parameters
         pendulum_max_width = L * np.sin(amplitude) + ball_radius
         omega_0 = np.sqrt(g/L) # frequency without damping
-        omega_d = np.sqrt(max(0, omega_0 **2 - beta**2)) # frequency with damping
+        drive_frequency = 2 / 3 * omega_0
 
         # Tracker for time
         t_tracker = ValueTracker(0)
 
-        def get_theta(t): # diff equation for damped pendulum
-            return amplitude * np.exp(-beta * t) * np.cos(omega_d * t)
+        # full nonlinear equation, integrated once; the small-angle formula is far off at this amplitude
+        pendulum = PendulumTable(amplitude, 30, omega_0, beta,
+                                 drive_amplitude=drive_amplitude, drive_frequency=drive_frequency)
+
+        # theta for the current frame, looked up once per frame
+        theta_state = FrameState(t_tracker, pendulum.theta)
+        omega_state = FrameState(t_tracker, pendulum.omega)
 
         def get_pendulum_pos(): # convert theta to x,y,z coordinates to draw
-            t = t_tracker.get_value()
-            theta = get_theta(t)
+            theta = theta_state.get_value()
             x = L * np.sin(theta)
             y = -L * np.cos(theta)
             return np.array([x, y, 0])
 
         def get_theta_degrees(): # convert theta to degrees
-            t = t_tracker.get_value()
-            theta = get_theta(t)
-            return np.degrees(theta)
+            return np.degrees(theta_state.get_value())
 
         # Updater that only updates every n frames
         def update_theta_text(mob, dt):
@@ -40,39 +49,26 @@ class Pendulum_damped(MovingCameraScene):
             update_theta_text.frame_counter += 1
 
             if update_theta_text.frame_counter % 2 == 0:
-                mob.text = f"{get_theta_degrees():.1f}"
-                mob.become(Text(mob.text, font_size=60).move_to(mob.get_center()))
+                mob.set_value(get_theta_degrees())
 
-        # Pendulum visuals
-        pendulum_line = always_redraw(
-            lambda: Line(ORIGIN, get_pendulum_pos(), color=WHITE, stroke_width=20)
-        )
-        pendulum_ball = always_redraw(
-            lambda: Dot(get_pendulum_pos(), radius=ball_radius, color="#0e4058")
-        )
+        # Pendulum visuals, built once and moved in place every frame
+        pendulum_line = Line(ORIGIN, get_pendulum_pos(), color=WHITE, stroke_width=20)
+        pendulum_line.add_updater(lambda mob: mob.put_start_and_end_on(ORIGIN, get_pendulum_pos()))
+        pendulum_ball = Dot(get_pendulum_pos(), radius=ball_radius, color="#0e4058")
+        pendulum_ball.add_updater(lambda mob: mob.move_to(get_pendulum_pos()))
 
         # Arc with θ label
         reference_line = DashedLine(ORIGIN, DOWN * config.frame_height, color="#666666")
-        theta_arc = always_redraw(
-            lambda: Arc(
-                start_angle=3 * PI / 2,
-                angle = get_theta(t_tracker.get_value()),
-                radius=2.5,
-                arc_center=ORIGIN,
-                color="#666666",
-                stroke_width=6,
-            )
-        )
-        theta_label = always_redraw(
-            lambda: Text("θ", font_size=64, color="#666666").move_to(
-                Arc(
-                    start_angle=3 * PI / 2,
-                    angle = get_theta(t_tracker.get_value())/2,
-                    radius=2.0,
-                    arc_center=ORIGIN,
-                ).point_from_proportion(0.5)
-            )
-        )
+        theta_arc = Arc(start_angle=3 * PI / 2, angle=theta_state.get_value(), radius=2.5,
+                        arc_center=ORIGIN, color="#666666", stroke_width=6)
+        theta_arc.add_updater(lambda mob: setattr(mob, "points", arc_points(3 * PI / 2, theta_state.get_value(), radius=2.5)))
+
+        def get_theta_label_pos(): # middle of the arc at half the angle, radius 2
+            angle = 3 * PI / 2 + theta_state.get_value() / 4
+            return 2.0 * np.array([np.cos(angle), np.sin(angle), 0])
+
+        theta_label = Text("θ", font_size=64, color="#666666").move_to(get_theta_label_pos())
+        theta_label.add_updater(lambda mob: mob.move_to(get_theta_label_pos()))
    
         # State box
         box_margin = 2
@@ -82,18 +78,28 @@ class Pendulum_damped(MovingCameraScene):
             height=box_height, width=box_width, stroke_color=WHITE, fill_opacity=0
         ).shift(RIGHT * (pendulum_max_width + box_margin), RIGHT)
         state_text = Text("State:")
-        theta_value = Text(f"{get_theta_degrees():.1f}", font_size=60)
+        theta_value = NumericLabel(get_theta_degrees(), font_size=60)
         theta_value.add_updater(update_theta_text)
         theta_line = VGroup(Text("θ = ", font_size=60), theta_value, Text("°", font_size=60)).arrange(RIGHT)
         box_text = VGroup(state_text, theta_line).arrange(DOWN, buff=0.4)
         box_text.move_to(box.get_center())
 
+        # Phase portrait below the state box: the undriven flow, the live (θ, ω) on top
+        def pendulum_field(theta, omega):
+            return omega, -omega_0**2 * np.sin(theta) - 2 * beta * omega
+
+        phase_portrait = PhasePortrait(
+            pendulum_field, x_range=[-1.5, 1.5, 0.5], y_range=[-2, 2, 1],
+            system="pendulum_damped", params=(omega_0, beta),
+            x_length=box_width - 0.6, y_length=box_width - 0.6, axis_labels=("θ", "ω"), seeds=(16, 16),
+        ).next_to(box, DOWN, buff=0.3)
+        phase_portrait.track(lambda: (theta_state.get_value(), omega_state.get_value()), trail_length=200)
 
         #set camera field of view
         fov_margin = 0.25
         x_min = -L -ball_radius - fov_margin
         x_max = L +ball_radius + box_margin + box_width + fov_margin
-        y_min = min(-L -ball_radius - fov_margin, -box_height - fov_margin)
+        y_min = min(-L -ball_radius - fov_margin, phase_portrait.get_bottom()[1] - fov_margin)
         y_max = 2*fov_margin
 
         frame_width = x_max - x_min
@@ -106,7 +112,7 @@ class Pendulum_damped(MovingCameraScene):
         # Add elements in order of layering
         self.add(reference_line)
         self.add(theta_arc, theta_label)
-        self.add(pendulum_line, pendulum_ball, box, box_text)
+        self.add(pendulum_line, pendulum_ball, box, box_text, phase_portrait)
 
         self.play(t_tracker.animate.set_value(30), run_time=20, rate_func=linear)
 
@@ -0,0 +1,95 @@
+from manim import *
+import numpy as np
+
+from common.numeric_label import NumericLabel
+from common.trajectory_cache import default_cache
+from double_pendulum import arm_points, divergence, integrate_double_pendulums, joint_positions, nearby_pendulums
+
+class Pendulum_double(MovingCameraScene):
+    def construct(self):
+        # Parameters
+        n_pendulums = 2000
+        n_layers = 64 # arms are drawn in this many VMobjects, opacity adds up between them
+        start_angle = PI * 0.8 # both arms, released at rest
+        spread = 1e-4 # initial θ2 offsets in [-spread, spread]
+        L1, L2 = 3, 3
+        t_max = 20
+        fps = 30
+        arm_opacity = 0.08
+
+        # Derived parameters
+        pendulum_max_width = L1 + L2
+        t_eval = np.linspace(0, t_max, t_max * fps + 1)
+
+        # --- Integrate all pendulums at once (cached on disk, re-renders skip it) ---
+        init = nearby_pendulums(start_angle, start_angle, n_pendulums, spread)
+        cache = default_cache()
+        key = cache.key("double_pendulum", {"L1": L1, "L2": L2}, init, t_eval, "rk4", (0.002,))
+        states = cache.get_or_compute(key, lambda: integrate_double_pendulums(init, t_eval, L1=L1, L2=L2).astype(np.float32))
+        spread_degrees = np.degrees(np.median(divergence(states), axis=1))
+
+        # Tracker for the sample index
+        step_tracker = ValueTracker(0)
+
+        def get_step():
+            return min(int(round(step_tracker.get_value())), len(t_eval) - 1)
+
+        # --- Arms: every pendulum is two segments of one of n_layers VMobjects ---
+        # one numpy pass builds the points of all arms, each layer takes a view of its slice;
+        # the outer bobs are one point cloud
+        layer_colors = color_gradient(["#0e4058", BLUE, ORANGE], n_layers)
+        arms = VGroup(*[VMobject(stroke_color=color, stroke_width=4, stroke_opacity=arm_opacity)
+                        for color in layer_colors])
+        bounds = np.linspace(0, n_pendulums, n_layers + 1).astype(int)
+        nppcc = arms[0].n_points_per_cubic_curve
+
+        bobs = PMobject(stroke_width=6)
+        bobs.add_points(np.zeros((n_pendulums, 3)), rgbas=np.tile(color_to_rgba(WHITE, 0.5), (n_pendulums, 1)))
+
+        def update_pendulums(mob):
+            step = get_step()
+            if step == mob.step:
+                return
+            mob.step = step
+            joints = joint_positions(np.asarray(states[step], dtype=float), L1, L2)
+            points = arm_points(joints, nppcc)
+            for layer, start, stop in zip(mob.submobjects, bounds[:-1], bounds[1:]):
+                layer.points = points[start * 2 * nppcc:stop * 2 * nppcc]
+            bobs.points = joints[:, 2]
+
+        arms.step = None
+        update_pendulums(arms)
+        arms.add_updater(update_pendulums)
+        pivot = Dot(ORIGIN, radius=0.15, color=WHITE)
+
+        # State box
+        box_margin = 2
+        box_height = 3.0
+        box_width = 3.5
+        box = Rectangle(
+            height=box_height, width=box_width, stroke_color=WHITE, fill_opacity=0
+        ).shift(RIGHT * (pendulum_max_width + box_margin), RIGHT)
+        state_text = Text(f"{n_pendulums} pendulums:", font_size=40)
+        spread_value = NumericLabel(spread_degrees[0], num_decimal_places=1, font_size=60)
+        spread_value.add_updater(lambda mob: mob.set_value(spread_degrees[get_step()]))
+        spread_line = VGroup(Text("spread = ", font_size=60), spread_value, Text("°", font_size=60)).arrange(RIGHT)
+        box_text = VGroup(state_text, spread_line).arrange(DOWN, buff=0.4)
+        box_text.scale_to_fit_width(box_width * 0.85)
+        box_text.move_to(box.get_center())
+
+        #set camera field of view
+        fov_margin = 0.25
+        x_min = -pendulum_max_width - fov_margin
+        x_max = pendulum_max_width + box_margin + box_width + fov_margin
+        y_min = -pendulum_max_width - fov_margin
+        y_max = pendulum_max_width + fov_margin
+
+        self.camera.frame.set_width(max(x_max - x_min, (y_max - y_min) * config.frame_width / config.frame_height))
+        self.camera.frame.move_to([(x_min + x_max)/2, (y_min + y_max)/2, 0])
+
+        # Add elements in order of layering
+        self.add(arms, bobs, pivot, box, box_text)
+
+        self.play(step_tracker.animate.set_value(len(t_eval) - 1), run_time=t_max, rate_func=linear)
+
+        self.wait(2)
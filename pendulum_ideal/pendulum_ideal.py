@@ -1,6 +1,11 @@
 from manim import *
 import numpy as np
 
+from common.arc_geometry import arc_points
+from common.frame_state import FrameState
+from common.numeric_label import NumericLabel
+from common.pendulum_dynamics import PendulumTable, free_period
+
 class Pendulum_ideal(MovingCameraScene):
     def construct(self):
         # Parameters
@@ -13,17 +18,22 @@ class Pendulum_ideal(MovingCameraScene):
         # Tracker for time
         t_tracker = ValueTracker(0)
 
+        # full nonlinear equation without damping, speed is the small-angle frequency;
+        # one swing of the real period, longer than 2π/speed at this amplitude, loops seamlessly
+        period = free_period(amplitude, speed)
+        pendulum = PendulumTable(amplitude, period, speed)
+
+        # theta for the current frame, looked up once per frame
+        theta_state = FrameState(t_tracker, pendulum.theta)
+
         def get_pendulum_pos():
-            t = t_tracker.get_value()
-            theta = amplitude * np.cos(speed * t)
+            theta = theta_state.get_value()
             x = L * np.sin(theta)
             y = -L * np.cos(theta)
             return np.array([x, y, 0])
 
         def get_theta_degrees():
-            t = t_tracker.get_value()
-            theta = amplitude * np.cos(speed * t)
-            return np.degrees(theta)
+            return np.degrees(theta_state.get_value())
 
         # Updater that only updates every n frames
         def update_theta_text(mob, dt):
@@ -32,39 +42,26 @@ class Pendulum_ideal(MovingCameraScene):
             update_theta_text.frame_counter += 1
 
             if update_theta_text.frame_counter % 2 == 0:
-                mob.text = f"{get_theta_degrees():.1f}"
-                mob.become(Text(mob.text, font_size=60).move_to(mob.get_center()))
+                mob.set_value(get_theta_degrees())
 
-        # Pendulum visuals
-        pendulum_line = always_redraw(
-            lambda: Line(ORIGIN, get_pendulum_pos(), color=WHITE, stroke_width=20)
-        )
-        pendulum_ball = always_redraw(
-            lambda: Dot(get_pendulum_pos(), radius=ball_radius, color="#0e4058")
-        )
+        # Pendulum visuals, built once and moved in place every frame
+        pendulum_line = Line(ORIGIN, get_pendulum_pos(), color=WHITE, stroke_width=20)
+        pendulum_line.add_updater(lambda mob: mob.put_start_and_end_on(ORIGIN, get_pendulum_pos()))
+        pendulum_ball = Dot(get_pendulum_pos(), radius=ball_radius, color="#0e4058")
+        pendulum_ball.add_updater(lambda mob: mob.move_to(get_pendulum_pos()))
 
         # Arc with θ label
         reference_line = DashedLine(ORIGIN, DOWN * config.frame_height, color="#666666")
-        theta_arc = always_redraw(
-            lambda: Arc(
-                start_angle=3 * PI / 2,
-                angle=amplitude * np.cos(speed * t_tracker.get_value()),
-                radius=2.5,
-                arc_center=ORIGIN,
-                color="#666666",
-                stroke_width=6,
-            )
-        )
-        theta_label = always_redraw(
-            lambda: Text("θ", font_size=64, color="#666666").move_to(
-                Arc(
-                    start_angle=3 * PI / 2,
-                    angle=amplitude * np.cos(speed * t_tracker.get_value()) / 2,
-                    radius=2.0,
-                    arc_center=ORIGIN,
-                ).point_from_proportion(0.5)
-            )
-        )
+        theta_arc = Arc(start_angle=3 * PI / 2, angle=theta_state.get_value(), radius=2.5,
+                        arc_center=ORIGIN, color="#666666", stroke_width=6)
+        theta_arc.add_updater(lambda mob: setattr(mob, "points", arc_points(3 * PI / 2, theta_state.get_value(), radius=2.5)))
+
+        def get_theta_label_pos(): # middle of the arc at half the angle, radius 2
+            angle = 3 * PI / 2 + theta_state.get_value() / 4
+            return 2.0 * np.array([np.cos(angle), np.sin(angle), 0])
+
+        theta_label = Text("θ", font_size=64, color="#666666").move_to(get_theta_label_pos())
+        theta_label.add_updater(lambda mob: mob.move_to(get_theta_label_pos()))
    
         # State box
         box_margin = 2
@@ -74,7 +71,7 @@ class Pendulum_ideal(MovingCameraScene):
             height=box_height, width=box_width, stroke_color=WHITE, fill_opacity=0
         ).shift(RIGHT * (pendulum_max_width + box_margin), RIGHT)
         state_text = Text("State:")
-        theta_value = Text(f"{get_theta_degrees():.1f}", font_size=60)
+        theta_value = NumericLabel(get_theta_degrees(), font_size=60)
         theta_value.add_updater(update_theta_text)
         theta_line = VGroup(Text("θ = ", font_size=60), theta_value, Text("°", font_size=60)).arrange(RIGHT)
         box_text = VGroup(state_text, theta_line).arrange(DOWN, buff=0.4)
@@ -100,4 +97,4 @@ class Pendulum_ideal(MovingCameraScene):
         self.add(theta_arc, theta_label)
         self.add(pendulum_line, pendulum_ball, box, box_text)
 
-        self.play(t_tracker.animate.set_value(4), run_time=4, rate_func=linear)
+        self.play(t_tracker.animate.set_value(period), run_time=period, rate_func=linear)
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from lotka_volterra import lotka_volterra
+from lv_batch import lotka_volterra_batch
+
+PARAMS = [
+    dict(alpha=0.3, beta=0.15, delta=0.05, gamma=0.3, R0=5, F0=3),
+    dict(alpha=0.5, beta=0.1, delta=0.02, gamma=0.4, R0=8, F0=1),
+    dict(alpha=1.5, beta=0.9, delta=0.6, gamma=0.1, R0=2, F0=6), # dies out: exercises the clamp at 0
+]
+
+
+def test_euler_is_bitwise_equal_to_the_scalar_loop():
+    batch = {k: [p[k] for p in PARAMS] for k in PARAMS[0]}
+    t, R, F = lotka_volterra_batch(**batch, t_max=40, dt=0.1)
+    for j, params in enumerate(PARAMS):
+        t_ref, R_ref, F_ref = lotka_volterra(t_max=40, dt=0.1, **params)
+        assert np.array_equal(t, t_ref)
+        assert np.array_equal(R[:, j], R_ref)
+        assert np.array_equal(F[:, j], F_ref)
+
+
+def test_scalars_broadcast_against_arrays():
+    _, R, F = lotka_volterra_batch(alpha=[0.3, 0.4, 0.5], beta=0.15, delta=0.05, gamma=0.3, R0=5, F0=3, t_max=10)
+    assert R.shape == F.shape == (100, 3)
+    assert np.array_equal(R[0], [5, 5, 5])
+
+
+def test_rk4_converges_to_the_exact_invariant():
+    # V = δR - γ ln R + βF - α ln F is conserved by the exact flow; RK4 keeps it far better than Euler
+    p = PARAMS[0]
+    invariant = lambda R, F: p["delta"] * R - p["gamma"] * np.log(R) + p["beta"] * F - p["alpha"] * np.log(F)
+    drift = {}
+    for method in ("euler", "rk4"):
+        _, R, F = lotka_volterra_batch(**p, t_max=40, dt=0.1, method=method)
+        V = invariant(R[:, 0], F[:, 0])
+        drift[method] = np.abs(V - V[0]).max()
+    assert drift["rk4"] < 1e-4
+    assert drift["rk4"] < drift["euler"] / 100
+
+
+def test_populations_never_go_negative():
+    _, R, F = lotka_volterra_batch(**PARAMS[2], t_max=40, dt=0.5, method="rk4")
+    assert (R >= 0).all() and (F >= 0).all()
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError, match="unknown method"):
+        lotka_volterra_batch(**PARAMS[0], method="leapfrog")
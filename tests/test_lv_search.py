@@ -0,0 +1,56 @@
+import sys
+
+import numpy as np
+import pytest
+
+import lv_search
+from lv_batch import lotka_volterra_batch
+from lv_search import COLUMNS, PARAM_NAMES, grid_axes, grid_params, score_runs
+
+RANGES = ["--alpha", "0.2", "0.4", "4", "--beta", "0.1", "0.2", "3", "--delta", "0.03", "0.07", "2",
+          "--gamma", "0.3", "0.3", "1", "--R0", "5", "5", "1", "--F0", "3", "3", "1"]
+
+
+def sweep(monkeypatch, out, *extra):
+    monkeypatch.setattr(sys, "argv", ["lv_search.py", *RANGES, "--chunk-size", "5", "--workers", "2",
+                                      "--out", str(out), *extra])
+    lv_search.main()
+    return np.loadtxt(out / "ranked.csv", delimiter=",", skiprows=1, ndmin=2)
+
+
+def test_grid_params_match_the_full_grid():
+    axes = grid_axes({name: [0.1, 0.5, 3] for name in PARAM_NAMES})
+    full = np.stack(np.meshgrid(*axes, indexing="ij"), -1).reshape(-1, len(PARAM_NAMES))
+    part = grid_params(axes, 100, 130)
+    assert np.array_equal(np.column_stack([part[name] for name in PARAM_NAMES]), full[100:130])
+
+
+def test_clamped_runs_score_zero():
+    params = {"alpha": np.array([0.3, 1.5]), "beta": np.array([0.15, 0.9]), "delta": np.array([0.05, 0.6]),
+              "gamma": np.array([0.3, 0.1]), "R0": np.array([5, 2]), "F0": np.array([3, 6])}
+    t, R, F = lotka_volterra_batch(**params, t_max=40, dt=0.5)
+    table = score_runs(params, t, R, F, max_rabbits=1e9, max_foxes=1e9, min_cycles=0, max_cycles=100)
+    assert table[:, COLUMNS.index("clamped")].tolist() == [0, 1]
+    assert table[1, COLUMNS.index("score")] == 0
+
+
+def test_an_interrupted_sweep_resumes(monkeypatch, tmp_path, capsys):
+    complete = sweep(monkeypatch, tmp_path / "complete")
+    assert len(complete) == 4 * 3 * 2
+
+    out = tmp_path / "resumed"
+    sweep(monkeypatch, out)
+    chunks = sorted((out / "chunks").glob("chunk_*.csv"))
+    for path in chunks[1:]: # as if killed after the first chunk
+        path.unlink()
+    capsys.readouterr()
+    resumed = sweep(monkeypatch, out)
+    assert f"{len(chunks)} chunks, 1 already done" in capsys.readouterr().out
+    assert np.array_equal(resumed, complete)
+
+
+def test_a_different_sweep_in_the_same_directory_is_refused(monkeypatch, tmp_path):
+    sweep(monkeypatch, tmp_path)
+    with pytest.raises(SystemExit):
+        sweep(monkeypatch, tmp_path, "--t-max", "30")
+    sweep(monkeypatch, tmp_path, "--t-max", "30", "--fresh")
@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from common.pendulum_dynamics import PendulumTable, free_period, poincare_sections, wrap_angle
+
+AMPLITUDE, W0, BETA = np.pi / 2 * 0.8, np.sqrt(9.81 / 6), 0.25 # the damped pendulum scene
+
+
+def reference(t, w0=W0, beta=BETA, drive=0.0, drive_frequency=0.0, theta0=AMPLITUDE):
+    rhs = lambda s, y: [y[1], -w0**2 * np.sin(y[0]) - 2 * beta * y[1] + drive * np.cos(drive_frequency * s)]
+    return solve_ivp(rhs, (0, t[-1]), [theta0, 0], t_eval=t, method="DOP853", rtol=1e-12, atol=1e-12).y
+
+
+def test_table_matches_a_tight_reference_solution():
+    table = PendulumTable(AMPLITUDE, 30, W0, BETA)
+    t = np.linspace(0, 30, 1801) # frame times at 60 fps, mostly between stored samples
+    theta, omega = reference(t)
+    assert np.abs(table.theta(t) - theta).max() < 1e-10
+    assert np.abs(table.omega(t) - omega).max() < 1e-9
+
+
+def test_driven_table_matches_the_reference():
+    table = PendulumTable(AMPLITUDE, 20, W0, BETA, drive_amplitude=1.2, drive_frequency=2 / 3 * W0)
+    t = np.linspace(0, 20, 777)
+    assert np.abs(table.theta(t) - reference(t, drive=1.2, drive_frequency=2 / 3 * W0)[0]).max() < 1e-9
+
+
+def test_single_times_and_arrays_give_the_same_values():
+    table = PendulumTable(AMPLITUDE, 30, W0, BETA)
+    t = np.random.default_rng(0).uniform(-1, 31, 500) # outside [0, t_max] too
+    for lookup in (table.theta, table.omega):
+        array = lookup(t)
+        assert np.allclose([lookup(float(x)) for x in t], array, rtol=0, atol=1e-15)
+        assert np.allclose([lookup(x) for x in t], array, rtol=0, atol=1e-15) # numpy scalars, like trackers
+    assert table.theta(-1.0) == table.theta(0.0) == pytest.approx(AMPLITUDE, abs=1e-15)
+    assert table.theta(31) == table.theta(30.0)
+    assert table.theta(0) == table.theta(0.0)
+
+
+def test_free_period_closes_the_swing():
+    period = free_period(AMPLITUDE, W0)
+    assert period > 2 * np.pi / W0
+    table = PendulumTable(AMPLITUDE, period, W0)
+    assert table.period == period
+    assert abs(table.theta(period) - AMPLITUDE) < 1e-10
+    assert abs(table.omega(period)) < 1e-10
+    assert free_period(1e-6, W0) == pytest.approx(2 * np.pi / W0, rel=1e-12)
+    # released with a push: the same swing as from its turning point
+    theta_max = math.acos(math.cos(0.3) - 0.8**2 / (2 * W0**2))
+    assert free_period(0.3, W0, omega_start=0.8) == pytest.approx(free_period(theta_max, W0), rel=1e-12)
+
+
+def test_no_period_for_damped_swings_or_loops():
+    with pytest.raises(ValueError):
+        PendulumTable(AMPLITUDE, 5, W0, BETA).period
+    with pytest.raises(ValueError):
+        free_period(3.0, W0, omega_start=5.0)
+
+
+def test_poincare_sections_of_a_single_pendulum():
+    drive_frequency = 2 / 3 * W0
+    sections = poincare_sections([0.0, 1.2], W0, BETA, drive_frequency, n_periods=3, n_transient=2,
+                                 steps_per_period=400)
+    assert sections.shape == (3, 2, 2)
+    assert (np.abs(sections[..., 0]) <= np.pi).all()
+    # the driven one against the reference, once per drive period
+    period = 2 * np.pi / drive_frequency
+    t = period * np.arange(6)
+    theta, omega = reference(t, drive=1.2, drive_frequency=drive_frequency, theta0=0.2)
+    assert np.allclose(sections[:, 1, 0], wrap_angle(theta[3:]), atol=1e-6)
+    assert np.allclose(sections[:, 1, 1], omega[3:], atol=1e-6)
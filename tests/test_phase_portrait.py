@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+from common.phase_portrait import marching_squares, streamlines
+
+W0, BETA = np.sqrt(9.81 / 6), 0.25
+
+
+def pendulum(theta, omega):
+    return omega, -W0**2 * np.sin(theta) - 2 * BETA * omega
+
+
+def test_nullclines_of_the_damped_pendulum():
+    xs, ys = np.linspace(-1.5, 1.5, 201), np.linspace(-2, 2, 151)
+    X, Y = np.meshgrid(xs, ys)
+    d_theta, d_omega = pendulum(X, Y)
+    for values, exact in ((d_theta, lambda x: 0 * x), (d_omega, lambda x: -W0**2 * np.sin(x) / (2 * BETA))):
+        points = marching_squares(values, xs, ys).reshape(-1, 2)
+        assert len(points)
+        assert np.abs(points[:, 1] - exact(points[:, 0])).max() < 1e-2
+
+
+def test_circle_contour_is_closed_and_on_the_circle():
+    xs = ys = np.linspace(-2, 2, 80) # no grid point exactly on the circle
+    X, Y = np.meshgrid(xs, ys)
+    segments = marching_squares(X**2 + Y**2 - 1, xs, ys)
+    radii = np.linalg.norm(segments, axis=-1)
+    assert np.abs(radii - 1).max() < 2e-3
+    # closed: every segment end is the start or end of exactly one other segment
+    ends = np.round(segments.reshape(-1, 2), 9)
+    _, counts = np.unique(ends, axis=0, return_counts=True)
+    assert (counts == 2).all()
+
+
+@pytest.mark.parametrize("shift, corners_cut", [(0.25, (0, 2)), (-0.25, (1, 3))])
+def test_saddle_cells_follow_the_center_value(shift, corners_cut):
+    # one cell, corners 0 (x0, y0), 1 (x1, y0), 2 (x1, y1), 3 (x0, y1) of alternating sign;
+    # the shift decides the sign of the center, the mean of the corners
+    values = np.array([[-1, 1], [1, -1]]) + shift
+    segments = marching_squares(values, [0.0, 1.0], [0.0, 1.0])
+    assert segments.shape == (2, 2, 2)
+    # each segment cuts off a corner of the sign opposite to the center's, the corner nearest to it
+    corners = np.array([[0, 0], [1, 0], [1, 1], [0, 1]])
+    cut = sorted(int(np.argmin(np.linalg.norm(corners - s.mean(axis=0), axis=1))) for s in segments)
+    assert tuple(cut) == corners_cut
+
+
+def test_streamlines_follow_the_field():
+    rotation = lambda x, y: (-y, x)
+    lines = streamlines(rotation, (-1, 1), (-1, 1), seeds=(8, 8), steps=10, line_length=1.0)
+    assert lines.shape == (64, 21, 2)
+    seeds = lines[:, 10]
+    assert np.isfinite(seeds).all()
+    inside = np.isfinite(lines[..., 0])
+    radii = np.linalg.norm(lines, axis=-1)
+    # constant radius along each line, up to the midpoint rule's error
+    assert np.nanmax(np.abs(radii - radii[:, 10:11])) < 1e-3
+    # forward is counterclockwise: the angle grows after the seed
+    angle = np.unwrap(np.arctan2(lines[:, 10:12, 1], lines[:, 10:12, 0]), axis=1)
+    assert (angle[:, 1] > angle[:, 0])[inside[:, 11]].all()
+
+
+def test_points_past_the_edge_stay_nan():
+    lines = streamlines(lambda x, y: (np.ones_like(x), np.zeros_like(y)), (0, 1), (0, 1), seeds=(4, 4),
+                        steps=20, line_length=8)
+    inside = np.isfinite(lines[..., 0])
+    assert (lines[inside] >= 0).all() and (lines[inside] <= 1).all()
+    # once a line has left the panel it does not come back
+    forward = inside[:, 20:]
+    assert (np.diff(forward.astype(int), axis=1) <= 0).all()
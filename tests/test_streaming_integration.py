@@ -0,0 +1,51 @@
+import numpy as np
+from scipy.integrate import solve_ivp
+
+from common.streaming_integration import integrate_chunks, stream_trajectory
+from common.trajectory_cache import TrajectoryCache
+
+
+def lorenz(t, state, sigma=10, rho=28, beta=8 / 3):
+    x, y, z = state
+    return [sigma * (y - x), x * (rho - z) - y, x * y - beta * z]
+
+
+T_EVAL = np.linspace(0, 5, 1000)
+
+
+def test_chunks_are_solve_ivp_samples():
+    chunks = [(t, y.copy()) for t, y in integrate_chunks(lorenz, (0, 5), [1, 1, 1], T_EVAL, chunk_size=128)]
+    assert [len(t) for t, _ in chunks] == [128] * 7 + [104]
+    reference = solve_ivp(lorenz, (0, 5), [1, 1, 1], t_eval=T_EVAL)
+    assert np.array_equal(np.concatenate([t for t, _ in chunks]), T_EVAL)
+    assert np.allclose(np.concatenate([y for _, y in chunks]), reference.y.T, rtol=0, atol=1e-9)
+
+
+def test_stream_hands_back_the_finished_entry(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    stream = stream_trajectory(lorenz, (0, 5), [1, 1, 1], T_EVAL, "lorenz", chunk_size=128, cache=cache)
+    assert stream.trajectory is None
+    streamed = np.concatenate([y.copy() for _, y in stream])
+    assert np.array_equal(stream.trajectory, streamed)
+
+    # a cache hit integrates nothing and hands back the same entry
+    hit = stream_trajectory(lorenz, (0, 5), [1, 1, 1], T_EVAL, "lorenz", chunk_size=128, cache=cache)
+    assert np.array_equal(np.concatenate([y for _, y in hit]), streamed)
+    assert np.array_equal(hit.trajectory, streamed)
+
+
+def test_trajectory_survives_eviction_of_its_entry(tmp_path):
+    # another render evicting the entry must not take the trajectory of this one away
+    cache = TrajectoryCache(tmp_path)
+    stream = stream_trajectory(lorenz, (0, 5), [1, 1, 1], T_EVAL, "lorenz", cache=cache)
+    streamed = np.concatenate([y.copy() for _, y in stream])
+    cache.clear()
+    assert np.array_equal(stream.trajectory, streamed)
+
+
+def test_an_abandoned_stream_leaves_no_entry(tmp_path):
+    cache = TrajectoryCache(tmp_path)
+    stream = iter(stream_trajectory(lorenz, (0, 5), [1, 1, 1], T_EVAL, "lorenz", chunk_size=128, cache=cache))
+    next(stream)
+    stream.close()
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,71 @@
+import ast
+import re
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from road_graph import generate_tile_map, road_connections, road_tiles
+from traffic_routing import Router
+
+ROOT = Path(__file__).resolve().parents[1]
+SCENE_MAP = ast.literal_eval(re.search(r"tile_map = (\{.*?\n        \})",
+                                       (ROOT / "traffic" / "traffic.py").read_text(), re.S).group(1))
+
+
+def bfs_distances(connections, start):
+    dist, queue = {start: 0}, deque([start])
+    while queue:
+        tile = queue.popleft()
+        for neighbour in connections[tile].values():
+            if neighbour not in dist:
+                dist[neighbour] = dist[tile] + 1
+                queue.append(neighbour)
+    return dist
+
+
+def test_routes_of_the_traffic_scene(tmp_path):
+    # the routes the scene used to spell out tile by tile
+    router = Router(SCENE_MAP, cache_dir=tmp_path)
+    assert router.route([6, 0], [6, -3]) + router.route([6, -3], [6, -5]) \
+        == [[6, 0], [6, -1], [6, -2], [6, -3], [6, -3], [6, -4], [6, -5]]
+    assert router.route([3, -3], [7, -4]) == [[3, -3], [3, -4], [4, -4], [5, -4], [6, -4], [7, -4]]
+    assert router.route([3, -2], [0, 0]) == [[3, -2], [3, -1], [2, -1], [1, -1], [0, -1], [0, 0]]
+    assert router.route([3, 0], [0, -3]) == [[3, 0], [3, -1], [2, -1], [1, -1], [0, -1], [0, -2], [0, -3]]
+
+
+@pytest.mark.parametrize("tile_map", [SCENE_MAP, generate_tile_map(4, 3)], ids=["scene", "grid"])
+def test_routes_are_shortest_connected_paths(tile_map, tmp_path):
+    router = Router(tile_map, cache_dir=tmp_path)
+    connections = road_connections(road_tiles(tile_map))
+    tiles = sorted(connections)
+    rng = np.random.default_rng(0)
+    for i in rng.choice(len(tiles), min(len(tiles), 15), replace=False):
+        src = tiles[i]
+        dist = bfs_distances(connections, src)
+        for dst, d in dist.items():
+            route = [tuple(t) for t in router.route(src, dst)]
+            assert route[0] == src and route[-1] == dst
+            assert len(route) == d + 1, f"{src} -> {dst}"
+            assert all(b in connections[a].values() for a, b in zip(route, route[1:]))
+
+
+def test_unconnected_tiles_have_no_route(tmp_path):
+    tile_map = {"traffic/street_2.svg": [[0, 0, 0], [0, 1, 0], [5, 0, 0]]}
+    router = Router(tile_map, cache_dir=tmp_path)
+    with pytest.raises(ValueError, match="no route"):
+        router.route([0, 0], [5, 0])
+    with pytest.raises(ValueError, match="no route"):
+        router.route([0, 0], [9, 9])
+
+
+def test_tables_come_from_the_cache_and_edits_recompute_only_their_part(tmp_path):
+    first = Router(SCENE_MAP, cache_dir=tmp_path)
+    assert first.recomputed == len(first.components)
+    again = Router(SCENE_MAP, cache_dir=tmp_path)
+    assert again.recomputed == 0
+    assert again.route([3, -3], [7, -4]) == first.route([3, -3], [7, -4])
+
+    edited = {**SCENE_MAP, "traffic/street_4.svg": SCENE_MAP["traffic/street_4.svg"] + [[20, 20, 0]]}
+    assert Router(edited, cache_dir=tmp_path).recomputed == 1 # only the new, separate part
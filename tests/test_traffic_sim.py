@@ -0,0 +1,50 @@
+import ast
+import re
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from road_graph import generate_tile_map, road_tiles
+from traffic_routing import Router
+from traffic_sim import TrafficSimulation
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def scene_tile_map():
+    # the map of the Traffic scenes, as written in the scene
+    source = (ROOT / "traffic" / "traffic_v2.py").read_text()
+    return ast.literal_eval(re.search(r"tile_map = (\{.*?\n        \})", source, re.S).group(1))
+
+
+MAPS = {"scene": scene_tile_map(), "grid": generate_tile_map(3, 2)}
+
+
+@pytest.mark.parametrize("map_name", MAPS)
+@pytest.mark.parametrize("cells_per_tile, v_max", [(1, 1), (3, 2)])
+@pytest.mark.parametrize("routed", [False, True])
+def test_cars_never_share_a_cell(map_name, cells_per_tile, v_max, routed, tmp_path):
+    tile_map = MAPS[map_name]
+    router = Router(tile_map, cache_dir=tmp_path) if routed else None
+    for seed in range(5):
+        sim = TrafficSimulation(tile_map, n_cars=8, cells_per_tile=cells_per_tile, v_max=v_max,
+                                router=router, seed=seed)
+        for step in range(500):
+            sim.step()
+            assert len(np.unique(sim.cell)) == len(sim.cell), f"seed {seed}, step {step}"
+
+
+def test_tiles_are_the_road_tiles_under_the_cars():
+    tile_map = MAPS["scene"]
+    states, tiles = TrafficSimulation(tile_map, n_cars=4, cells_per_tile=3, seed=3).run(100, with_tiles=True)
+    assert tiles.shape == (101, 4, 2) and tiles.dtype.kind == "i"
+    assert {tuple(t) for t in tiles.reshape(-1, 2)} <= set(road_tiles(tile_map))
+    # drawn in a lane of that tile: off its centre, never onto the next one
+    assert np.abs(states[..., :2] - tiles).max() < 0.5
+    assert np.array_equal(states, TrafficSimulation(tile_map, n_cars=4, cells_per_tile=3, seed=3).run(100))
+
+
+def test_too_many_cars_are_rejected():
+    with pytest.raises(ValueError, match="do not fit"):
+        TrafficSimulation(MAPS["scene"], n_cars=1000)
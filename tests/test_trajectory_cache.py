@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+from scipy.integrate import solve_ivp
+
+from common.trajectory_cache import TrajectoryCache, cached_solve_ivp
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TrajectoryCache(tmp_path, max_mb=1)
+
+
+def decay(t, y):
+    return -0.5 * y
+
+
+def test_keys_depend_on_values_not_on_their_spelling(cache):
+    key = cache.key("lorenz", (10, 28, 8 / 3), [1, 1, 1], np.linspace(0, 1, 5), "RK45", (1e-3, 1e-6))
+    assert key == cache.key("lorenz", [10.0, 28.0, 8 / 3], np.ones(3), list(np.linspace(0, 1, 5)), "RK45", (1e-3, 1e-6))
+    assert key != cache.key("lorenz", (10, 28, 8 / 3 + 1e-15), [1, 1, 1], np.linspace(0, 1, 5), "RK45", (1e-3, 1e-6))
+    assert key != cache.key("lorenz", (10, 28, 8 / 3), [1, 1, 1], np.linspace(0, 1, 5), "RK23", (1e-3, 1e-6))
+    assert key != cache.key("rossler", (10, 28, 8 / 3), [1, 1, 1], np.linspace(0, 1, 5), "RK45", (1e-3, 1e-6))
+    assert cache.key("s", {"b": 1, "a": 2}) == cache.key("s", {"a": 2, "b": 1})
+
+
+def test_put_and_get_round_trip_as_read_only_maps(cache):
+    array = np.random.default_rng(0).normal(size=(3, 100))
+    assert cache.get("missing") is None
+    stored = cache.put("k", array)
+    loaded = cache.get("k")
+    assert np.array_equal(stored, array) and np.array_equal(loaded, array)
+    assert isinstance(loaded, np.memmap)
+    with pytest.raises(ValueError):
+        loaded[0, 0] = 1
+
+
+def test_damaged_entries_are_misses(cache):
+    cache.cache_dir.mkdir(parents=True, exist_ok=True)
+    (cache.cache_dir / "k.npy").write_bytes(b"not an array")
+    assert cache.get("k") is None
+    assert np.array_equal(cache.get_or_compute("k", lambda: np.arange(3.0)), np.arange(3.0))
+
+
+def test_least_recently_used_entries_are_evicted_first(cache):
+    third = np.zeros(300_000 // 8) # three fit into the 1 MB budget, four do not
+    for i, key in enumerate("abc"):
+        cache.put(key, third)
+        os.utime(cache._path(key), ns=(i * 10**9, i * 10**9)) # a, b, c from oldest to newest
+    cache.get("a") # used again: now the newest
+    cache.put("d", third)
+    assert cache._path("a").exists() and not cache._path("b").exists()
+    cache.put("e", third)
+    assert sorted(p.stem for p in cache.cache_dir.glob("*.npy")) == ["a", "d", "e"]
+
+
+def test_an_entry_over_budget_is_kept_until_the_next_write(cache):
+    big = np.zeros(2**21 // 8) # 2 MB
+    assert cache.put("big", big).shape == big.shape
+    assert cache.get("big") is not None
+    cache.put("small", np.zeros(10))
+    assert cache.get("big") is None and cache.get("small") is not None
+
+
+def test_entry_writer_commit_and_discard(cache):
+    writer = cache.create("w", (4, 3))
+    writer.array[:] = np.arange(12).reshape(4, 3)
+    committed = writer.commit()
+    writer.discard() # after commit: nothing left to remove
+    assert np.array_equal(committed, np.arange(12).reshape(4, 3))
+    assert np.array_equal(cache.get("w"), committed)
+
+    writer = cache.create("x", (2,), dtype=np.float32)
+    writer.array[:] = 1
+    writer.discard()
+    assert cache.get("x") is None
+    assert not list(cache.cache_dir.glob("*.tmp.npy"))
+
+
+def test_cached_solve_ivp_integrates_once(cache, monkeypatch):
+    import common.trajectory_cache as trajectory_cache
+    calls = []
+    real_solve_ivp = trajectory_cache.solve_ivp
+    monkeypatch.setattr(trajectory_cache, "solve_ivp", lambda *a, **k: calls.append(1) or real_solve_ivp(*a, **k))
+
+    t_eval = np.linspace(0, 4, 50)
+    first = cached_solve_ivp(decay, (0, 4), [1.0, 2.0], t_eval, "decay", (0.5,), cache=cache)
+    again = cached_solve_ivp(decay, (0, 4), [1.0, 2.0], t_eval, "decay", (0.5,), cache=cache)
+    assert len(calls) == 1
+    reference = solve_ivp(decay, (0, 4), [1.0, 2.0], t_eval=t_eval)
+    assert first.y.shape == (2, 50)
+    assert np.array_equal(first.y, reference.y) and np.array_equal(again.y, reference.y)
+    assert np.array_equal(again.t, t_eval)
+
+    single = cached_solve_ivp(decay, (0, 4), [1.0, 2.0], t_eval, "decay", (0.5,), dtype=np.float32, cache=cache)
+    assert len(calls) == 2 and single.y.dtype == np.float32
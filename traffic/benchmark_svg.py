@@ -0,0 +1,67 @@
+import argparse
+import ast
+import re
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+from manim import *
+
+import common.svg_cache as svg_cache
+from common.svg_cache import load_svg
+from common.timing import best_of
+
+# SVG setup time of the Traffic scene: every tile and car parsed with SVGMobject, as the
+# scene used to, against load_svg with an empty disk cache (first render), with a warm
+# disk cache (every later render) and within one process (repeated loads). Needs manim.
+#
+#   PYTHONPATH=. python traffic/benchmark_svg.py
+
+CARS = ["traffic/car_1_blue.svg", "traffic/car_2_orange.svg", "traffic/car_3_green.svg", "traffic/car_4_yellow.svg"]
+
+
+def scene_svgs(script="traffic/traffic.py"):
+    # the SVG files the scene loads, with how often: its tile_map, the sample tile and the cars
+    tile_map = ast.literal_eval(re.search(r"tile_map = (\{.*?\n        \})", Path(script).read_text(), re.S).group(1))
+    counts = Counter({filename: len(positions) for filename, positions in tile_map.items()})
+    counts.update(["traffic/street_2.svg", *CARS])
+    return counts
+
+
+def forget(disk=False):
+    # drop what load_svg remembers in this process, and optionally the disk entries too
+    svg_cache._templates.clear()
+    svg_cache._keys.clear()
+    if disk:
+        for path in svg_cache.CACHE_DIR.glob("*.npz"):
+            path.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SVG setup time of the Traffic scene with and without load_svg")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    counts = scene_svgs()
+    files = [filename for filename, n in counts.items() for _ in range(n)]
+    svg_cache.CACHE_DIR = Path(tempfile.mkdtemp(prefix="svg_bench_")) # never touch the real cache
+
+    def cold():
+        forget(disk=True)
+        for filename in files:
+            load_svg(filename)
+
+    def warm_disk():
+        forget()
+        for filename in files:
+            load_svg(filename)
+
+    svgmobject = best_of(lambda: [SVGMobject(filename) for filename in files], args.repeats)
+    cold_time = best_of(cold, args.repeats)
+    warm_disk_time = best_of(warm_disk, args.repeats)
+    in_process = best_of(lambda: [load_svg(filename) for filename in files], args.repeats)
+
+    print(f"{len(files)} loads of {len(counts)} SVG files, best of {args.repeats}")
+    for name, seconds in [("SVGMobject", svgmobject), ("load_svg, empty disk cache", cold_time),
+                          ("load_svg, warm disk cache", warm_disk_time), ("load_svg, same process", in_process)]:
+        print(f"{name:<28} {seconds * 1e3:>8.1f} ms {svgmobject / seconds:>6.1f}x")
@@ -0,0 +1,40 @@
+import argparse
+import time
+
+import numpy as np
+from road_graph import generate_tile_map
+from traffic_routing import Router
+from traffic_sim import TrafficSimulation
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Step times of the traffic simulation on generated grid cities")
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=50, help="steps run before timing, lets the traffic settle")
+    parser.add_argument("--v-max", type=int, default=5)
+    parser.add_argument("--cells-per-tile", type=int, default=5)
+    parser.add_argument("--density", type=float, default=0.2, help="cars per lane cell")
+    parser.add_argument("--routed", action="store_true", help="cars drive to destinations along shortest routes")
+    args = parser.parse_args()
+
+    print(f"v_max={args.v_max}, {args.cells_per_tile} cells per tile, density {args.density}")
+    print(f"{'blocks':>8} {'cells':>8} {'cars':>8} {'ms/step':>9} {'car-steps/s':>12} {'mean v':>7}")
+    for blocks in (5, 20, 50):
+        tile_map = generate_tile_map(blocks, blocks)
+        router = None
+        if args.routed:
+            start = time.perf_counter()
+            router = Router(tile_map)
+            print(f"{blocks}x{blocks}: router ready after {time.perf_counter() - start:.2f}s "
+                  f"({router.recomputed} component(s) recomputed, the rest from cache)")
+        sim = TrafficSimulation(tile_map, n_cars=1, v_max=args.v_max, cells_per_tile=args.cells_per_tile)
+        n_cars = int(args.density * np.count_nonzero(~sim.cell_is_junction))
+        sim = TrafficSimulation(tile_map, n_cars, v_max=args.v_max, cells_per_tile=args.cells_per_tile,
+                                router=router, seed=0)
+        sim.run(args.warmup)
+
+        start = time.perf_counter()
+        states = sim.run(args.steps)
+        seconds = (time.perf_counter() - start) / args.steps
+        print(f"{blocks}x{blocks:<5} {len(sim.cell_xy):>8} {n_cars:>8} {seconds * 1e3:>9.2f} "
+              f"{n_cars / seconds:>12.3g} {states[:, :, 2].mean():>7.2f}")
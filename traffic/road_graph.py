@@ -0,0 +1,71 @@
+from pathlib import Path
+
+# --- Road graph from a tile_map ---
+# tile_map has the format used by the traffic scenes: {svg file: [[x, y, rotation], ...]}
+# with tile coordinates (y grows upwards) and rotations in degrees, counterclockwise.
+
+N, E, S, W = 0, 1, 2, 3
+DIRECTIONS = {N: (0, 1), E: (1, 0), S: (0, -1), W: (-1, 0)}
+STREET_OPENINGS = { # open sides of the unrotated street tiles
+    "street_2": (N, S),
+    "street_3": (N, E, S),
+    "street_4": (N, E, S, W),
+}
+
+
+def opposite(direction):
+    return (direction + 2) % 4
+
+
+def rotate_direction(direction, rotation):
+    # a counterclockwise quarter turn maps N -> W -> S -> E -> N
+    return (direction - int(round(rotation / 90))) % 4
+
+
+def road_tiles(tile_map):
+    """{(x, y): frozenset of open sides} for every street tile, houses and the like are skipped."""
+    tiles = {}
+    for filename, positions in tile_map.items():
+        kind = Path(filename).stem
+        if kind not in STREET_OPENINGS:
+            continue
+        for x, y, rotation in positions:
+            tiles[(x, y)] = frozenset(rotate_direction(d, rotation) for d in STREET_OPENINGS[kind])
+    return tiles
+
+
+def road_connections(tiles):
+    """{(x, y): {direction: neighbour tile}}, two tiles connect only if both open towards each other."""
+    connections = {}
+    for (x, y), openings in tiles.items():
+        connections[(x, y)] = {}
+        for d in sorted(openings):
+            dx, dy = DIRECTIONS[d]
+            neighbour = (x + dx, y + dy)
+            if opposite(d) in tiles.get(neighbour, ()):
+                connections[(x, y)][d] = neighbour
+    return connections
+
+
+def is_junction(openings):
+    return len(openings) >= 3 # street_3 and street_4 tiles
+
+
+def generate_tile_map(n_blocks_x, n_blocks_y, block=3):
+    """
+    Grid city for large-scale runs: a street every `block` tiles, street_4 at every crossing
+    and one-tile dead-end stubs sticking out at the borders.
+    """
+    width, height = n_blocks_x * block, n_blocks_y * block
+    street_2, street_4 = [], []
+    for x in range(-1, width + 2):
+        for y in range(1, -height - 2, -1):
+            on_column = x % block == 0 and 0 <= x <= width
+            on_row = y % block == 0 and -height <= y <= 0
+            if on_column and on_row:
+                street_4.append([x, y, 0])
+            elif on_column:
+                street_2.append([x, y, 0])
+            elif on_row:
+                street_2.append([x, y, 90])
+    return {"traffic/street_2.svg": street_2, "traffic/street_4.svg": street_4}
@@ -1,5 +1,10 @@
 from manim import *
 
+from common.numeric_label import NumericLabel
+from common.static_layer import bake_static_layer
+from common.svg_cache import load_svg
+from traffic_routing import Router
+
 class Traffic(MovingCameraScene):
     def construct(self):
         # --- GLOBAL SETTINGS ---
@@ -8,7 +13,7 @@ class Traffic(MovingCameraScene):
         t_tracker = ValueTracker(0)
 
         # Sample tile to measure size 
-        sample_tile = SVGMobject("traffic/street_2.svg")
+        sample_tile = load_svg("traffic/street_2.svg")
         ts = sample_tile.width  # tile size in manim units
 
         tile_map = {
@@ -26,20 +31,22 @@ class Traffic(MovingCameraScene):
         self.camera.frame.move_to([10, -5, 0])
 
 
-        # Place backgroung tiles
+        # Place backgroung tiles, baked once into the background
+        tiles = VGroup()
         for filename, positions in tile_map.items():
             for pos in positions:
                 x, y, rot = pos
-                tile = SVGMobject(filename)
+                tile = load_svg(filename)
                 tile.move_to([x*ts,y*ts,0])
                 tile.rotate(rot * DEGREES)
-                self.add(tile)
+                tiles.add(tile)
+        bake_static_layer(self, tiles)
 
         # Place cars
-        car_green = SVGMobject("traffic/car_3_green.svg")
-        car_orange = SVGMobject("traffic/car_2_orange.svg")
-        car_blue = SVGMobject("traffic/car_1_blue.svg")
-        car_yellow = SVGMobject("traffic/car_4_yellow.svg")
+        car_green = load_svg("traffic/car_3_green.svg")
+        car_orange = load_svg("traffic/car_2_orange.svg")
+        car_blue = load_svg("traffic/car_1_blue.svg")
+        car_yellow = load_svg("traffic/car_4_yellow.svg")
         car_green.move_to([6*ts,0,0])
         car_orange.move_to([3*ts,-3*ts,0])
         car_blue.move_to([3*ts,-2*ts,0])
@@ -53,13 +60,15 @@ class Traffic(MovingCameraScene):
         self.add(car_blue)
         self.add(car_yellow)
 
-        car_green_route=[[6,0], [6,-1], [6,-2], [6,-3], [6,-3], [6,-4], [6,-5], [6,-20]]
+        # Shortest routes on the street tiles, off-map points (driving in and out of view) added by hand
+        router = Router(tile_map)
+        car_green_route = router.route([6,0], [6,-3]) + router.route([6,-3], [6,-5]) + [[6,-20]] # waits one step at [6,-3]
         car_green_speed=[1,1,1,1,0,1,1,1]
-        car_orange_route=[[3,-3],[3,-4], [4,-4], [5,-4], [6,-4], [7,-4], [20,-4], [20,-4]]
+        car_orange_route = router.route([3,-3], [7,-4]) + [[20,-4], [20,-4]]
         car_orange_speed=[1,1,1,1,1,1,1]
-        car_blue_route = [[3,-2], [3,-1], [2,-1],[1,-1], [0,-1], [0, 0],[0,20],[0,20],[0,20]]
+        car_blue_route = router.route([3,-2], [0,0]) + [[0,20], [0,20], [0,20]]
         car_blue_speed=[1,1,1,1,1,1,1,1,1]
-        car_yellow_route = [[3,10], [3,10], [3,0], [3,-1], [2,-1], [1,-1], [0,-1], [0,-2], [0,-3]]
+        car_yellow_route = [[3,10], [3,10]] + router.route([3,0], [0,-3])
         car_yellow_speed = [1,1,1,1,1,1,1,1]
 
         def get_car_state(car_color):
@@ -85,13 +94,12 @@ class Traffic(MovingCameraScene):
         def make_updating_value(index):
             def updater(mob):
                 val = get_car_state('green')[index]
-                mob.text = f"{val:.0f}"
-                mob.become(Text(mob.text, font_size=36).move_to(mob.get_center()))
+                mob.set_value(val)
             return updater
 
-        green_x_val = Text(f"{get_car_state('green')[0]:.0f}", font_size=36)
-        green_y_val = Text(f"{get_car_state('green')[1]:.0f}", font_size=36)
-        green_v_val = Text(f"{get_car_state('green')[2]:.0f}", font_size=36)
+        green_x_val = NumericLabel(get_car_state('green')[0], num_decimal_places=0, font_size=36)
+        green_y_val = NumericLabel(get_car_state('green')[1], num_decimal_places=0, font_size=36)
+        green_v_val = NumericLabel(get_car_state('green')[2], num_decimal_places=0, font_size=36)
 
         green_x_val.add_updater(make_updating_value(0))
         green_y_val.add_updater(make_updating_value(1))
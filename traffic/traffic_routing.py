@@ -0,0 +1,187 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import shortest_path
+from road_graph import DIRECTIONS, is_junction, road_connections, road_tiles
+
+# --- Shortest routes on the tile map ---
+# Junctions and dead ends are the nodes of the road graph, the chains of plain street
+# tiles between them its edges. All-pairs shortest paths between the nodes are computed
+# once per connected part of the map and kept as compact next-hop tables, so every hop
+# of every route is a single array lookup. The tables are stored on disk under a hash of
+# the part's tiles: an edited map only recomputes the parts that actually changed.
+CACHE_DIR = Path(os.environ.get("ROUTE_CACHE_DIR", Path(__file__).resolve().parents[1] / ".cache" / "routes"))
+UNREACHABLE = -1
+
+
+def _index_dtype(n):
+    return np.int16 if n < np.iinfo(np.int16).max else np.int32
+
+
+def _components(connections):
+    """Connected parts of the road graph as sorted tile lists."""
+    seen, components = set(), []
+    for start in sorted(connections):
+        if start in seen:
+            continue
+        seen.add(start)
+        stack, part = [start], []
+        while stack:
+            tile = stack.pop()
+            part.append(tile)
+            for neighbour in connections[tile].values():
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    stack.append(neighbour)
+        components.append(sorted(part))
+    return components
+
+
+def _component_key(tiles, part):
+    digest = hashlib.sha256(repr([(tile, sorted(tiles[tile])) for tile in part]).encode())
+    return digest.hexdigest()[:32]
+
+
+class _Component:
+    """Nodes, segments and next-hop tables of one connected part of the map."""
+    def __init__(self, part, tiles, connections):
+        self.nodes = [t for t in part if len(connections[t]) != 2 or is_junction(tiles[t])]
+        if not self.nodes:
+            self.nodes = [part[0]] # a closed ring without junctions, any tile will do
+        self.node_index = {tile: i for i, tile in enumerate(self.nodes)}
+
+        # walk out of every node along each open side until the next node
+        self.segments = [] # (start node, end node, tiles in between)
+        self.tile_segment = {} # inner tile -> (segment, position counted from the start node)
+        self.edge = {} # (start node, end node) -> shortest segment between them
+        for a, start in enumerate(self.nodes):
+            for d, tile in sorted(connections[start].items()):
+                inner, previous = [], start
+                while tile not in self.node_index:
+                    inner.append(tile)
+                    previous, tile = tile, next(n for n in connections[tile].values() if n != previous)
+                b = self.node_index[tile]
+                if inner and inner[0] in self.tile_segment:
+                    continue # already walked from its other end
+                sid = len(self.segments)
+                self.segments.append((a, b, inner))
+                for k, t in enumerate(inner, start=1):
+                    self.tile_segment[t] = (sid, k)
+                for key, length in (((a, b), len(inner)), ((b, a), len(inner))):
+                    if key not in self.edge or length < len(self.segments[self.edge[key]][2]):
+                        self.edge[key] = sid
+
+    def edge_tiles(self, a, b):
+        """Tiles strictly between neighbouring nodes a and b, in driving order."""
+        start, _, inner = self.segments[self.edge[(a, b)]]
+        return inner if start == a else inner[::-1]
+
+    def compute_tables(self):
+        n = len(self.nodes)
+        pairs = [(a, b) for (a, b) in self.edge if a != b]
+        rows = [a for a, _ in pairs]
+        cols = [b for _, b in pairs]
+        weights = [len(self.segments[self.edge[p]][2]) + 1 for p in pairs]
+        graph = coo_matrix((weights, (rows, cols)), shape=(n, n)).tocsr()
+        dist, predecessors = shortest_path(graph, directed=False, return_predecessors=True)
+        # the graph is undirected: the node before i on the way from j is the hop after i towards j
+        dtype = _index_dtype(n)
+        next_hop = np.where(predecessors.T < 0, UNREACHABLE, predecessors.T).astype(dtype)
+        np.fill_diagonal(next_hop, np.arange(n))
+        self.next_hop = next_hop
+        self.dist = np.where(np.isinf(dist), UNREACHABLE, dist).astype(np.int32)
+        # direction in which the route out of node a towards node b leaves a's tile
+        neighbour_dir = np.full((n, n), UNREACHABLE, dtype=np.int8)
+        for a, b in pairs:
+            first = (self.edge_tiles(a, b) or [self.nodes[b]])[0]
+            step = (first[0] - self.nodes[a][0], first[1] - self.nodes[a][1])
+            neighbour_dir[a, b] = next(d for d, v in DIRECTIONS.items() if v == step)
+        hops = np.where(next_hop == UNREACHABLE, np.arange(n)[:, None], next_hop)
+        self.exit_dir = neighbour_dir[np.arange(n)[:, None], hops]
+
+    def save(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp, next_hop=self.next_hop, dist=self.dist, exit_dir=self.exit_dir)
+        os.replace(tmp, path) # atomic, parallel renders never see half a file
+
+    def load(self, path):
+        with np.load(path) as arrays:
+            next_hop, dist, exit_dir = arrays["next_hop"], arrays["dist"], arrays["exit_dir"]
+        if next_hop.shape != (len(self.nodes),) * 2:
+            raise ValueError(f"{path} does not match the map")
+        self.next_hop, self.dist, self.exit_dir = next_hop, dist, exit_dir
+
+
+class Router:
+    """
+    Shortest routes between any two street tiles of a tile_map.
+    Node tables come from the on-disk cache when a part of the map was routed before.
+    """
+    def __init__(self, tile_map, cache_dir=CACHE_DIR):
+        self.tiles = road_tiles(tile_map)
+        connections = road_connections(self.tiles)
+        self.components = []
+        self.tile_component = {}
+        self.recomputed = 0
+        for part in _components(connections):
+            component = _Component(part, self.tiles, connections)
+            path = Path(cache_dir) / f"{_component_key(self.tiles, part)}.npz"
+            try:
+                component.load(path)
+            except (OSError, KeyError, ValueError):
+                component.compute_tables()
+                component.save(path)
+                self.recomputed += 1
+            for tile in part:
+                self.tile_component[tile] = component
+            self.components.append(component)
+
+    def _anchors(self, component, tile):
+        # (node, tiles from the tile up to that node excluding both ends) for the nodes around a tile
+        if tile in component.node_index:
+            return [(component.node_index[tile], [])]
+        sid, k = component.tile_segment[tile]
+        a, b, inner = component.segments[sid]
+        return [(a, inner[:k - 1][::-1]), (b, inner[k:])]
+
+    def route(self, src, dst):
+        """Tiles from src to dst, both included, as a list of [x, y]."""
+        src, dst = tuple(src), tuple(dst)
+        component = self.tile_component.get(src)
+        if component is None or self.tile_component.get(dst) is not component:
+            raise ValueError(f"no route from {src} to {dst}")
+        if src == dst:
+            return [list(src)]
+
+        candidates = []
+        # src and dst on the same segment: straight along it might be shortest
+        if src in component.tile_segment and dst in component.tile_segment:
+            (sid, i), (tid, j) = component.tile_segment[src], component.tile_segment[dst]
+            if sid == tid:
+                inner = component.segments[sid][2]
+                candidates.append(inner[i - 1:j] if i < j else inner[j - 1:i][::-1])
+        for a, to_a in self._anchors(component, src):
+            for b, to_b in self._anchors(component, dst):
+                if component.dist[a, b] != UNREACHABLE:
+                    path = [src] + to_a + self._node_path(component, a, b) + to_b[::-1] + [dst]
+                    candidates.append([t for i, t in enumerate(path) if i == 0 or t != path[i - 1]])
+        if not candidates:
+            raise ValueError(f"no route from {src} to {dst}")
+        return [list(tile) for tile in min(candidates, key=len)]
+
+    def _node_path(self, component, a, b):
+        tiles = [component.nodes[a]]
+        while a != b:
+            hop = component.next_hop[a, b]
+            tiles += component.edge_tiles(a, hop) + [component.nodes[hop]]
+            a = hop
+        return tiles
+
+    def node_tables(self, tile):
+        """(node index, next_hop, exit_dir) of a junction or dead-end tile, for vectorized lookups."""
+        component = self.tile_component[tuple(tile)]
+        return component.node_index[tuple(tile)], component.next_hop, component.exit_dir
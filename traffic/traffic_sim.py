@@ -0,0 +1,263 @@
+import numpy as np
+from road_graph import DIRECTIONS, is_junction, opposite, road_connections, road_tiles
+
+# --- Nagel–Schreckenberg traffic on the tile map ---
+# Every street_2 tile carries one lane per driving direction, split into cells_per_tile
+# cells. Every junction tile (street_3/street_4) is a single shared cell. Per step, all
+# cars at once: accelerate, brake to the gap ahead, randomly dawdle, resolve who may
+# enter each junction, move. States come out as [x, y, v] in tile coordinates, the
+# format the traffic scenes consume; x, y is where the car is drawn, in its lane, and
+# tiles() gives the tile it is on. With a Router, cars drive to random junctions along
+# shortest routes instead of turning at random.
+
+STRAIGHT, RIGHT, LEFT, U_TURN = 0, 1, 2, 3
+TURN_OFFSETS = {STRAIGHT: 0, RIGHT: 1, LEFT: 3, U_TURN: 2}
+OFFSET_TURNS = np.array([STRAIGHT, RIGHT, U_TURN, LEFT]) # (exit - heading) % 4 -> turn
+
+
+class TrafficSimulation:
+    def __init__(self, tile_map, n_cars, v_max=1, p_slow=0.1, cells_per_tile=1,
+                 turn_probabilities=(0.6, 0.2, 0.2), patience=3, router=None, seed=None, lane_offset=0.2):
+        self.v_max = v_max
+        self.patience = patience
+        self.p_slow = p_slow
+        self.cells_per_tile = cells_per_tile
+        self.turn_probabilities = np.asarray(turn_probabilities, dtype=float)
+        self.rng = np.random.default_rng(seed)
+        self.lane_offset = lane_offset # tiles right of the tile's centre line, keeps opposite lanes apart
+        self._build_cells(road_tiles(tile_map))
+
+        lane_cells = np.flatnonzero(~self.cell_is_junction)
+        if n_cars > len(lane_cells):
+            raise ValueError(f"{n_cars} cars do not fit on {len(lane_cells)} lane cells")
+        self.cell = self.rng.choice(lane_cells, n_cars, replace=False)
+        self.heading = self.cell_heading[self.cell].copy()
+        self.v = np.zeros(n_cars, dtype=np.int64)
+        self.turn = self._draw_turns(n_cars)
+        self.waiting = np.zeros(n_cars, dtype=np.int64) # steps spent standing, gives junction priority
+        self.router = router
+        if router is not None:
+            self._build_routing(router)
+            self.destination = np.full(n_cars, -1)
+            self._route_turns()
+
+    # --- network ---
+    def _build_cells(self, tiles):
+        connections = road_connections(tiles)
+        c = self.cells_per_tile
+        xy, tile_of, heading, is_j = [], [], [], []
+        lane_start = {}  # (tile, heading) -> first cell of that lane
+        junction_cell = {}  # tile -> cell
+        for tile, openings in tiles.items():
+            if is_junction(openings):
+                junction_cell[tile] = len(xy)
+                xy.append(tile)
+                tile_of.append(tile)
+                heading.append(-1)
+                is_j.append(True)
+                continue
+            for h in sorted(openings):
+                lane_start[(tile, h)] = len(xy)
+                dx, dy = DIRECTIONS[h]
+                side_x, side_y = self.lane_offset * dy, -self.lane_offset * dx # right of the heading
+                for k in range(c):
+                    offset = -0.5 + (k + 0.5) / c
+                    xy.append((tile[0] + offset * dx + side_x, tile[1] + offset * dy + side_y))
+                    tile_of.append(tile)
+                    heading.append(h)
+                    is_j.append(False)
+
+        def entry_cell(tile, h):
+            # cell a car ends up in when it drives into `tile` with heading h
+            return junction_cell[tile] if tile in junction_cell else lane_start[(tile, h)]
+
+        n_cells = len(xy)
+        self.cell_xy = np.array(xy, dtype=float)
+        self.cell_tile = np.array(tile_of, dtype=np.int64)
+        self.cell_heading = np.array(heading, dtype=np.int64)
+        self.cell_is_junction = np.array(is_j, dtype=bool)
+
+        # lanes: the next cell is fixed. dead ends turn the car around into the opposite lane
+        self.lane_next = np.full(n_cells, -1, dtype=np.int64)
+        for (tile, h), start in lane_start.items():
+            self.lane_next[start:start + c - 1] = np.arange(start + 1, start + c)
+            neighbour = connections[tile].get(h)
+            self.lane_next[start + c - 1] = entry_cell(neighbour, h) if neighbour else lane_start[(tile, opposite(h))]
+
+        # junctions: the exit depends on the approach heading and the car's turn
+        junction_tiles = list(junction_cell)
+        n_junctions = max(len(junction_tiles), 1) # lane cells index row 0 too, keep it valid on junction-free maps
+        self.cell_junction = np.full(n_cells, 0, dtype=np.int64)
+        self.junction_exit_cell = np.zeros((n_junctions, 4), dtype=np.int64)
+        self.junction_turn_dir = np.zeros((n_junctions, 4, len(TURN_OFFSETS)), dtype=np.int64)
+        for jid, tile in enumerate(junction_tiles):
+            self.cell_junction[junction_cell[tile]] = jid
+            exits = connections[tile]
+            for d, neighbour in exits.items():
+                self.junction_exit_cell[jid, d] = entry_cell(neighbour, d)
+            for h in range(4):
+                for turn, offset in TURN_OFFSETS.items():
+                    # wanted exit if it exists, otherwise straight, right, left, back in that order
+                    options = [(h + offset) % 4] + [(h + TURN_OFFSETS[t]) % 4 for t in (STRAIGHT, RIGHT, LEFT, U_TURN)]
+                    self.junction_turn_dir[jid, h, turn] = next((d for d in options if d in exits), h)
+        self.junction_tiles = junction_tiles
+
+    def _build_routing(self, router):
+        # next junction of every lane cell and the heading a car arrives there with
+        n_cells = len(self.cell_xy)
+        lane = ~self.cell_is_junction
+        self.lane_junction = np.full(n_cells, -1)
+        self.lane_junction_heading = self.cell_heading.copy()
+        ends = lane & self.cell_is_junction[self.lane_next]
+        self.lane_junction[ends] = self.cell_junction[self.lane_next[ends]]
+        pending = lane & ~ends
+        while True:
+            resolved = pending & (self.lane_junction[self.lane_next] >= 0)
+            if not resolved.any():
+                break # whatever is left runs in circles without a junction
+            self.lane_junction[resolved] = self.lane_junction[self.lane_next[resolved]]
+            self.lane_junction_heading[resolved] = self.lane_junction_heading[self.lane_next[resolved]]
+            pending &= ~resolved
+
+        # junction -> (its router component, node index inside the component tables)
+        if not self.junction_tiles:
+            raise ValueError("routing needs a map with junctions")
+        components = {}
+        self.route_exit_dirs = []
+        self.junction_component = np.zeros(len(self.junction_tiles), dtype=np.int64)
+        self.junction_node = np.zeros(len(self.junction_tiles), dtype=np.int64)
+        for jid, tile in enumerate(self.junction_tiles):
+            node, _, exit_dir = router.node_tables(tile)
+            if id(exit_dir) not in components:
+                components[id(exit_dir)] = len(self.route_exit_dirs)
+                self.route_exit_dirs.append(exit_dir)
+            self.junction_component[jid] = components[id(exit_dir)]
+            self.junction_node[jid] = node
+        self.component_junctions = [np.flatnonzero(self.junction_component == c) for c in range(len(components))]
+
+    def _route_turns(self):
+        """Turn at the next junction towards each car's destination, new destinations on arrival."""
+        in_junction = self.cell_is_junction[self.cell]
+        junction = np.where(in_junction, self.cell_junction[self.cell], self.lane_junction[self.cell])
+        heading = np.where(in_junction, self.heading, self.lane_junction_heading[self.cell])
+        routed = junction >= 0
+        component = self.junction_component[junction]
+        for c, exit_dirs in enumerate(self.route_exit_dirs):
+            cars = routed & (component == c)
+            arrived = cars & ((self.destination == junction) | (self.destination < 0))
+            self.destination[arrived] = self.rng.choice(self.component_junctions[c], np.count_nonzero(arrived))
+            exit_dir = exit_dirs[self.junction_node[junction[cars]], self.junction_node[self.destination[cars]]]
+            turn = OFFSET_TURNS[(exit_dir - heading[cars]) % 4]
+            self.turn[cars] = np.where(exit_dir >= 0, turn, self.turn[cars])
+
+    def _draw_turns(self, n):
+        p = self.turn_probabilities / self.turn_probabilities.sum()
+        return self.rng.choice(len(p), n, p=p)
+
+    def _exit_dir(self, cell, heading, turn):
+        return self.junction_turn_dir[self.cell_junction[cell], heading % 4, turn]
+
+    def _advance(self, cell, heading, turn):
+        """One cell further along each car's path -> (next cell, heading there)."""
+        in_junction = self.cell_is_junction[cell]
+        exit_dir = self._exit_dir(cell, heading, turn)
+        next_cell = np.where(in_junction, self.junction_exit_cell[self.cell_junction[cell], exit_dir],
+                             self.lane_next[cell])
+        next_heading = np.where(in_junction, exit_dir,
+                                np.where(self.cell_is_junction[next_cell], heading, self.cell_heading[next_cell]))
+        return next_cell, next_heading
+
+    def _look_ahead(self, occupied):
+        """
+        Free cells ahead of every car (at most v_max), plus the junction it would enter
+        and its distance. Per step a car enters at most one junction and exits at most one,
+        so the turn it carries is used exactly once. A junction is only entered while the
+        cell behind it is free: a car waiting inside it would close loops like a dead-end
+        stub and its junction for good.
+        """
+        n = len(self.cell)
+        gap = np.full(n, self.v_max)
+        free = np.ones(n, dtype=bool)
+        junction = np.full(n, -1)
+        junction_dist = np.zeros(n, dtype=np.int64)
+        entered = np.zeros(n, dtype=bool)
+        exited = np.zeros(n, dtype=bool)
+        cell, heading = self.cell, self.heading
+        for s in range(1, self.v_max + 1):
+            leaving = self.cell_is_junction[cell]
+            second_exit = leaving & exited
+            exited |= leaving
+            cell, heading = self._advance(cell, heading, self.turn)
+            entering = self.cell_is_junction[cell]
+            exit_full = entering & occupied[self._advance(cell, heading, self.turn)[0]]
+            blocked = free & (occupied[cell] | second_exit | (entering & (entered | exit_full)))
+            gap[blocked] = s - 1
+            free &= ~blocked
+            first = free & entering
+            junction[first] = cell[first]
+            junction_dist[first] = s
+            entered |= first
+        return gap, junction, junction_dist
+
+    def step(self):
+        occupied = np.zeros(len(self.cell_xy), dtype=bool)
+        occupied[self.cell] = True
+        gap, junction, junction_dist = self._look_ahead(occupied)
+
+        # Nagel–Schreckenberg rules
+        v = np.minimum(self.v + 1, self.v_max)
+        v = np.minimum(v, gap)
+        dawdle = self.rng.random(len(v)) < self.p_slow
+        v = np.where(dawdle, np.maximum(v - 1, 0), v)
+
+        # junction rule: of all cars reaching the same junction this step, the one that
+        # waited longest goes (random tie break), the others stop in front of it
+        contenders = np.flatnonzero((junction >= 0) & (v >= junction_dist))
+        if len(contenders):
+            order = np.lexsort((self.rng.random(len(contenders)), -self.waiting[contenders], junction[contenders]))
+            ranked = contenders[order]
+            _, first = np.unique(junction[ranked], return_index=True)
+            losers = np.setdiff1d(ranked, ranked[first])
+            v[losers] = junction_dist[losers] - 1
+
+        # move every car v cells along its path
+        cell, heading = self.cell, self.heading
+        passed_junction = np.zeros(len(v), dtype=bool)
+        for s in range(1, self.v_max + 1):
+            moving = v >= s
+            passed_junction |= moving & self.cell_is_junction[cell]
+            next_cell, next_heading = self._advance(cell, heading, self.turn)
+            cell = np.where(moving, next_cell, cell)
+            heading = np.where(moving, next_heading, heading)
+        self.cell, self.heading, self.v = cell, heading, v
+        self.waiting = np.where(v == 0, self.waiting + 1, 0)
+        # a used turn is gone, pick the next one for the next junction. Drivers stuck for
+        # longer than their patience pick another way out as well, which breaks up gridlocks
+        redraw = passed_junction | (self.waiting > self.patience)
+        self.turn = np.where(redraw, self._draw_turns(len(v)), self.turn)
+        if self.router is not None:
+            impatient = self.turn.copy()
+            self._route_turns()
+            self.turn = np.where(self.waiting > self.patience, impatient, self.turn) # detour, replanned from there
+        return self.state()
+
+    def state(self):
+        """(n_cars, 3) array of [x, y, v] in tile coordinates and tiles per step."""
+        return np.column_stack([self.cell_xy[self.cell], self.v / self.cells_per_tile])
+
+    def tiles(self):
+        """(n_cars, 2) integer tile coordinates of the tile each car is on."""
+        return self.cell_tile[self.cell]
+
+    def run(self, n_steps, with_tiles=False):
+        """
+        States of all cars for the start and n_steps steps -> (n_steps + 1, n_cars, 3),
+        with with_tiles also their tiles -> (states, (n_steps + 1, n_cars, 2)).
+        """
+        states = np.empty((n_steps + 1, len(self.cell), 3))
+        tiles = np.empty((n_steps + 1, len(self.cell), 2), dtype=np.int64)
+        states[0], tiles[0] = self.state(), self.tiles()
+        for i in range(1, n_steps + 1):
+            states[i] = self.step()
+            tiles[i] = self.tiles()
+        return (states, tiles) if with_tiles else states
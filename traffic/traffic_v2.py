@@ -1,5 +1,10 @@
 from manim import *
 
+from common.numeric_label import NumericLabel
+from common.static_layer import bake_static_layer
+from common.svg_cache import load_svg
+from traffic_sim import TrafficSimulation
+
 class Traffic(MovingCameraScene):
     def construct(self):
         # --- GLOBAL SETTINGS ---
@@ -8,7 +13,7 @@ class Traffic(MovingCameraScene):
 
         # --- BACKGROUND MAP ---
         # Sample tile to measure size 
-        sample_tile = SVGMobject("traffic/street_2.svg")
+        sample_tile = load_svg("traffic/street_2.svg")
         ts = sample_tile.width  # tile size in manim units
 
         map_max_width = 8*ts
@@ -22,46 +27,41 @@ class Traffic(MovingCameraScene):
         }
 
         # --- STATE DEFINITION ---
-        # Format: [x, y, v] (in tile coordinates)
-        state_list = [
-        [[6, 0, 1], [3, -3, 1], [3, -2, 1], [3, 20, 1]],
-        [[6, -1, 1], [3, -4, 1], [3, -1, 1], [3, 20, 1]],
-        [[6, -2, 1], [4, -4, 1], [2, -1, 1], [3, 0, 1]],
-        [[6, -3, 1], [5, -4, 1], [1, -1, 1], [3, -1, 1]],
-        [[6, -3, 0], [6, -4, 1], [0, -1, 1], [2, -1, 1]],
-        [[6, -4, 1], [7, -4, 1], [0, 0, 1], [1, -1, 1]],
-        [[6, -5, 1], [20, -4, 1], [0, 20, 1], [0, -1, 1]],
-        [[6, -20, 1], [20, -4, 1], [0, 20, 1], [0, -2, 1]],
-        [[6, -20, 1], [20, -4, 1], [0, 20, 1], [-20, -2, 1]],
-        ]
+        # Format: [x, y, v] (in tile coordinates), simulated on the street tiles of tile_map.
+        # x, y is the car's position in its lane, the state box shows the tile it is on
+        states, tiles_on = TrafficSimulation(tile_map, n_cars=4, seed=3).run(8, with_tiles=True)
+        state_list, tile_list = states.tolist(), tiles_on.tolist()
 
         # --- CAMERA SETTINGS ---
         self.camera.frame.set_width(12*ts)
         self.camera.frame.move_to([10, -5, 0])
 
-        # --- DRAW BACKGROUND ---
+        # --- DRAW BACKGROUND (static, rasterized once) ---
+        tiles = VGroup()
         for filename, positions in tile_map.items():
             for x, y, rot in positions:
-                tile = SVGMobject(filename)
+                tile = load_svg(filename)
                 tile.move_to([x * ts, y * ts, 0])
                 tile.rotate(rot * DEGREES)
-                self.add(tile)
+                tiles.add(tile)
+        bake_static_layer(self, tiles)
 
         # --- CREATE CARS ---
         init_green_state, init_orange_state, init_blue_state, init_yellow_state = state_list[0]
-        car_green = SVGMobject("traffic/car_3_green.svg")
+        init_green_tile, init_orange_tile, init_blue_tile, init_yellow_tile = tile_list[0]
+        car_green = load_svg("traffic/car_3_green.svg")
         car_green.scale(0.6)
         car_green.move_to([init_green_state[0] * ts, init_green_state[1] * ts, 0])
         self.add(car_green)
-        car_orange = SVGMobject("traffic/car_2_orange.svg")
+        car_orange = load_svg("traffic/car_2_orange.svg")
         car_orange.scale(0.6)
         car_orange.move_to([init_orange_state[0] * ts, init_orange_state[1] * ts, 0])
         self.add(car_orange)
-        car_blue = SVGMobject("traffic/car_1_blue.svg")
+        car_blue = load_svg("traffic/car_1_blue.svg")
         car_blue.scale(0.6)
         car_blue.move_to([init_blue_state[0] * ts, init_blue_state[1] * ts, 0])
         self.add(car_blue)
-        car_yellow = SVGMobject("traffic/car_4_yellow.svg")
+        car_yellow = load_svg("traffic/car_4_yellow.svg")
         car_yellow.scale(0.6)
         car_yellow.move_to([init_yellow_state[0] * ts, init_yellow_state[1] * ts, 0])
         self.add(car_yellow)
@@ -78,30 +78,30 @@ class Traffic(MovingCameraScene):
 
         state_text = Text("State", font_size=36)
 
-        x_val_green = Text(" - ", font_size=36) if max(abs(i) for i in init_green_state) > 9 else Text(f"{init_green_state[0]:.0f}", font_size=36)
-        y_val_green = Text(" - ", font_size=36) if max(abs(i) for i in init_green_state) > 9 else Text(f"{init_green_state[1]:.0f}", font_size=36)
-        v_val_green = Text(" - ", font_size=36) if max(abs(i) for i in init_green_state) > 9 else Text(f"{init_green_state[2]:.0f}", font_size=36)
+        x_val_green = NumericLabel(init_green_tile[0], num_decimal_places=0, font_size=36)
+        y_val_green = NumericLabel(init_green_tile[1], num_decimal_places=0, font_size=36)
+        v_val_green = NumericLabel(init_green_state[2], num_decimal_places=0, font_size=36)
         x_line_green = VGroup(Text("Green car X =", font_size=36), x_val_green).arrange(RIGHT, buff=0.2)
         y_line_green = VGroup(Text("Green car Y =", font_size=36), y_val_green).arrange(RIGHT, buff=0.2)
         v_line_green = VGroup(Text("Green car V =", font_size=36), v_val_green).arrange(RIGHT, buff=0.2)
 
-        x_val_orange = Text(" - ", font_size=36) if max(abs(i) for i in init_orange_state) > 9 else Text(f"{init_orange_state[0]:.0f}", font_size=36)
-        y_val_orange = Text(" - ", font_size=36) if max(abs(i) for i in init_orange_state) > 9 else Text(f"{init_orange_state[1]:.0f}", font_size=36)
-        v_val_orange = Text(" - ", font_size=36) if max(abs(i) for i in init_orange_state) > 9 else Text(f"{init_orange_state[2]:.0f}", font_size=36)
+        x_val_orange = NumericLabel(init_orange_tile[0], num_decimal_places=0, font_size=36)
+        y_val_orange = NumericLabel(init_orange_tile[1], num_decimal_places=0, font_size=36)
+        v_val_orange = NumericLabel(init_orange_state[2], num_decimal_places=0, font_size=36)
         x_line_orange = VGroup(Text("Orange car X =", font_size=36), x_val_orange).arrange(RIGHT, buff=0.2)
         y_line_orange = VGroup(Text("Orange car Y =", font_size=36), y_val_orange).arrange(RIGHT, buff=0.2)
         v_line_orange = VGroup(Text("Orange car V =", font_size=36), v_val_orange).arrange(RIGHT, buff=0.2)
 
-        x_val_blue = Text(" - ", font_size=36) if max(abs(i) for i in init_blue_state) > 9 else Text(f"{init_blue_state[0]:.0f}", font_size=36)
-        y_val_blue = Text(" - ", font_size=36) if max(abs(i) for i in init_blue_state) > 9 else Text(f"{init_blue_state[1]:.0f}", font_size=36)
-        v_val_blue = Text(" - ", font_size=36) if max(abs(i) for i in init_blue_state) > 9 else Text(f"{init_blue_state[2]:.0f}", font_size=36)
+        x_val_blue = NumericLabel(init_blue_tile[0], num_decimal_places=0, font_size=36)
+        y_val_blue = NumericLabel(init_blue_tile[1], num_decimal_places=0, font_size=36)
+        v_val_blue = NumericLabel(init_blue_state[2], num_decimal_places=0, font_size=36)
         x_line_blue = VGroup(Text("Blue car X =", font_size=36), x_val_blue).arrange(RIGHT, buff=0.2)
         y_line_blue = VGroup(Text("Blue car Y =", font_size=36), y_val_blue).arrange(RIGHT, buff=0.2)
         v_line_blue = VGroup(Text("Blue car V =", font_size=36), v_val_blue).arrange(RIGHT, buff=0.2)
 
-        x_val_yellow = Text(" - ", font_size=36) if max(abs(i) for i in init_yellow_state) > 9 else Text(f"{init_yellow_state[0]:.0f}", font_size=36)
-        y_val_yellow = Text(" - ", font_size=36) if max(abs(i) for i in init_yellow_state) > 9 else Text(f"{init_yellow_state[1]:.0f}", font_size=36)
-        v_val_yellow = Text(" - ", font_size=36) if max(abs(i) for i in init_yellow_state) > 9 else Text(f"{init_yellow_state[2]:.0f}", font_size=36)
+        x_val_yellow = NumericLabel(init_yellow_tile[0], num_decimal_places=0, font_size=36)
+        y_val_yellow = NumericLabel(init_yellow_tile[1], num_decimal_places=0, font_size=36)
+        v_val_yellow = NumericLabel(init_yellow_state[2], num_decimal_places=0, font_size=36)
         x_line_yellow = VGroup(Text("Yellow car X =", font_size=36), x_val_yellow).arrange(RIGHT, buff=0.2)
         y_line_yellow = VGroup(Text("Yellow car Y =", font_size=36), y_val_yellow).arrange(RIGHT, buff=0.2)
         v_line_yellow = VGroup(Text("Yellow car V =", font_size=36), v_val_yellow).arrange(RIGHT, buff=0.2)
@@ -113,8 +113,9 @@ class Traffic(MovingCameraScene):
         self.add(box, box_text)
 
         # --- STEP THROUGH STATE LIST ---
-        for state in state_list:
+        for state, tile in zip(state_list, tile_list):
             green_state, orange_state, blue_state, yellow_state = state
+            green_tile, orange_tile, blue_tile, yellow_tile = tile
             
             x_green = green_state[0]
             y_green = green_state[1]
@@ -139,17 +140,17 @@ class Traffic(MovingCameraScene):
             )
 
             # Update text 
-            x_val_green.become(Text(" - ", font_size=36).move_to(x_val_green.get_center())) if max(abs(i) for i in green_state) > 9 else x_val_green.become(Text(f"{x_green:.0f}", font_size=36).move_to(x_val_green.get_center()))
-            y_val_green.become(Text(" - ", font_size=36).move_to(y_val_green.get_center())) if max(abs(i) for i in green_state) > 9 else y_val_green.become(Text(f"{y_green:.0f}", font_size=36).move_to(y_val_green.get_center()))
-            v_val_green.become(Text(" - ", font_size=36).move_to(v_val_green.get_center())) if max(abs(i) for i in green_state) > 9 else v_val_green.become(Text(f"{v_green:.0f}", font_size=36).move_to(v_val_green.get_center()))
-            x_val_orange.become(Text(" - ", font_size=36).move_to(x_val_orange.get_center())) if max(abs(i) for i in orange_state) > 9 else x_val_orange.become(Text(f"{x_orange:.0f}", font_size=36).move_to(x_val_orange.get_center()))
-            y_val_orange.become(Text(" - ", font_size=36).move_to(y_val_orange.get_center())) if max(abs(i) for i in orange_state) > 9 else y_val_orange.become(Text(f"{y_orange:.0f}", font_size=36).move_to(y_val_orange.get_center()))
-            v_val_orange.become(Text(" - ", font_size=36).move_to(v_val_orange.get_center())) if max(abs(i) for i in orange_state) > 9 else v_val_orange.become(Text(f"{v_orange:.0f}", font_size=36).move_to(v_val_orange.get_center()))
-            x_val_blue.become(Text(" - ", font_size=36).move_to(x_val_blue.get_center())) if max(abs(i) for i in blue_state) > 9 else x_val_blue.become(Text(f"{x_blue:.0f}", font_size=36).move_to(x_val_blue.get_center()))
-            y_val_blue.become(Text(" - ", font_size=36).move_to(y_val_blue.get_center())) if max(abs(i) for i in blue_state) > 9 else y_val_blue.become(Text(f"{y_blue:.0f}", font_size=36).move_to(y_val_blue.get_center()))
-            v_val_blue.become(Text(" - ", font_size=36).move_to(v_val_blue.get_center())) if max(abs(i) for i in blue_state) > 9 else v_val_blue.become(Text(f"{v_blue:.0f}", font_size=36).move_to(v_val_blue.get_center()))
-            x_val_yellow.become(Text(" - ", font_size=36).move_to(x_val_yellow.get_center())) if max(abs(i) for i in yellow_state) > 9 else x_val_yellow.become(Text(f"{x_yellow:.0f}", font_size=36).move_to(x_val_yellow.get_center()))
-            y_val_yellow.become(Text(" - ", font_size=36).move_to(y_val_yellow.get_center())) if max(abs(i) for i in yellow_state) > 9 else y_val_yellow.become(Text(f"{y_yellow:.0f}", font_size=36).move_to(y_val_yellow.get_center()))
-            v_val_yellow.become(Text(" - ", font_size=36).move_to(v_val_yellow.get_center())) if max(abs(i) for i in yellow_state) > 9 else v_val_yellow.become(Text(f"{v_yellow:.0f}", font_size=36).move_to(v_val_yellow.get_center()))
+            x_val_green.set_value(green_tile[0])
+            y_val_green.set_value(green_tile[1])
+            v_val_green.set_value(v_green)
+            x_val_orange.set_value(orange_tile[0])
+            y_val_orange.set_value(orange_tile[1])
+            v_val_orange.set_value(v_orange)
+            x_val_blue.set_value(blue_tile[0])
+            y_val_blue.set_value(blue_tile[1])
+            v_val_blue.set_value(v_blue)
+            x_val_yellow.set_value(yellow_tile[0])
+            y_val_yellow.set_value(yellow_tile[1])
+            v_val_yellow.set_value(v_yellow)
 
         self.wait(1)